@@ -1,7 +1,7 @@
+import importlib
+
 from . import conf
 from . import exc
-from .aggregator import Aggregator
-from .aggregator import PhaseOutput
 from .mapper import link
 from .mapper import prior
 from .mapper.model import AbstractModel
@@ -24,6 +24,7 @@ from .mapper.prior.prior import Prior
 from .mapper.prior.prior import RelativeWidthModifier
 from .mapper.prior.prior import UniformPrior
 from .mapper.prior.prior import WidthModifier
+from .mapper.prior.prior import clear_prior_config_cache
 from .mapper.prior.promise import AbstractPromise
 from .mapper.prior.promise import Promise
 from .mapper.prior.promise import PromiseResult
@@ -47,14 +48,8 @@ from autofit.non_linear.grid.grid_search import GridSearch as NonLinearSearchGri
 from autofit.non_linear.grid.grid_search import GridSearchResult
 from .non_linear.initializer import InitializerBall
 from .non_linear.initializer import InitializerPrior
-from .non_linear.mcmc.emcee import Emcee
 from .mock.mock_search import MockResult
 from .mock.mock_search import MockSearch
-from .non_linear.nest.dynesty import DynestyDynamic
-from .non_linear.nest.dynesty import DynestyStatic
-from .non_linear.nest.multi_nest import MultiNest
-from .non_linear.optimize.pyswarms import PySwarmsGlobal
-from .non_linear.optimize.pyswarms import PySwarmsLocal
 from .non_linear.paths import Paths
 from .non_linear.paths import convert_paths
 from .non_linear.paths import make_path
@@ -74,6 +69,38 @@ from .tools.phase_property import PhaseProperty
 from .tools.pipeline import Pipeline
 from .tools.pipeline import ResultsCollection
 
+# Names whose modules import a sampler backend or other slow dependencies. They are imported when first used.
+_lazy_imports = {
+    "aggregator": (".aggregator", None),
+    "Aggregator": (".aggregator", "Aggregator"),
+    "PhaseOutput": (".aggregator", "PhaseOutput"),
+    "Emcee": (".non_linear.mcmc.emcee", "Emcee"),
+    "DynestyDynamic": (".non_linear.nest.dynesty", "DynestyDynamic"),
+    "DynestyStatic": (".non_linear.nest.dynesty", "DynestyStatic"),
+    "MultiNest": (".non_linear.nest.multi_nest", "MultiNest"),
+    "PySwarmsGlobal": (".non_linear.optimize.pyswarms", "PySwarmsGlobal"),
+    "PySwarmsLocal": (".non_linear.optimize.pyswarms", "PySwarmsLocal"),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _lazy_imports[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = importlib.import_module(module_name, __name__)
+    if attribute is not None:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
+
+
 conf.instance.register(__file__)
 
-__version__ = '0.71.5'
+__version__ = '0.71.5'
@@ -5,6 +5,7 @@ import pickle
 import dill
 
 from autofit.non_linear import abstract_search
+from autofit.non_linear.samples import load_from_binary, load_from_table
 
 
 class PhaseOutput:
@@ -71,6 +72,50 @@ class PhaseOutput:
         except FileNotFoundError:
             pass
 
+    @property
+    def samples(self):
+        """
+        The samples of the phase. If a binary samples file was output the pickle does not contain the samples
+        themselves, which are memory-mapped from the binary file of this phase or, if it is missing, read from its
+        samples.csv file. Only the samples which had been output when the pickle was saved are loaded.
+        """
+        samples = self.__getattr__("samples")
+        if samples is None or samples.samples is not None:
+            return samples
+
+        binary_file = path.join(self.directory, "samples", "samples.npy")
+        if path.exists(binary_file):
+            sample_list = load_from_binary(filename=binary_file)
+            if len(sample_list) == samples._total_samples:
+                samples._binary_file = binary_file
+        else:
+            sample_list = load_from_table(filename=path.join(self.directory, "samples", "samples.csv"))
+
+        samples.samples = sample_list[:samples._total_samples]
+        return samples
+
+    def marginals(self, bins: int = 50, kde: bool = False, pairs=None):
+        """
+        The 1D marginal PDF of every parameter, and the 2D marginal PDF of pairs of parameters, of the samples of the
+        phase. They are cached in the samples folder of the phase, so are only computed again if different settings
+        are requested.
+
+        Parameters
+        ----------
+        bins
+            The number of bins of each parameter
+        kde
+            If True kernel density estimates are computed as well as histograms
+        pairs
+            The pairs of parameters, by name or index, whose 2D marginals are computed, or "all" for every pair
+        """
+        return self.samples.marginals(
+            bins=bins,
+            kde=kde,
+            pairs=pairs,
+            filename=path.join(self.directory, "samples", "marginals.npz"),
+        )
+
     @property
     def header(self) -> str:
         """
@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from typing import Callable, Hashable, Optional, Tuple
+
+from autoconf import conf
+
+# Configuration read for every evaluation of the log likelihood, which is read when a snapshot is taken rather than
+# when it is first used
+HOT_PATHS = (
+    ("general", "model", "ignore_prior_limits"),
+)
+
+
+def lookup(path: Tuple[str, ...]):
+    """
+    Read a value from the current configuration, for example ("general", "model", "ignore_prior_limits").
+    """
+    value = conf.instance
+    for key in path:
+        value = value[key]
+    return value
+
+
+class ConfigSnapshot:
+    def __init__(self, paths=HOT_PATHS):
+        """
+        A frozen copy of the configuration used by a search, so that code called for every evaluation of the log
+        likelihood does not index the configuration tree each time.
+
+        The values of the hot paths are read when the snapshot is taken. Any other value is read the first time it
+        is requested and the same value is returned for the rest of the search, even if the configuration changes.
+
+        Parameters
+        ----------
+        paths
+            The paths of the values read when the snapshot is taken
+        """
+        self._values = dict()
+        for path in paths:
+            try:
+                self[path]
+            except KeyError:
+                pass
+
+    def __getitem__(self, path: Tuple[str, ...]):
+        return self.cached(path, lambda: lookup(path))
+
+    def cached(self, key: Hashable, function: Callable):
+        """
+        The value stored for a key, calling the function to create it if this is the first time it is requested.
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        value = function()
+        self._values[key] = value
+        return value
+
+
+_active: Optional[ConfigSnapshot] = None
+
+
+def active() -> Optional[ConfigSnapshot]:
+    """
+    The snapshot of the search which is running, or None if no search is running.
+    """
+    return _active
+
+
+def get(*path: str):
+    """
+    Read a value from the configuration, using the snapshot of the running search if there is one.
+
+    Parameters
+    ----------
+    path
+        The keys of the value, for example "general", "model", "ignore_prior_limits"
+    """
+    if _active is None:
+        return lookup(path)
+    return _active[path]
+
+
+def cached(key: Hashable, function: Callable):
+    """
+    Call a function which reads the configuration, storing its result in the snapshot of the running search if
+    there is one so that the function is only called once during the search.
+    """
+    if _active is None:
+        return function()
+    return _active.cached(key, function)
+
+
+@contextmanager
+def frozen():
+    """
+    Take a snapshot of the configuration which is used until the context exits.
+
+    If a snapshot is already active, for example for a search run by a grid search, it continues to be used. Workers
+    forked during the search inherit the snapshot; other workers read the configuration as usual.
+    """
+    global _active
+
+    if _active is not None:
+        yield _active
+        return
+
+    _active = ConfigSnapshot()
+    try:
+        yield _active
+    finally:
+        _active = None
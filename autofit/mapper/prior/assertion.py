@@ -1,5 +1,7 @@
 from abc import ABC
 
+import numpy as np
+
 from autofit.mapper.prior.compound import CompoundPrior
 from autofit.mapper.prior_model.abstract import AbstractPriorModel
 
@@ -84,11 +86,18 @@ class CompoundAssertion(AbstractPriorModel):
         self._name = name
 
     def _instance_for_arguments(self, arguments):
-        return self.assertion_1.instance_for_arguments(
+        first = self.assertion_1.instance_for_arguments(
             arguments
-        ) and self.assertion_2.instance_for_arguments(
+        )
+        if not isinstance(first, np.ndarray) and not first:
+            return first
+        second = self.assertion_2.instance_for_arguments(
             arguments
         )
+        # When arguments are arrays of values each assertion gives an array
+        if isinstance(first, np.ndarray) or isinstance(second, np.ndarray):
+            return np.logical_and(first, second)
+        return second
 
 
 def unwrap(obj):
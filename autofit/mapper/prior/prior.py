@@ -1,15 +1,14 @@
 import inspect
 import math
+import os
 import sys
 from abc import ABC, abstractmethod
-from typing import Union, Tuple
+from glob import glob
+from typing import List, Union, Tuple
 
 import numpy as np
-from scipy import stats
-from scipy.special import erfcinv
-
 from autoconf import conf
-from autofit import exc
+from autofit import config_snapshot, exc
 from autofit.mapper.prior.arithmetic import ArithmeticMixin
 from autofit.mapper.prior.deferred import DeferredArgument
 from autofit.mapper.prior_model.attribute_pair import (
@@ -17,9 +16,102 @@ from autofit.mapper.prior_model.attribute_pair import (
     PriorNameValue,
     InstanceNameValue,
 )
+from autofit.mapper.prior_model.structure import mark_modified
 from autofit.mapper.variable import Variable
 
 
+# Prior configuration stored for each set of config directories, as the version of the prior JSON files it was read
+# from and a dictionary keyed by class and path
+_prior_configs = dict()
+
+
+def clear_prior_config_cache():
+    """
+    Forget all prior configuration read, so that it is read again from the prior config the next time it is needed.
+    """
+    _prior_configs.clear()
+
+
+def _prior_config_version(paths) -> tuple:
+    """
+    The name, size and modification time of every prior JSON file in a set of config directories, which changes
+    whenever a prior config file is edited, added or removed.
+    """
+    version = list()
+    for config_path in paths:
+        for filename in sorted(glob(os.path.join(str(config_path), "priors", "*.json"))):
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            version.append((filename, stat.st_size, stat.st_mtime_ns))
+    return tuple(version)
+
+
+def _prior_configs_for_paths(paths: tuple) -> dict:
+    """
+    The prior configuration stored for a set of config directories.
+
+    Listing the prior JSON files is too slow to do for every lookup, so whether they have changed is checked when
+    configuration is first stored for the directories and then once for each snapshot of the configuration taken by
+    a search, rather than each time the configuration is read.
+    """
+    version, prior_configs = _prior_configs.get(paths, (None, None))
+
+    if prior_configs is None or config_snapshot.active() is not None:
+        current_version = config_snapshot.cached(
+            ("prior_config_version", paths),
+            lambda: _prior_config_version(paths)
+        )
+        if prior_configs is None or current_version != version:
+            prior_configs = dict()
+            _prior_configs[paths] = (current_version, prior_configs)
+
+    return prior_configs
+
+
+def prior_config_for_class_and_suffix_path(cls, suffix_path: List[str]) -> dict:
+    """
+    Prior configuration for an attribute of a class, or of its parents, from the prior config.
+
+    Reading the prior config loads every JSON file in its directories, so results are stored by class and path for
+    each set of config directories. A PriorModel created for a class then only reads the config once for each of its
+    attributes, however many instances of the model are created. Stored results are discarded when
+    clear_prior_config_cache is called, or when a search starts after a prior JSON file has been edited, added or
+    removed.
+
+    Parameters
+    ----------
+    cls
+        The class with which the prior is associated
+    suffix_path
+        The path to the configuration, for example [attribute_name, "width_modifier"]
+
+    Raises
+    ------
+    KeyError
+        If no configuration is found for the class or its parents
+    """
+    paths = tuple(map(str, conf.instance.paths))
+    prior_configs = _prior_configs_for_paths(paths)
+
+    key = (cls, tuple(suffix_path))
+    try:
+        prior_dict = prior_configs[key]
+    except KeyError:
+        try:
+            prior_dict = conf.instance.prior_config.for_class_and_suffix_path(
+                cls, suffix_path
+            )
+        except KeyError as e:
+            prior_dict = e
+        prior_configs[key] = prior_dict
+
+    if isinstance(prior_dict, KeyError):
+        raise KeyError(*prior_dict.args)
+    return dict(prior_dict)
+
+
 class WidthModifier:
     def __init__(self, value):
         self.value = float(value)
@@ -43,7 +135,7 @@ class WidthModifier:
 
     @staticmethod
     def for_class_and_attribute_name(cls, attribute_name):
-        prior_dict = conf.instance.prior_config.for_class_and_suffix_path(
+        prior_dict = prior_config_for_class_and_suffix_path(
             cls, [attribute_name, "width_modifier"]
         )
         return WidthModifier.from_dict(prior_dict)
@@ -55,7 +147,7 @@ class WidthModifier:
 class Limits:
     @staticmethod
     def for_class_and_attributes_name(cls, attribute_name):
-        limit_dict = conf.instance.prior_config.for_class_and_suffix_path(
+        limit_dict = prior_config_for_class_and_suffix_path(
             cls, [attribute_name, "gaussian_limits"]
         )
         return limit_dict["lower"], limit_dict["upper"]
@@ -76,6 +168,14 @@ class TuplePrior:
     A prior comprising one or more priors in a tuple
     """
 
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        mark_modified(self)
+
+    def __delattr__(self, item):
+        super().__delattr__(item)
+        mark_modified(self)
+
     @property
     @cast_collection(PriorNameValue)
     def prior_tuples(self):
@@ -187,7 +287,7 @@ class Prior(Variable, ABC, ArithmeticMixin):
 
     @staticmethod
     def for_class_and_attribute_name(cls, attribute_name):
-        prior_dict = conf.instance.prior_config.for_class_and_suffix_path(
+        prior_dict = prior_config_for_class_and_suffix_path(
             cls, [attribute_name]
         )
         return Prior.from_dict(prior_dict)
@@ -212,6 +312,57 @@ class Prior(Variable, ABC, ArithmeticMixin):
         A physical value.
         """
 
+    @classmethod
+    def values_for_unit_matrix(cls, priors, unit_matrix: np.ndarray) -> np.ndarray:
+        """
+        Physical values for a matrix of unit values with one column per prior.
+
+        Every prior must be an instance of this class. Subclasses override this to
+        transform all columns at once using the parameters of every prior as arrays.
+
+        Parameters
+        ----------
+        priors
+            A list of priors of this class
+        unit_matrix
+            An (N, len(priors)) array of hypercube values between 0 and 1
+
+        Returns
+        -------
+        An (N, len(priors)) array of physical values
+        """
+        return np.stack([
+            prior.value_for(unit_matrix[:, i])
+            for i, prior in enumerate(priors)
+        ], axis=1)
+
+    @classmethod
+    def log_priors_for_value_matrix(cls, priors, value_matrix: np.ndarray) -> np.ndarray:
+        """
+        The log prior of every physical value in a matrix with one column per prior.
+
+        Every prior must be an instance of this class. Subclasses override this to
+        compute all columns at once using the parameters of every prior as arrays.
+
+        Parameters
+        ----------
+        priors
+            A list of priors of this class
+        value_matrix
+            An (N, len(priors)) array of physical values
+
+        Returns
+        -------
+        An (N, len(priors)) array of log priors
+        """
+        return np.stack([
+            np.broadcast_to(
+                prior.log_prior_from_value(value_matrix[:, i]),
+                value_matrix.shape[:1]
+            )
+            for i, prior in enumerate(priors)
+        ], axis=1)
+
     def instance_for_arguments(self, arguments):
         return arguments[self]
 
@@ -296,6 +447,8 @@ class GaussianPrior(Prior):
 
     @property
     def norm(self):
+        from scipy import stats
+
         return stats.norm(loc=self.mean, scale=self.sigma)
 
     @property
@@ -317,8 +470,18 @@ class GaussianPrior(Prior):
         value: Float
             A value for the attribute biased to the gaussian distribution
         """
+        from scipy.special import erfcinv
+
         return self.mean + (self.sigma * math.sqrt(2) * erfcinv(2.0 * (1.0 - unit)))
 
+    @classmethod
+    def values_for_unit_matrix(cls, priors, unit_matrix):
+        from scipy.special import erfcinv
+
+        mean = np.array([prior.mean for prior in priors])
+        sigma = np.array([prior.sigma for prior in priors])
+        return mean + (sigma * math.sqrt(2) * erfcinv(2.0 * (1.0 - unit_matrix)))
+
     def log_prior_from_value(self, value):
         """
     Returns the log prior of a physical value, so the log likelihood of a model evaluation can be converted to a
@@ -332,6 +495,12 @@ class GaussianPrior(Prior):
             The physical value of this prior's corresponding parameter in a `NonLinearSearch` sample."""
         return (value - self.mean) ** 2.0 / (2 * self.sigma ** 2.0)
 
+    @classmethod
+    def log_priors_for_value_matrix(cls, priors, value_matrix):
+        mean = np.array([prior.mean for prior in priors])
+        sigma = np.array([prior.sigma for prior in priors])
+        return (value_matrix - mean) ** 2.0 / (2 * sigma ** 2.0)
+
     def __str__(self):
         """The line of text describing this prior for the model_mapper.info file"""
         return (
@@ -372,6 +541,12 @@ class UniformPrior(Prior):
         """
         return self.lower_limit + unit * (self.upper_limit - self.lower_limit)
 
+    @classmethod
+    def values_for_unit_matrix(cls, priors, unit_matrix):
+        lower_limit = np.array([prior.lower_limit for prior in priors])
+        upper_limit = np.array([prior.upper_limit for prior in priors])
+        return lower_limit + unit_matrix * (upper_limit - lower_limit)
+
     def log_prior_from_value(self, value):
         """
     Returns the log prior of a physical value, so the log likelihood of a model evaluation can be converted to a
@@ -389,6 +564,10 @@ class UniformPrior(Prior):
             The physical value of this prior's corresponding parameter in a `NonLinearSearch` sample."""
         return 0.0
 
+    @classmethod
+    def log_priors_for_value_matrix(cls, priors, value_matrix):
+        return np.zeros(value_matrix.shape)
+
     @property
     def mean(self):
         return self.lower_limit + (self.upper_limit - self.lower_limit) / 2
@@ -429,6 +608,15 @@ class LogUniformPrior(UniformPrior):
                 + unit * (np.log10(self.upper_limit) - np.log10(self.lower_limit))
         )
 
+    @classmethod
+    def values_for_unit_matrix(cls, priors, unit_matrix):
+        log_lower_limit = np.log10([prior.lower_limit for prior in priors])
+        log_upper_limit = np.log10([prior.upper_limit for prior in priors])
+        return 10.0 ** (
+                log_lower_limit
+                + unit_matrix * (log_upper_limit - log_lower_limit)
+        )
+
     def log_prior_from_value(self, value):
         """
     Returns the log prior of a physical value, so the log likelihood of a model evaluation can be converted to a
@@ -442,6 +630,10 @@ class LogUniformPrior(UniformPrior):
             The physical value of this prior's corresponding parameter in a `NonLinearSearch` sample."""
         return 1.0 / value
 
+    @classmethod
+    def log_priors_for_value_matrix(cls, priors, value_matrix):
+        return 1.0 / value_matrix
+
     def __str__(self):
         """The line of text describing this prior for the model_mapper.info file"""
         return (
@@ -452,6 +644,108 @@ class LogUniformPrior(UniformPrior):
         )
 
 
+def group_priors_by_class(priors) -> List[Tuple[type, np.ndarray, list]]:
+    """
+    Group priors by their class so that each group can be transformed at once.
+
+    Parameters
+    ----------
+    priors
+        An ordered list of priors
+
+    Returns
+    -------
+    A list of tuples, each containing a prior class, the indices of priors of that
+    class in the original list and the priors themselves.
+    """
+    groups = dict()
+    for i, prior in enumerate(priors):
+        indices, class_priors = groups.setdefault(type(prior), (list(), list()))
+        indices.append(i)
+        class_priors.append(prior)
+    return [
+        (cls, np.array(indices, dtype=int), class_priors)
+        for cls, (indices, class_priors) in groups.items()
+    ]
+
+
+def _matrix_for_priors(priors, matrix) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim == 1 and matrix.size == 0:
+        matrix = matrix.reshape(0, len(priors))
+    if matrix.ndim != 2 or matrix.shape[1] != len(priors):
+        raise exc.PriorException(
+            f"A matrix of shape {matrix.shape} does not have one column for each of {len(priors)} priors"
+        )
+    return matrix
+
+
+def values_for_unit_matrix(priors, unit_matrix, groups=None) -> np.ndarray:
+    """
+    Physical values for a matrix of unit values with one column per prior.
+
+    Columns are transformed together for each class of prior, rather than one
+    value at a time.
+
+    Parameters
+    ----------
+    priors
+        An ordered list of priors
+    unit_matrix
+        An (N, len(priors)) array of hypercube values between 0 and 1
+    groups
+        The output of group_priors_by_class for the priors, if already computed
+
+    Returns
+    -------
+    An (N, len(priors)) array of physical values
+    """
+    unit_matrix = _matrix_for_priors(priors, unit_matrix)
+    if groups is None:
+        groups = group_priors_by_class(priors)
+
+    physical_matrix = np.empty(unit_matrix.shape)
+    for cls, indices, class_priors in groups:
+        physical_matrix[:, indices] = cls.values_for_unit_matrix(
+            class_priors,
+            unit_matrix[:, indices]
+        )
+    return physical_matrix
+
+
+def log_priors_for_value_matrix(priors, value_matrix, groups=None) -> np.ndarray:
+    """
+    The log prior of every physical value in a matrix with one column per prior.
+
+    Columns are evaluated together for each class of prior, rather than one
+    value at a time.
+
+    Parameters
+    ----------
+    priors
+        An ordered list of priors
+    value_matrix
+        An (N, len(priors)) array of physical values
+    groups
+        The output of group_priors_by_class for the priors, if already computed
+
+    Returns
+    -------
+    An (N, len(priors)) array of log priors
+    """
+    value_matrix = _matrix_for_priors(priors, value_matrix)
+    if groups is None:
+        groups = group_priors_by_class(priors)
+
+    log_prior_matrix = np.empty(value_matrix.shape)
+    for cls, indices, class_priors in groups:
+        log_prior_matrix[:, indices] = cls.log_priors_for_value_matrix(
+            class_priors,
+            value_matrix[:, indices]
+        )
+    return log_prior_matrix
+
+
 def make_type_dict(cls):
     return {
         obj.name_of_class(): obj
@@ -8,44 +8,64 @@ from typing import Tuple, Optional
 import numpy as np
 
 from autoconf import conf
-from autofit import exc
+from autofit import config_snapshot, exc
 from autofit.mapper import model
 from autofit.mapper.model import AbstractModel
 from autofit.mapper.prior.deferred import DeferredArgument
 from autofit.mapper.prior.prior import GaussianPrior
 from autofit.mapper.prior.prior import TuplePrior, Prior, WidthModifier, Limits
+from autofit.mapper.prior.prior import log_priors_for_value_matrix, values_for_unit_matrix
 from autofit.mapper.prior_model.attribute_pair import DeferredNameValue
 from autofit.mapper.prior_model.attribute_pair import cast_collection, PriorNameValue, InstanceNameValue
+from autofit.mapper.prior_model import structure
 from autofit.mapper.prior_model.recursion import DynamicRecursionCache
 from autofit.mapper.prior_model.util import PriorModelNameValue
 from autofit.text import formatter as frm
 from autofit.text.formatter import TextFormatter
 
 
+def assert_assertions(assertions, arguments):
+    """
+    Check that every assertion holds for a set of arguments.
+
+    Parameters
+    ----------
+    assertions
+        Assertions attached to a model
+    arguments
+        Dictionary mapping priors to physical values
+
+    Raises
+    ------
+    exc.FitException
+        If any assertion fails
+    """
+    failed_assertions = [
+        assertion
+        for assertion
+        in assertions
+        if assertion is False or assertion is not True and not assertion.instance_for_arguments(
+            arguments
+        )
+    ]
+    number_of_failed_assertions = len(failed_assertions)
+    if number_of_failed_assertions > 0:
+        name_string = "\n".join([
+            assertion.name
+            for assertion
+            in failed_assertions
+            if hasattr(assertion, "name") and assertion.name is not None
+        ])
+        raise exc.FitException(
+            f"{number_of_failed_assertions} assertions failed!\n{name_string}"
+        )
+
+
 def check_assertions(func):
     @wraps(func)
     def wrapper(s, arguments):
         # noinspection PyProtectedMember
-        failed_assertions = [
-            assertion
-            for assertion
-            in s._assertions
-            if assertion is False or assertion is not True and not assertion.instance_for_arguments(
-                arguments
-            )
-        ]
-        number_of_failed_assertions = len(failed_assertions)
-        if number_of_failed_assertions > 0:
-            name_string = "\n".join([
-                assertion.name
-                for assertion
-                in failed_assertions
-                if hasattr(assertion, "name") and assertion.name is not None
-            ])
-            raise exc.FitException(
-                f"{number_of_failed_assertions} assertions failed!\n{name_string}"
-            )
-
+        assert_assertions(s._assertions, arguments)
         return func(s, arguments)
 
     return wrapper
@@ -59,10 +79,39 @@ class AbstractPriorModel(AbstractModel):
     @DynamicAttrs
     """
 
+    # Bookkeeping is kept out of __dict__ so it is never treated as part of the model
+    __slots__ = ("_structure_version", "_structure_cache")
+
     def __init__(self):
         super().__init__()
         self._assertions = list()
 
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        structure.mark_modified(self)
+
+    def __delattr__(self, item):
+        super().__delattr__(item)
+        structure.mark_modified(self)
+
+    def __getstate__(self):
+        return dict(self.__dict__)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @property
+    @structure.cached_on_structure
+    def instantiation_plan(self):
+        """
+        A compiled plan used to create instances of this model from vectors.
+
+        The plan is reused until the structure of the model changes.
+        """
+        from autofit.mapper.prior_model.plan import InstantiationPlan
+
+        return InstantiationPlan(self)
+
     def add_assertion(self, assertion, name=None):
         """
         Assert that some relationship holds between physical values associated with
@@ -82,6 +131,7 @@ class AbstractPriorModel(AbstractModel):
         except AttributeError:
             pass
         self._assertions.append(assertion)
+        structure.mark_modified(self)
 
     @property
     def name(self):
@@ -181,20 +231,22 @@ class AbstractPriorModel(AbstractModel):
         exc.FitException
             If any assertion attached to this object returns False.
         """
+        plan = self.instantiation_plan
         arguments = dict(
             map(
-                lambda prior_tuple, unit: (
-                    prior_tuple.prior,
-                    prior_tuple.prior.value_for(unit),
+                lambda prior, unit: (
+                    prior,
+                    prior.value_for(unit),
                 ),
-                self.prior_tuples_ordered_by_id,
+                plan.priors,
                 unit_vector,
             )
         )
 
-        return self.instance_for_arguments(arguments, assert_priors_in_limits=assert_priors_in_limits)
+        return plan.instance_for_arguments(arguments, assert_priors_in_limits=assert_priors_in_limits)
 
     @property
+    @structure.cached_on_structure
     @cast_collection(PriorNameValue)
     def unique_prior_tuples(self):
         """
@@ -218,6 +270,7 @@ class AbstractPriorModel(AbstractModel):
         }.values()
 
     @property
+    @structure.cached_on_structure
     @cast_collection(PriorNameValue)
     def prior_tuples_ordered_by_id(self):
         """
@@ -243,12 +296,36 @@ class AbstractPriorModel(AbstractModel):
         """
         return list(
             map(
-                lambda prior_tuple, unit: prior_tuple.prior.value_for(unit),
-                self.prior_tuples_ordered_by_id,
+                lambda prior, unit: prior.value_for(unit),
+                self.instantiation_plan.priors,
                 unit_vector,
             )
         )
 
+    def matrix_from_unit_matrix(self, unit_matrix) -> np.ndarray:
+        """
+        Map many unit hypercube vectors to physical values at once.
+
+        Priors are grouped by class and each group is transformed with array
+        operations, giving the same values as calling vector_from_unit_vector for
+        each row.
+
+        Parameters
+        ----------
+        unit_matrix: np.ndarray
+            An (N, prior_count) array where each row is a unit hypercube vector
+        Returns
+        -------
+        physical_matrix: np.ndarray
+            An (N, prior_count) array where each row is a vector of physical values
+        """
+        plan = self.instantiation_plan
+        return values_for_unit_matrix(
+            plan.priors,
+            unit_matrix,
+            groups=plan.prior_class_groups
+        )
+
     def random_unit_vector_within_limits(self, lower_limit=0.0, upper_limit=1.0):
         """ Generate a random vector of unit values by drawing uniform random values between 0 and 1.
         Returns
@@ -325,16 +402,8 @@ class AbstractPriorModel(AbstractModel):
         model_instance : autofit.mapper.model.ModelInstance
             An object containing reconstructed model_mapper instances
         """
-        arguments = dict(
-            map(
-                lambda prior_tuple, physical_unit: (prior_tuple.prior, physical_unit),
-                self.prior_tuples_ordered_by_id,
-                vector,
-            )
-        )
-
-        return self.instance_for_arguments(
-            arguments,
+        return self.instantiation_plan.instance_for_vector(
+            vector,
             assert_priors_in_limits=assert_priors_in_limits
         )
 
@@ -507,12 +576,53 @@ class AbstractPriorModel(AbstractModel):
         """
         return list(
             map(
-                lambda prior_tuple, value: prior_tuple.prior.log_prior_from_value(value=value),
-                self.prior_tuples_ordered_by_id,
+                lambda prior, value: prior.log_prior_from_value(value=value),
+                self.instantiation_plan.priors,
                 vector,
             )
         )
 
+    def log_priors_from_matrix(self, matrix) -> np.ndarray:
+        """
+        Compute the log priors of every parameter of many samples at once.
+
+        Priors are grouped by class and each group is evaluated with array
+        operations, giving the same values as calling log_priors_from_vector for
+        each row.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            An (N, prior_count) array where each row is a vector of physical values.
+        Returns
+        -------
+        log_priors : np.ndarray
+            An (N, prior_count) array of the log prior of every parameter of every sample.
+        """
+        plan = self.instantiation_plan
+        return log_priors_for_value_matrix(
+            plan.priors,
+            matrix,
+            groups=plan.prior_class_groups
+        )
+
+    def valid_mask_from_matrix(self, matrix) -> np.ndarray:
+        """
+        For every row of a matrix of physical values, whether the values are within the limits of their priors and
+        satisfy the comparison assertions of the model. Rows are checked with array operations, without creating any
+        instances, so batches of points can be filtered before they are fitted.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            An (N, prior_count) array where each row is a vector of physical values.
+        Returns
+        -------
+        mask : np.ndarray
+            A boolean array of length N which is False for rows that cannot be instantiated.
+        """
+        return self.instantiation_plan.valid_mask_for_matrix(matrix)
+
     def random_instance(self):
         """
         Returns a random instance of the model.
@@ -627,6 +737,7 @@ class AbstractPriorModel(AbstractModel):
         return self.direct_tuples_with_type(DeferredArgument)
 
     @property
+    @structure.cached_on_structure
     @cast_collection(PriorNameValue)
     def prior_tuples(self):
         """
@@ -659,6 +770,7 @@ class AbstractPriorModel(AbstractModel):
         return self.attribute_tuples_with_type(float, ignore_class=Prior)
 
     @property
+    @structure.cached_on_structure
     def prior_class_dict(self):
         from autofit.mapper.prior_model.annotation import AnnotationPriorModel
 
@@ -695,7 +807,7 @@ class AbstractPriorModel(AbstractModel):
             raise exc.PriorException(
                 "All promises must be populated prior to instantiation"
             )
-        if assert_priors_in_limits and not conf.instance["general"]["model"]["ignore_prior_limits"]:
+        if assert_priors_in_limits and not config_snapshot.get("general", "model", "ignore_prior_limits"):
             for prior, value in arguments.items():
                 if isinstance(value, Number):
                     prior.assert_within_limits(value)
@@ -704,10 +816,12 @@ class AbstractPriorModel(AbstractModel):
         )
 
     @property
+    @structure.cached_on_structure
     def prior_count(self):
         return len(self.unique_prior_tuples)
 
     @property
+    @structure.cached_on_structure
     def promise_count(self):
         return len(self.unique_promise_tuples)
 
@@ -720,10 +834,12 @@ class AbstractPriorModel(AbstractModel):
         ])
 
     @property
+    @structure.cached_on_structure
     def priors(self):
         return [prior_tuple.prior for prior_tuple in self.prior_tuples]
 
     @property
+    @structure.cached_on_structure(copy=False)
     def _prior_id_map(self):
         return {
             prior.id: prior
@@ -736,15 +852,36 @@ class AbstractPriorModel(AbstractModel):
             prior_id
         ]
 
-    def name_for_prior(self, prior):
+    @property
+    @structure.cached_on_structure(copy=False)
+    def _prior_name_map(self):
+        prior_name_map = dict()
         for prior_model_name, prior_model in self.direct_prior_model_tuples:
-            prior_name = prior_model.name_for_prior(prior)
-            if prior_name is not None:
-                return "{}_{}".format(prior_model_name, prior_name)
-        prior_tuples = self.prior_tuples
-        for name, p in prior_tuples:
-            if p == prior:
-                return name
+            for prior, prior_name in prior_model._prior_name_map.items():
+                prior_name_map.setdefault(
+                    prior, "{}_{}".format(prior_model_name, prior_name)
+                )
+        for name, prior in self.prior_tuples:
+            prior_name_map.setdefault(prior, name)
+        return prior_name_map
+
+    def name_for_prior(self, prior):
+        """
+        Construct a name for the prior. This is the path taken
+        to get to the prior.
+
+        Names for every prior are found together the first time
+        this is called and reused until the model is modified.
+
+        Parameters
+        ----------
+        prior
+
+        Returns
+        -------
+        A string of object names joined by underscores
+        """
+        return self._prior_name_map.get(prior)
 
     def __hash__(self):
         return self.id
@@ -781,10 +918,19 @@ class AbstractPriorModel(AbstractModel):
         return mapper
 
     @property
+    @structure.cached_on_structure
     def path_priors_tuples(self):
         path_priors_tuples = self.path_instance_tuples_for_class(Prior)
         return sorted(path_priors_tuples, key=lambda item: item[1].id)
 
+    @property
+    @structure.cached_on_structure(copy=False)
+    def _prior_path_map(self):
+        prior_path_map = dict()
+        for path, prior in self.path_priors_tuples:
+            prior_path_map.setdefault(prior, path)
+        return prior_path_map
+
     def path_for_prior(self, prior: Prior) -> Optional[Tuple[str]]:
         """
         Find a path that points at the given tuple.
@@ -797,16 +943,14 @@ class AbstractPriorModel(AbstractModel):
         -------
         A path, a series of attributes that point to one location of the prior.
         """
-        for path, path_prior in self.path_priors_tuples:
-            if path_prior == prior:
-                return path
-        return None
+        return self._prior_path_map.get(prior)
 
     @property
     def path_float_tuples(self):
         return self.path_instance_tuples_for_class(float, ignore_class=Prior)
 
     @property
+    @structure.cached_on_structure
     def unique_prior_paths(self):
         unique = {item[1]: item for item in self.path_priors_tuples}.values()
         return [item[0] for item in sorted(unique, key=lambda item: item[1].id)]
@@ -845,6 +989,7 @@ class AbstractPriorModel(AbstractModel):
         return formatter.text
 
     @property
+    @structure.cached_on_structure
     def model_component_and_parameter_names(self) -> [str]:
         """The param_names vector is a list each parameter's analysis_path, and is used
         for *corner.py* visualization.
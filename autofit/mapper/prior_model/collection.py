@@ -3,29 +3,22 @@ from autofit.mapper.model import ModelInstance
 from autofit.mapper.prior.prior import Prior
 from autofit.mapper.prior_model.abstract import AbstractPriorModel
 from autofit.mapper.prior_model.abstract import check_assertions
+from autofit.mapper.prior_model import structure
 
 
 class CollectionPriorModel(AbstractPriorModel):
-    def name_for_prior(self, prior: Prior) -> str:
-        """
-        Construct a name for the prior. This is the path taken
-        to get to the prior.
-
-        Parameters
-        ----------
-        prior
-
-        Returns
-        -------
-        A string of object names joined by underscores
-        """
+    @property
+    @structure.cached_on_structure(copy=False)
+    def _prior_name_map(self):
+        prior_name_map = dict()
         for name, prior_model in self.prior_model_tuples:
-            prior_name = prior_model.name_for_prior(prior)
-            if prior_name is not None:
-                return "{}_{}".format(name, prior_name)
+            for prior, prior_name in prior_model._prior_name_map.items():
+                prior_name_map.setdefault(
+                    prior, "{}_{}".format(name, prior_name)
+                )
         for name, direct_prior in self.direct_prior_tuples:
-            if prior == direct_prior:
-                return name
+            prior_name_map.setdefault(direct_prior, name)
+        return prior_name_map
 
     def __getitem__(self, item):
         return self.values[item]
@@ -125,6 +118,7 @@ class CollectionPriorModel(AbstractPriorModel):
         for key, value in self.__dict__.copy().items():
             if value == item:
                 del self.__dict__[key]
+                structure.mark_modified(self)
 
     @check_assertions
     def _instance_for_arguments(self, arguments):
@@ -175,6 +169,7 @@ class CollectionPriorModel(AbstractPriorModel):
         })
 
     @property
+    @structure.cached_on_structure
     def prior_class_dict(self):
         return {
             **{
@@ -0,0 +1,372 @@
+import inspect
+from numbers import Number
+
+import numpy as np
+
+from autofit import config_snapshot, exc
+from autofit.mapper.model import ModelInstance
+from autofit.mapper.prior.deferred import DeferredInstance
+from autofit.mapper.prior.prior import Prior, group_priors_by_class
+from autofit.mapper.prior.promise import Promise
+from autofit.mapper.prior_model.abstract import AbstractPriorModel, assert_assertions
+from autofit.mapper.prior_model.collection import CollectionPriorModel
+from autofit.mapper.prior_model.prior_model import PriorModel
+
+
+class FallbackStep:
+    def __init__(self, prior_model):
+        """
+        Instantiates a model which defines its own instantiation logic and so
+        cannot be compiled.
+        """
+        self.prior_model = prior_model
+
+    def __call__(self, arguments):
+        return self.prior_model.instance_for_arguments(
+            arguments
+        )
+
+
+class TuplePriorStep:
+    def __init__(self, tuple_prior):
+        """
+        Creates a tuple from the priors and constants of a TuplePrior, ordered by
+        attribute name.
+        """
+        self.entries = [
+            (True, entry.prior) if hasattr(entry, "prior") else (False, entry.instance)
+            for entry in sorted(
+                tuple_prior.prior_tuples + tuple_prior.instance_tuples,
+                key=lambda tup: tup.name
+            )
+        ]
+
+    def __call__(self, arguments):
+        return tuple(
+            arguments[value] if is_prior else value
+            for is_prior, value in self.entries
+        )
+
+
+class PriorModelStep:
+    def __init__(self, prior_model, compile_step):
+        """
+        Instantiates a PriorModel. Everything that depends only on the structure of
+        the model, such as constructor argument names and which attributes are
+        priors, tuple priors or child models, is found once when the step is created.
+
+        Parameters
+        ----------
+        prior_model
+            The model to be instantiated
+        compile_step
+            A function that creates a step for a child model
+        """
+        # noinspection PyProtectedMember
+        self.assertions = prior_model._assertions
+        self.cls = prior_model.cls
+
+        constructor_argument_names = prior_model.constructor_argument_names
+        self.attribute_arguments = {
+            key: value
+            for key, value in prior_model.__dict__.items()
+            if key in constructor_argument_names
+        }
+        self.tuple_prior_steps = [
+            (name, TuplePriorStep(tuple_prior))
+            for name, tuple_prior in prior_model.tuple_prior_tuples
+        ]
+        self.child_steps = [
+            (name, compile_step(child))
+            for name, child in prior_model.direct_prior_model_tuples
+        ]
+        self.prior_tuples = list(prior_model.direct_prior_tuples)
+        self.is_deferred_arguments = prior_model.is_deferred_arguments
+
+        self.attribute_steps = [
+            (
+                key,
+                value,
+                compile_step(value) if isinstance(value, PriorModel) else None
+            )
+            for key, value in prior_model.__dict__.items()
+            if not isinstance(value, (Prior, Promise))
+        ]
+
+    def __call__(self, arguments):
+        assert_assertions(self.assertions, arguments)
+
+        model_arguments = dict()
+        for name, step in self.tuple_prior_steps:
+            model_arguments[name] = step(arguments)
+        for name, step in self.child_steps:
+            model_arguments[name] = step(arguments)
+
+        prior_arguments = dict()
+        for name, prior in self.prior_tuples:
+            try:
+                prior_arguments[name] = arguments[prior]
+            except KeyError as e:
+                raise KeyError(
+                    f"No argument given for prior {name}"
+                ) from e
+
+        constructor_arguments = {
+            **self.attribute_arguments,
+            **model_arguments,
+            **prior_arguments,
+        }
+
+        if self.is_deferred_arguments:
+            return DeferredInstance(self.cls, constructor_arguments)
+
+        if not inspect.isclass(self.cls):
+            # noinspection PyProtectedMember
+            result = object.__new__(inspect._findclass(self.cls))
+            self.cls(result, **constructor_arguments)
+        else:
+            result = self.cls(**constructor_arguments)
+
+        for key, value, step in self.attribute_steps:
+            if not hasattr(result, key):
+                if step is not None:
+                    value = step(arguments)
+                try:
+                    setattr(result, key, value)
+                except AttributeError:
+                    pass
+
+        return result
+
+
+class CollectionStep:
+    def __init__(self, collection, compile_step):
+        """
+        Instantiates a CollectionPriorModel as a ModelInstance.
+
+        Parameters
+        ----------
+        collection
+            The collection to be instantiated
+        compile_step
+            A function that creates a step for a child model
+        """
+        # noinspection PyProtectedMember
+        self.assertions = collection._assertions
+        self.entries = list()
+        for key, value in collection.__dict__.items():
+            if isinstance(value, AbstractPriorModel):
+                self.entries.append((key, compile_step(value), None, None))
+            elif isinstance(value, Prior):
+                self.entries.append((key, None, value, None))
+            else:
+                self.entries.append((key, None, None, value))
+
+    def __call__(self, arguments):
+        assert_assertions(self.assertions, arguments)
+
+        result = ModelInstance()
+        for key, step, prior, value in self.entries:
+            if step is not None:
+                value = step(arguments)
+            elif prior is not None:
+                value = prior.value_for(arguments[prior])
+            setattr(result, key, value)
+        return result
+
+
+def _is_compilable(prior_model, cls):
+    """
+    True if the model instantiates itself using the standard logic for the class.
+    """
+    return (
+            isinstance(prior_model, cls)
+            and type(prior_model).instance_for_arguments is AbstractPriorModel.instance_for_arguments
+            and type(prior_model)._instance_for_arguments is cls._instance_for_arguments
+    )
+
+
+def assertion_mask(assertion, arguments, total_rows) -> np.ndarray:
+    """
+    Evaluate an assertion for many rows at once.
+
+    Comparison assertions, and compound assertions made from them, are evaluated with
+    arguments mapping each prior to a column of values. Any other assertion cannot be
+    evaluated in this way and is treated as holding for every row, so it is only
+    checked when each instance is created.
+
+    Parameters
+    ----------
+    assertion
+        An assertion attached to a model
+    arguments
+        Dictionary mapping priors to arrays of physical values
+    total_rows
+        The length of each array
+
+    Returns
+    -------
+    An array which is True for each row the assertion holds for
+    """
+    from autofit.mapper.prior.assertion import ComparisonAssertion, CompoundAssertion
+
+    if assertion is True or assertion is False:
+        return np.full(total_rows, assertion)
+    if not isinstance(assertion, (ComparisonAssertion, CompoundAssertion)):
+        return np.ones(total_rows, dtype=bool)
+    try:
+        mask = assertion.instance_for_arguments(arguments)
+    except (exc.PriorException, KeyError, AttributeError, TypeError):
+        return np.ones(total_rows, dtype=bool)
+    return np.broadcast_to(np.asarray(mask, dtype=bool), (total_rows,))
+
+
+class InstantiationPlan:
+    def __init__(self, prior_model):
+        """
+        A compiled description of how to create an instance of a model from a
+        vector of physical values.
+
+        Finding the priors of a model, their order, the number of promises and the
+        constructor arguments of each class requires walking the whole model tree.
+        The plan does this once so that instances can be created from many vectors
+        without repeating that work. The plan must be discarded when the structure
+        of the model changes, so it should be accessed through the
+        instantiation_plan property of the model.
+
+        The assertions of every model in a compiled plan are gathered so that they
+        are checked before any part of an instance is created, and so that they can
+        be evaluated for many vectors at once by valid_mask_for_matrix.
+
+        Parameters
+        ----------
+        prior_model
+            The model for which instances are created
+        """
+        self.prior_model = prior_model
+
+        self.prior_tuples = list(prior_model.prior_tuples_ordered_by_id)
+        self.priors = [prior for _, prior in self.prior_tuples]
+        self.prior_count = len(self.priors)
+        self.prior_class_groups = group_priors_by_class(self.priors)
+        self.promise_count = prior_model.promise_count
+
+        self.is_compiled = False
+        self.step = None
+        self.assertions = list()
+
+        if _is_compilable(prior_model, PriorModel) or _is_compilable(prior_model, CollectionPriorModel):
+            try:
+                self.step = self._compile_step(prior_model, dict())
+                self.is_compiled = True
+            except (KeyError, AttributeError):
+                pass
+
+    def _compile_step(self, prior_model, steps):
+        try:
+            return steps[id(prior_model)]
+        except KeyError:
+            pass
+
+        def compile_step(child):
+            return self._compile_step(child, steps)
+
+        if _is_compilable(prior_model, PriorModel):
+            step = PriorModelStep(prior_model, compile_step)
+        elif _is_compilable(prior_model, CollectionPriorModel):
+            step = CollectionStep(prior_model, compile_step)
+        else:
+            step = FallbackStep(prior_model)
+
+        if not isinstance(step, FallbackStep):
+            self.assertions.extend(step.assertions)
+            step.assertions = list()
+
+        steps[id(prior_model)] = step
+        return step
+
+    def arguments_for_vector(self, vector) -> dict:
+        """
+        A dictionary mapping each prior of the model to a value, in the same order
+        as prior_tuples_ordered_by_id.
+        """
+        return dict(zip(self.priors, vector))
+
+    def instance_for_arguments(self, arguments, assert_priors_in_limits=True):
+        """
+        Create an instance of the model for a dictionary mapping priors to physical
+        values.
+
+        Parameters
+        ----------
+        arguments
+            Dictionary mapping priors to physical values
+        assert_priors_in_limits
+            If true it is asserted that the physical values that replace priors are
+            within their limits.
+
+        Returns
+        -------
+        An instance of the model
+        """
+        if not self.is_compiled:
+            return self.prior_model.instance_for_arguments(
+                arguments,
+                assert_priors_in_limits=assert_priors_in_limits
+            )
+        if self.promise_count > 0:
+            raise exc.PriorException(
+                "All promises must be populated prior to instantiation"
+            )
+        if assert_priors_in_limits and not config_snapshot.get("general", "model", "ignore_prior_limits"):
+            for prior, value in arguments.items():
+                if isinstance(value, Number):
+                    prior.assert_within_limits(value)
+        assert_assertions(self.assertions, arguments)
+        return self.step(arguments)
+
+    def instance_for_vector(self, vector, assert_priors_in_limits=True):
+        """
+        Create an instance of the model for a vector of physical values.
+        """
+        return self.instance_for_arguments(
+            self.arguments_for_vector(vector),
+            assert_priors_in_limits=assert_priors_in_limits
+        )
+
+    def valid_mask_for_matrix(self, matrix) -> np.ndarray:
+        """
+        For every row of an (N, prior_count) matrix of physical values, whether an
+        instance can be created from it, found without creating any instances.
+
+        A row is invalid if a value is outside the limits of its prior, unless
+        ignore_prior_limits is on, or if a comparison assertion of the model does
+        not hold. Other assertions, and those of models which cannot be compiled,
+        are only checked when an instance is created, so a valid row may still fail.
+
+        Parameters
+        ----------
+        matrix
+            An (N, prior_count) array where each row is a vector of physical values
+
+        Returns
+        -------
+        A boolean array of length N
+        """
+        matrix = np.asarray(matrix, dtype="float64").reshape(-1, self.prior_count)
+        valid = np.ones(len(matrix), dtype=bool)
+
+        if not config_snapshot.get("general", "model", "ignore_prior_limits"):
+            lower_limits = np.array([prior.lower_limit for prior in self.priors])
+            upper_limits = np.array([prior.upper_limit for prior in self.priors])
+            valid &= np.all(
+                (lower_limits <= matrix) & (matrix <= upper_limits),
+                axis=1
+            )
+
+        if self.is_compiled and len(self.assertions) > 0:
+            arguments = dict(zip(self.priors, matrix.T))
+            for assertion in self.assertions:
+                valid &= assertion_mask(assertion, arguments, len(matrix))
+
+        return valid
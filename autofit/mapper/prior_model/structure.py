@@ -0,0 +1,175 @@
+from functools import wraps
+from itertools import count
+
+_modifications = count(1)
+
+# The number of structural modifications made to any model in this process.
+modification_count = 0
+
+
+def version(obj) -> int:
+    """
+    The number of times the structure of an object in a model tree has been modified.
+    """
+    try:
+        return obj._structure_version
+    except AttributeError:
+        return 0
+
+
+def mark_modified(obj):
+    """
+    Record that the structure of an object in a model tree has changed, for example
+    because an attribute was set, replaced or removed.
+
+    Parameters
+    ----------
+    obj
+        A prior model or tuple prior
+    """
+    global modification_count
+    modification_count = next(_modifications)
+    object.__setattr__(
+        obj,
+        "_structure_version",
+        version(obj) + 1
+    )
+
+
+def tracked_objects(obj) -> list:
+    """
+    Every prior model and tuple prior in the tree rooted at an object. These are the
+    objects whose structural modifications are recorded.
+
+    The tree is traversed in the same way as when searching for priors, so any object
+    that could change which priors a model has is included.
+
+    Parameters
+    ----------
+    obj
+        The root of a model tree
+
+    Returns
+    -------
+    A list of each tracked object, appearing once
+    """
+    from autofit.mapper.prior.prior import Prior, TuplePrior
+    from autofit.mapper.prior_model.abstract import AbstractPriorModel
+
+    tracked = list()
+    seen = set()
+
+    def add(item):
+        if id(item) in seen or isinstance(item, Prior):
+            return
+        seen.add(id(item))
+        if isinstance(item, (AbstractPriorModel, TuplePrior)):
+            tracked.append(item)
+
+        if isinstance(item, dict):
+            d = item
+        else:
+            try:
+                d = item.__dict__
+            except AttributeError:
+                return
+
+        for key, value in d.items():
+            if isinstance(key, str) and key.startswith("_"):
+                continue
+            add(value)
+
+    add(obj)
+    return tracked
+
+
+class StructureSnapshot:
+    def __init__(self, obj):
+        """
+        Records the version of every tracked object in a model tree so that anything
+        derived from the structure of the tree can be reused until the tree changes.
+
+        Checking validity is constant time unless some model in the process has been
+        modified since the last check, in which case the recorded versions are compared.
+
+        Parameters
+        ----------
+        obj
+            The root of a model tree
+        """
+        self.versions = [
+            (item, version(item))
+            for item in tracked_objects(obj)
+        ]
+        self.checked_at = modification_count
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        True if no object in the tree has been modified since the snapshot was taken.
+        """
+        if self.checked_at == modification_count:
+            return True
+        for item, item_version in self.versions:
+            if version(item) != item_version:
+                return False
+        self.checked_at = modification_count
+        return True
+
+
+def structure_cache(obj) -> dict:
+    """
+    A dictionary of values derived from the structure of the tree rooted at an
+    object. The dictionary is emptied when any object in the tree is modified.
+    """
+    try:
+        snapshot, values = obj._structure_cache
+        if snapshot.is_valid:
+            return values
+    except AttributeError:
+        pass
+    values = dict()
+    object.__setattr__(
+        obj,
+        "_structure_cache",
+        (StructureSnapshot(obj), values)
+    )
+    return values
+
+
+def cached_on_structure(func=None, copy=True):
+    """
+    Memoise the result of a method that depends only on the structure of a model.
+
+    The result is computed again only once the model, or any model or tuple prior
+    it contains, has been modified.
+
+    Parameters
+    ----------
+    func
+        A method taking only the object
+    copy
+        If True lists and dictionaries are copied when returned so callers cannot
+        change the cached value. Indices used internally are not copied.
+    """
+    if func is None:
+        return lambda f: cached_on_structure(f, copy=copy)
+
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self):
+        values = structure_cache(self)
+        try:
+            value = values[name]
+        except KeyError:
+            value = func(self)
+            values[name] = value
+        if copy:
+            if isinstance(value, list):
+                return list(value)
+            if isinstance(value, dict):
+                return dict(value)
+        return value
+
+    return wrapper
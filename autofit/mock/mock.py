@@ -133,7 +133,7 @@ class MockSearch(af.NonLinearSearch):
     def tag(self):
         return "mock"
 
-    def perform_update(self, model, analysis, during_analysis):
+    def perform_update(self, model, analysis, during_analysis, iterations=None):
         self.save_samples(samples=self.samples)
         return self.samples
 
@@ -83,7 +83,7 @@ class MockSearch(NonLinearSearch):
     def tag(self):
         return "mock"
 
-    def perform_update(self, model, analysis, during_analysis):
+    def perform_update(self, model, analysis, during_analysis, iterations=None):
         return MockSamples(
             samples=samples_with_log_likelihoods([1.0, 2.0]),
             gaussian_tuples=[
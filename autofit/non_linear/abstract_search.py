@@ -5,20 +5,25 @@ from os import path
 import os
 import pickle
 import shutil
+import time
 from abc import ABC, abstractmethod
-from time import sleep
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
 from autoconf import conf
-from autofit import exc
+from autofit import config_snapshot, exc
 from autofit.mapper import model_mapper as mm
+from autofit.non_linear.cache import LikelihoodCache
 from autofit.non_linear.initializer import Initializer
 from autofit.non_linear.log import logger
 from autofit.non_linear.paths import Paths, convert_paths
+from autofit.non_linear.pool import shared_pool
+from autofit.non_linear.profile import Profiler, null_profiler
+from autofit.non_linear.quantile_sketch import StreamingQuantiles
 from autofit.non_linear import samples as samps
 from autofit.non_linear.timer import Timer
+from autofit.non_linear.update import AdaptiveUpdateCadence, AsynchronousUpdater
 from autofit.text import formatter
 from autofit.text import text_util
 
@@ -107,6 +112,54 @@ class NonLinearSearch(ABC):
 
         self.number_of_cores = number_of_cores
 
+        try:
+            self.asynchronous_updates = conf.instance["general"]["output"]["asynchronous_updates"]
+        except KeyError:
+            self.asynchronous_updates = False
+
+        try:
+            self.samples_to_csv = conf.instance["general"]["output"]["samples_to_csv"]
+        except KeyError:
+            self.samples_to_csv = True
+
+        try:
+            self.profile = conf.instance["general"]["output"]["profile"]
+        except KeyError:
+            self.profile = False
+
+        try:
+            cache_config = conf.instance["general"]["likelihood_cache"]
+            self.likelihood_cache_size = cache_config["size"]
+            self.likelihood_cache_decimals = cache_config["decimals"]
+            self.likelihood_cache_persist = cache_config["persist"]
+        except KeyError:
+            self.likelihood_cache_size = 0
+            self.likelihood_cache_decimals = None
+            self.likelihood_cache_persist = True
+
+        try:
+            cadence_config = conf.instance["general"]["adaptive_updates"]
+            adaptive_updates = cadence_config["adaptive_updates"]
+        except KeyError:
+            adaptive_updates = False
+
+        if adaptive_updates:
+            self.update_cadence = AdaptiveUpdateCadence(
+                overhead_fraction=cadence_config["overhead_fraction"],
+                minimum_iterations=cadence_config["minimum_iterations"],
+                maximum_iterations=cadence_config["maximum_iterations"],
+            )
+        else:
+            self.update_cadence = None
+
+        try:
+            sketch_config = conf.instance["general"]["quantile_sketches"]
+            self.quantile_sketches = sketch_config["quantile_sketches"]
+            self.quantile_sketch_compression = sketch_config["compression"]
+        except KeyError:
+            self.quantile_sketches = False
+            self.quantile_sketch_compression = 200
+
         self._in_phase = False
 
     def copy_with_paths(
@@ -131,9 +184,18 @@ class NonLinearSearch(ABC):
             self.log_likelihood_cap = log_likelihood_cap
             self.pool_ids = pool_ids
 
+            self.profiler = null_profiler
+            self.likelihood_cache = None
+
         def fit_instance(self, instance):
 
-            log_likelihood = self.analysis.log_likelihood_function(instance=instance)
+            with self.profiler("log_likelihood_function"):
+                log_likelihood = self.analysis.log_likelihood_function(instance=instance)
+
+            return self.record_log_likelihood(log_likelihood)
+
+        def record_log_likelihood(self, log_likelihood):
+            """Apply the log likelihood cap to a log likelihood and track the maximum log likelihood."""
 
             if self.log_likelihood_cap is not None:
                 if log_likelihood > self.log_likelihood_cap:
@@ -150,15 +212,125 @@ class NonLinearSearch(ABC):
             return log_likelihood
 
         def log_likelihood_from_parameters(self, parameters):
-            instance = self.model.instance_from_vector(vector=parameters)
+            """The log likelihood of a parameter vector. If the fitness function has a likelihood cache, a vector
+            already evaluated is looked up rather than fitted again. Vectors whose fit raised a FitException are not
+            cached."""
+            if self.likelihood_cache is None:
+                return self._log_likelihood_from_parameters(parameters)
+
+            try:
+                log_likelihood = self.likelihood_cache[parameters]
+            except KeyError:
+                log_likelihood = self._log_likelihood_from_parameters(parameters)
+                self.likelihood_cache[parameters] = log_likelihood
+                return log_likelihood
+
+            return self.record_log_likelihood(log_likelihood)
+
+        def _log_likelihood_from_parameters(self, parameters):
+            with self.profiler("instance_from_vector"):
+                instance = self.model.instance_from_vector(vector=parameters)
             log_likelihood = self.fit_instance(instance)
             return log_likelihood
 
         def log_posterior_from_parameters(self, parameters):
             log_likelihood = self.log_likelihood_from_parameters(parameters=parameters)
-            log_priors = self.model.log_priors_from_vector(vector=parameters)
+            with self.profiler("log_priors"):
+                log_priors = self.model.log_priors_from_vector(vector=parameters)
             return log_likelihood + sum(log_priors)
 
+        def log_likelihoods_from_parameter_matrix(self, parameters) -> Tuple[np.ndarray, np.ndarray]:
+            """The log likelihood of every row of an (N, P) matrix of parameter vectors, and a boolean mask which is
+            True for the rows which were fitted.
+
+            If the analysis implements log_likelihood_function_batch, the instances of every row are evaluated in one
+            call. Otherwise, or if the batch raises a FitException, each instance is evaluated individually.
+
+            Rows whose instance cannot be created or whose fit raises a FitException are False in the mask and their
+            log likelihood is undefined. If the fitness function has a likelihood cache, only rows not already
+            evaluated are fitted and only rows which were fitted are cached."""
+            parameters = np.asarray(parameters)
+            log_likelihoods = np.zeros(len(parameters))
+            fitted = np.zeros(len(parameters), dtype=bool)
+
+            if self.likelihood_cache is None:
+                self._fit_rows(parameters, range(len(parameters)), log_likelihoods, fitted)
+                return log_likelihoods, fitted
+
+            rows = list()
+
+            for index, vector in enumerate(parameters):
+                try:
+                    log_likelihood = self.likelihood_cache[vector]
+                except KeyError:
+                    rows.append(index)
+                    continue
+                log_likelihoods[index] = self.record_log_likelihood(log_likelihood)
+                fitted[index] = True
+
+            self._fit_rows(parameters, rows, log_likelihoods, fitted)
+
+            for index in rows:
+                if fitted[index]:
+                    self.likelihood_cache[parameters[index]] = log_likelihoods[index]
+
+            return log_likelihoods, fitted
+
+        def _fit_rows(self, parameters, rows, log_likelihoods, fitted):
+            """Fit the given rows of a matrix of parameter vectors, writing their log likelihoods in place and marking
+            them in the fitted mask. Rows outside the limits of their priors or failing an assertion of the model are
+            found for all rows at once and are not fitted."""
+            rows = np.asarray(rows, dtype=int)
+            if len(rows) == 0:
+                return
+
+            with self.profiler("valid_mask_from_matrix"):
+                rows = rows[self.model.valid_mask_from_matrix(parameters[rows])]
+
+            indices = list()
+            instances = list()
+
+            for index in rows:
+                vector = parameters[index]
+                try:
+                    with self.profiler("instance_from_vector"):
+                        instances.append(self.model.instance_from_vector(vector=vector))
+                    indices.append(index)
+                except exc.FitException:
+                    pass
+
+            if len(instances) == 0:
+                return
+
+            if has_log_likelihood_function_batch(self.analysis):
+                try:
+                    with self.profiler("log_likelihood_function_batch"):
+                        batch = self.analysis.log_likelihood_function_batch(instances=instances)
+                    log_likelihoods[indices] = [
+                        self.record_log_likelihood(log_likelihood)
+                        for log_likelihood in batch
+                    ]
+                    fitted[indices] = True
+                    return
+                except exc.FitException:
+                    pass
+
+            for index, instance in zip(indices, instances):
+                try:
+                    log_likelihoods[index] = self.fit_instance(instance)
+                    fitted[index] = True
+                except exc.FitException:
+                    pass
+
+        def log_posteriors_from_parameter_matrix(self, parameters) -> Tuple[np.ndarray, np.ndarray]:
+            """The log posterior of every row of an (N, P) matrix of parameter vectors, and a boolean mask which is
+            True for the rows which were fitted."""
+            parameters = np.asarray(parameters)
+            log_likelihoods, fitted = self.log_likelihoods_from_parameter_matrix(parameters=parameters)
+            with self.profiler("log_priors"):
+                log_priors = self.model.log_priors_from_matrix(parameters).sum(axis=1)
+            return log_likelihoods + log_priors, fitted
+
         def figure_of_merit_from_parameters(self, parameters):
             """The figure of merit is the value that the `NonLinearSearch` uses to sample parameter space. This varies
             between different `NonLinearSearch`s, for example:
@@ -169,6 +341,21 @@ class NonLinearSearch(ABC):
             """
             raise NotImplementedError()
 
+        def figures_of_merit_from_parameter_matrix(self, parameters) -> Tuple[np.ndarray, np.ndarray]:
+            """The figure of merit of every row of an (N, P) matrix of parameter vectors, and a boolean mask which is
+            True for the rows which were fitted.
+
+            By default each row is evaluated individually. Searches override this to evaluate the rows as a batch."""
+            figures_of_merit = np.zeros(len(parameters))
+            fitted = np.zeros(len(parameters), dtype=bool)
+            for index, vector in enumerate(parameters):
+                try:
+                    figures_of_merit[index] = self.figure_of_merit_from_parameters(parameters=vector)
+                    fitted[index] = True
+                except exc.FitException:
+                    pass
+            return figures_of_merit, fitted
+
         @staticmethod
         def prior(cube, model):
 
@@ -226,52 +413,61 @@ class NonLinearSearch(ABC):
         produced by this fit.
         """
 
-        try:
-            os.makedirs(self.paths.samples_path)
-        except FileExistsError:
-            pass
+        with config_snapshot.frozen():
+            try:
+                os.makedirs(self.paths.samples_path)
+            except FileExistsError:
+                pass
 
-        self.paths.restore()
-        self.setup_log_file()
+            self.paths.restore()
+            self.setup_log_file()
 
-        if (not path.exists(self.paths.has_completed_path)) or \
-                self.force_pickle_overwrite:
+            if (not path.exists(self.paths.has_completed_path)) or \
+                    self.force_pickle_overwrite:
 
-            self.save_model_info(model=model)
-            self.save_parameter_names_file(model=model)
-            self.save_metadata()
-            self.save_info(info=info)
-            self.save_search()
-            self.save_model(model=model)
-            self.move_pickle_files(pickle_files=pickle_files)
-            analysis.save_attributes_for_aggregator(paths=self.paths)
+                self.save_model_info(model=model)
+                self.save_parameter_names_file(model=model)
+                self.save_metadata()
+                self.save_info(info=info)
+                self.save_search()
+                self.save_model(model=model)
+                self.move_pickle_files(pickle_files=pickle_files)
+                analysis.save_attributes_for_aggregator(paths=self.paths)
 
-        if not path.exists(self.paths.has_completed_path):
+            if not path.exists(self.paths.has_completed_path):
 
-            # TODO : Better way to handle?
-            self.timer.paths = self.paths
-            self.timer.start()
+                # TODO : Better way to handle?
+                self.timer.paths = self.paths
+                self.timer.start()
 
-            self._fit(model=model, analysis=analysis, log_likelihood_cap=log_likelihood_cap)
-            open(self.paths.has_completed_path, "w+").close()
+                if self.update_cadence is not None:
+                    self.update_cadence.start()
 
-            samples = self.perform_update(
-                model=model, analysis=analysis, during_analysis=False
-            )
+                try:
+                    self._fit(model=model, analysis=analysis, log_likelihood_cap=log_likelihood_cap)
+                finally:
+                    self.release_pool_functions()
+                open(self.paths.has_completed_path, "w+").close()
 
-            analysis.save_results_for_aggregator(paths=self.paths, samples=samples)
+                samples = self.perform_update(
+                    model=model, analysis=analysis, during_analysis=False
+                )
 
-        else:
+                analysis.save_results_for_aggregator(paths=self.paths, samples=samples)
 
-            logger.info(f"{self.paths.name} already completed, skipping non-linear search.")
-            samples = self.samples_via_csv_json_from_model(model=model)
+            else:
 
-            if self.force_pickle_overwrite:
-                self.save_samples(samples=samples)
-                analysis.save_results_for_aggregator(paths=self.paths, samples=samples)
+                logger.info(f"{self.paths.name} already completed, skipping non-linear search.")
+                samples = self.samples_via_csv_json_from_model(model=model)
+
+                if self.force_pickle_overwrite:
+                    self.save_samples(samples=samples)
+                    analysis.save_results_for_aggregator(paths=self.paths, samples=samples)
 
-        self.paths.zip_remove()
-        return Result(samples=samples, previous_model=model, search=self)
+            analysis.remove_shared_arrays()
+
+            self.paths.zip_remove()
+            return Result(samples=samples, previous_model=model, search=self)
 
     @abstractmethod
     def _fit(self, model, analysis, log_likelihood_cap=None):
@@ -322,10 +518,16 @@ class NonLinearSearch(ABC):
         -------
         attribute
             An attribute for the key with the specified type.
+
+        During a fit the value is stored in the config snapshot of the search, as tags are built from these values
+        whenever an output path is requested.
         """
-        return self.config_type[self.__class__.__name__][section][attribute_name]
+        return config_snapshot.cached(
+            (self.__class__, section, attribute_name),
+            lambda: self.config_type[self.__class__.__name__][section][attribute_name]
+        )
 
-    def perform_update(self, model, analysis, during_analysis):
+    def perform_update(self, model, analysis, during_analysis, iterations=None):
         """Perform an update of the `NonLinearSearch` results, which occurs every *iterations_per_update* of the
         non-linear search. The update performs the following tasks:
 
@@ -335,6 +537,20 @@ class NonLinearSearch(ABC):
         These task are performed every n updates, set by the relevent *task_every_update* variable, for example
         *visualize_every_update*
 
+        If *asynchronous_updates* is on, the samples are computed and the maximum log likelihood model is visualized
+        while the search waits, as neither matplotlib nor the analysis need be thread-safe. Outputting the samples and
+        writing the model results are performed on a background thread. If a new update arrives before the previous
+        one has been output the two are combined. The final update, made after the search finishes, waits for any
+        background update and is performed immediately.
+
+        If *adaptive_updates* is on, the time the update took and the rate the search sampled at since the last update
+        are used to choose *iterations_per_update* for the next update, keeping the time spent on updates below a
+        fraction of the run time. The rate is measured from the iterations the search actually performed, which may
+        differ from *iterations_per_update* (for example when a sampler stops early or counts likelihood calls).
+
+        If *quantile_sketches* is on, the medians and errors of intermediate results are estimated from sketches of
+        the samples which are updated with only the samples added since the previous update.
+
         Parameters
         ----------
         model : ModelMapper
@@ -345,36 +561,108 @@ class NonLinearSearch(ABC):
         during_analysis : bool
             If the update is during a non-linear search, in which case tasks are only performed after a certain number
              of updates and only a subset of visualization may be performed.
+        iterations : int or None
+            The iterations the search performed since the previous update. If None, the search is assumed to have
+            performed *iterations_per_update* iterations.
         """
 
-        self.iterations += self.iterations_per_update
+        update_start = time.perf_counter()
+
+        if iterations is None:
+            iterations = self.iterations_per_update
+
+        self.iterations += iterations
         logger.info(f"{self.iterations} Iterations: Performing update (Visualization, outputting samples, etc.).")
 
         self.timer.update()
 
-        samples = self.samples_via_sampler_from_model(model=model)
-        samples.write_table(filename=self.paths.samples_file)
-        samples.info_to_json(filename=self.paths.info_file)
+        with self.profiler("update.samples"):
+            samples = self.samples_via_sampler_from_model(model=model)
+
+            if during_analysis and self.streaming_quantiles is not None and isinstance(samples, samps.PDFSamples):
+                samples.stream_quantiles(self.streaming_quantiles)
+
+        update = dict(
+            samples=samples,
+            analysis=analysis,
+            during_analysis=during_analysis,
+            visualize=self.should_visualize() or not during_analysis,
+            output_model_results=self.should_output_model_results() or not during_analysis,
+        )
+
+        if during_analysis and self.asynchronous_updates:
+            if update["visualize"]:
+                self.visualize_update(samples=samples, analysis=analysis, during_analysis=during_analysis)
+            self.asynchronous_updater.submit({**update, "visualize": False})
+        else:
+            self.flush_updates()
+            self.output_update(**update)
+
+        if self.profile:
+            self.profiler.output_to_json(filename=self.paths.file_profile)
+
+        cache = self.likelihood_cache
+        if cache is not None:
+            logger.info(f"Likelihood cache: {cache.hits} hits, {cache.misses} misses.")
+            if cache.directory is not None:
+                cache.save()
+
+        if during_analysis and self.update_cadence is not None:
+            self.iterations_per_update = self.update_cadence.iterations_per_update(
+                iterations=iterations, update_start=update_start
+            )
+            logger.info(f"Performing the next update after {self.iterations_per_update} iterations.")
+
+        return samples
+
+    def output_update(self, samples, analysis, during_analysis, visualize, output_model_results):
+        """Output the samples of an update and, if requested, visualize the maximum log likelihood model and write
+        the model.results and search summary files.
+
+        Parameters
+        ----------
+        samples : OptimizerSamples
+            The samples of the `NonLinearSearch` at the time of the update.
+        analysis : Analysis
+            Contains the data and the log likelihood function which fits an instance of the model to the data, returning
+            the log likelihood the `NonLinearSearch` maximizes.
+        during_analysis : bool
+            If the update is during a non-linear search.
+        visualize : bool
+            Whether the maximum log likelihood model is visualized.
+        output_model_results : bool
+            Whether the model.results and search summary files are written.
+        """
+        with self.profiler("update.output_samples"):
+            self.samples_binary_writer.write(samples=samples)
+
+            if self.samples_to_csv:
+                self.samples_table_writer.write(samples=samples)
+                if not during_analysis:
+                    self.samples_table_writer.close()
 
-        self.save_samples(samples=samples)
+            samples.info_to_json(filename=self.paths.info_file)
+
+            self.save_samples(samples=samples)
 
         try:
-            instance = samples.max_log_likelihood_instance
+            samples.max_log_likelihood_instance
         except exc.FitException:
-            return samples
+            return
 
-        if self.should_visualize() or not during_analysis:
-            analysis.visualize(paths=self.paths, instance=instance, during_analysis=during_analysis)
+        if visualize:
+            self.visualize_update(samples=samples, analysis=analysis, during_analysis=during_analysis)
 
-        if self.should_output_model_results() or not during_analysis:
+        if output_model_results:
 
-            text_util.results_to_file(
-                samples=samples,
-                filename=self.paths.file_results,
-                during_analysis=during_analysis,
-            )
+            with self.profiler("update.model_results"):
+                text_util.results_to_file(
+                    samples=samples,
+                    filename=self.paths.file_results,
+                    during_analysis=during_analysis,
+                )
 
-            text_util.search_summary_to_file(samples=samples, filename=self.paths.file_search_summary)
+                text_util.search_summary_to_file(samples=samples, filename=self.paths.file_search_summary)
 
         if not during_analysis and self.remove_state_files_at_end:
             try:
@@ -382,7 +670,127 @@ class NonLinearSearch(ABC):
             except FileNotFoundError:
                 pass
 
-        return samples
+    def visualize_update(self, samples, analysis, during_analysis):
+        """Visualize the maximum log likelihood model of the samples of an update. This is always called on the
+        thread running the search.
+
+        Parameters
+        ----------
+        samples : OptimizerSamples
+            The samples of the `NonLinearSearch` at the time of the update.
+        analysis : Analysis
+            Visualizes the instance.
+        during_analysis : bool
+            If the update is during a non-linear search.
+        """
+        try:
+            instance = samples.max_log_likelihood_instance
+        except exc.FitException:
+            return
+
+        with self.profiler("update.visualize"):
+            analysis.visualize(paths=self.paths, instance=instance, during_analysis=during_analysis)
+
+    @property
+    def asynchronous_updater(self) -> AsynchronousUpdater:
+        """The updater which outputs updates on a background thread when *asynchronous_updates* is on. It is created
+        when first used and is not pickled with the search."""
+        try:
+            return self.__dict__["_asynchronous_updater"]
+        except KeyError:
+            updater = AsynchronousUpdater(
+                perform=lambda update: self.output_update(**update),
+                combine=combine_updates,
+            )
+            self.__dict__["_asynchronous_updater"] = updater
+            return updater
+
+    @property
+    def samples_table_writer(self) -> samps.SamplesTableWriter:
+        """Writes the samples.csv file of the search, appending only the samples which are new at each update. It is
+        not pickled with the search."""
+        writer = self.__dict__.get("_samples_table_writer")
+        if writer is None or writer.filename != self.paths.samples_file:
+            if writer is not None:
+                writer.close()
+            writer = samps.SamplesTableWriter(filename=self.paths.samples_file)
+            self.__dict__["_samples_table_writer"] = writer
+        return writer
+
+    @property
+    def samples_binary_writer(self) -> samps.SamplesBinaryWriter:
+        """Writes the binary samples file of the search, appending only the samples which are new at each update. It
+        is not pickled with the search."""
+        writer = self.__dict__.get("_samples_binary_writer")
+        if writer is None or writer.filename != self.paths.samples_binary_file:
+            writer = samps.SamplesBinaryWriter(filename=self.paths.samples_binary_file)
+            self.__dict__["_samples_binary_writer"] = writer
+        return writer
+
+    @property
+    def profiler(self):
+        """Times each stage of the fit when *profile* is on, writing a summary to the profile.json file at every
+        update. Its fitness function is given the same profiler by the search, so that the log likelihood function
+        and the other stages of each evaluation are timed too. It is not pickled with the search."""
+        if not self.profile:
+            return null_profiler
+
+        directory = path.join(self.paths.samples_path, "profile")
+        profiler = self.__dict__.get("_profiler")
+        if profiler is None or profiler.directory != directory:
+            profiler = Profiler(directory=directory)
+            self.__dict__["_profiler"] = profiler
+        return profiler
+
+    @property
+    def likelihood_cache(self) -> Optional[LikelihoodCache]:
+        """The cache of log likelihoods given to the fitness function, or None if the size of the likelihood cache in
+        general.ini is 0. If *persist* is on it is saved to the samples folder at every update and reloaded when the
+        search is resumed. It is not pickled with the search."""
+        if not self.likelihood_cache_size:
+            return None
+
+        directory = (
+            path.join(self.paths.samples_path, "likelihood_cache")
+            if self.likelihood_cache_persist
+            else None
+        )
+        cache = self.__dict__.get("_likelihood_cache")
+        if cache is None or cache.directory != directory:
+            cache = LikelihoodCache(
+                size=self.likelihood_cache_size,
+                decimals=self.likelihood_cache_decimals,
+                directory=directory,
+            )
+            self.__dict__["_likelihood_cache"] = cache
+        return cache
+
+    @property
+    def streaming_quantiles(self) -> Optional[StreamingQuantiles]:
+        """Sketches of the samples of the search used to compute the medians and errors of intermediate results, or
+        None if *quantile_sketches* is off. The final results are always computed from every sample. It is not
+        pickled with the search."""
+        if not self.quantile_sketches:
+            return None
+
+        samples_path, streaming_quantiles = self.__dict__.get("_streaming_quantiles", (None, None))
+        if streaming_quantiles is None or samples_path != self.paths.samples_path:
+            streaming_quantiles = StreamingQuantiles(compression=self.quantile_sketch_compression)
+            self.__dict__["_streaming_quantiles"] = (self.paths.samples_path, streaming_quantiles)
+        return streaming_quantiles
+
+    def setup_fitness_function(self, fitness_function):
+        """Give a fitness function the profiler and likelihood cache of the search."""
+        fitness_function.profiler = self.profiler
+        fitness_function.likelihood_cache = self.likelihood_cache
+
+    def flush_updates(self):
+        """Wait for any updates being output in the background to finish."""
+        try:
+            updater = self.__dict__["_asynchronous_updater"]
+        except KeyError:
+            return
+        updater.flush()
 
     def setup_log_file(self):
 
@@ -454,7 +862,17 @@ class NonLinearSearch(ABC):
     def save_samples(self, samples):
         """
         Save the final-result samples associated with the phase as a pickle
+
+        Samples which have been written to the binary samples file are pickled without their sample list, so that the
+        pickle stays small however many samples there are. The number of samples is stored instead and the aggregator
+        loads that many rows from the binary samples file, or from the samples.csv file if it is missing.
         """
+        if getattr(samples, "_binary_file", None) is not None:
+            total_samples = len(samples.samples)
+            samples = copy.copy(samples)
+            samples.samples = None
+            samples._total_samples = total_samples
+
         with open(self.paths.make_samples_pickle_path(), "w+b") as f:
             f.write(pickle.dumps(samples))
 
@@ -497,6 +915,13 @@ class NonLinearSearch(ABC):
     def samples_via_sampler_from_model(self, model):
         raise NotImplementedError()
 
+    def load_sample_list(self) -> samps.SampleList:
+        """Load the samples output by the search. The binary samples file is memory-mapped if it exists, otherwise
+        the samples.csv file is read."""
+        if path.exists(self.paths.samples_binary_file):
+            return samps.load_from_binary(filename=self.paths.samples_binary_file)
+        return samps.load_from_table(filename=self.paths.samples_file)
+
     def samples_via_csv_json_from_model(self, model):
         raise NotImplementedError()
 
@@ -504,34 +929,50 @@ class NonLinearSearch(ABC):
         """Make the pool instance used to parallelize a `NonLinearSearch` alongside a set of unique ids for every
         process in the pool. If the specified number of cores is 1, a pool instance is not made and None is returned.
 
-        The pool cannot be set as an attribute of the class itself because this prevents pickling, thus it is generated
-        via this function before calling the non-linear search.
+        The pool is shared by every search in the process which uses the same number of cores, so worker processes
+        are started once and reused by later searches (e.g. the phases of a pipeline). It is not set as an attribute
+        of the class itself because this prevents pickling.
 
-        The pool instance is also set up with a list of unique pool ids, which are used during model-fitting to
-        identify a 'master core' (the one whose id value is lowest) which handles model result output, visualization,
-        etc."""
+        Functions evaluated by the pool should first be shipped to its workers using ship_function, so that each
+        task carries only a parameter vector.
+
+        The pool ids are the pids of the worker processes, which are used during model-fitting to identify a 'master
+        core' (the one whose id value is lowest) which handles model result output, visualization, etc."""
 
         if self.number_of_cores == 1:
 
             return None, None
 
-        else:
-
-            manager = mp.Manager()
-            idQueue = manager.Queue()
+        pool = shared_pool(self.number_of_cores)
 
-            [idQueue.put(i) for i in range(self.number_of_cores)]
+        return pool, pool.pids
 
-            pool = mp.Pool(
-                processes=self.number_of_cores, initializer=init, initargs=(idQueue,)
-            )
-            ids = pool.map(f, range(self.number_of_cores))
+    def ship_function(self, pool, function):
+        """Ship a function, such as the fitness function, to the workers of a pool. It is released when the fit
+        finishes, so that the pool keeps its file only while this search needs it."""
+        function = pool.function(function)
+        self.__dict__.setdefault("_pool_functions", list()).append(function)
+        return function
 
-            return pool, [id[1] for id in ids]
+    def release_pool_functions(self):
+        """Release every function this search shipped to a pool."""
+        for function in self.__dict__.pop("_pool_functions", list()):
+            function.release()
 
     def __eq__(self, other):
         return isinstance(other, NonLinearSearch) and self.__dict__ == other.__dict__
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_asynchronous_updater", None)
+        state.pop("_samples_table_writer", None)
+        state.pop("_samples_binary_writer", None)
+        state.pop("_profiler", None)
+        state.pop("_likelihood_cache", None)
+        state.pop("_streaming_quantiles", None)
+        state.pop("_pool_functions", None)
+        return state
+
     def __setstate__(self, state):
         self.__dict__.update(state)
         self.paths.restore()
@@ -542,6 +983,31 @@ class Analysis(ABC):
     def log_likelihood_function(self, instance):
         raise NotImplementedError()
 
+    def log_likelihood_function_batch(self, instances) -> List[float]:
+        """
+        The log likelihood of every instance in a batch of instances of the model.
+
+        Searches which evaluate many points at once (e.g. PySwarms and Emcee) call this once per batch. Analyses that
+        can vectorize their likelihood over many parameter sets, for example using NumPy broadcasting, should
+        override this function. By default log_likelihood_function is called for each instance.
+
+        If a FitException is raised each instance is evaluated individually using log_likelihood_function, so that
+        only the instances which cannot be fitted are resampled.
+
+        Parameters
+        ----------
+        instances
+            A list of instances of the model
+
+        Returns
+        -------
+        The log likelihood of each instance
+        """
+        return [
+            self.log_likelihood_function(instance=instance)
+            for instance in instances
+        ]
+
     def visualize(self, paths : Paths, instance, during_analysis):
         pass
 
@@ -551,6 +1017,78 @@ class Analysis(ABC):
     def save_results_for_aggregator(self, paths: Paths, samples : samps.OptimizerSamples):
         pass
 
+    def share_arrays(self, directory: str, attributes: Optional[List[str]] = None) -> int:
+        """
+        Replace the NumPy arrays held by this analysis, including those of its dataset, with read-only arrays
+        memory-mapped from files in a directory (e.g. the output path of the phase).
+
+        Copies of the analysis sent to the processes of a parallel search or grid search then map the same files
+        rather than each holding its own copy of the data, and deep copies of the analysis share the arrays.
+
+        Only arrays held by the attributes of the analysis, by lists and dictionaries in them, and likewise by the
+        attributes of its dataset are shared. Plain numpy arrays are shared; subclasses of ndarray are left
+        unchanged. The log likelihood function must not modify the shared arrays in place.
+
+        When a search fitting this analysis completes the arrays are copied back into memory and the files are
+        removed, so share_arrays is called again before each fit which should use them.
+
+        Parameters
+        ----------
+        directory
+            The directory in which the memory-mapped files are written
+        attributes
+            The names of the attributes whose arrays are shared, which defaults to every attribute of the analysis
+            and of its dataset
+
+        Returns
+        -------
+        The number of arrays that were shared
+        """
+        from autofit.non_linear.shared import share_arrays
+
+        filenames = share_arrays(self, directory, attributes)
+        self.__dict__.setdefault("_shared_arrays", list()).append(
+            (os.getpid(), filenames, attributes)
+        )
+        return len(filenames)
+
+    def remove_shared_arrays(self):
+        """
+        Copy arrays shared by share_arrays back into memory and remove their files. Only the process that shared
+        the arrays removes them, so copies of the analysis in other processes leave them in place.
+        """
+        from autofit.non_linear.shared import unshare_arrays
+
+        shared_arrays = self.__dict__.get("_shared_arrays", list())
+        for pid, filenames, attributes in list(shared_arrays):
+            if pid == os.getpid():
+                unshare_arrays(self, filenames, attributes)
+                shared_arrays.remove((pid, filenames, attributes))
+
+
+def has_log_likelihood_function_batch(analysis) -> bool:
+    """
+    True if an analysis overrides log_likelihood_function_batch, in which case batches of instances are evaluated
+    with a single call.
+    """
+    return getattr(
+        type(analysis),
+        "log_likelihood_function_batch",
+        Analysis.log_likelihood_function_batch
+    ) is not Analysis.log_likelihood_function_batch
+
+
+def combine_updates(waiting: dict, update: dict) -> dict:
+    """
+    Combine an update that was never output with the newer update replacing it, so that output of model results
+    requested by the older update is still performed.
+    """
+    return {
+        **update,
+        "visualize": waiting["visualize"] or update["visualize"],
+        "output_model_results": waiting["output_model_results"] or update["output_model_results"],
+    }
+
 
 class Result:
     """
@@ -754,15 +1292,3 @@ class PriorPasser:
         use_errors = config("prior_passer", "use_errors")
         use_widths = config("prior_passer", "use_widths")
         return PriorPasser(sigma=sigma, use_errors=use_errors, use_widths=use_widths)
-
-
-def init(queue):
-    global idx
-    idx = queue.get()
-
-
-def f(x):
-    global idx
-    process = mp.current_process()
-    sleep(1)
-    return idx, process.pid, x * x
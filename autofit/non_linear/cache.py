@@ -0,0 +1,172 @@
+import os
+import time
+from collections import OrderedDict
+from os import path
+from typing import List, Optional
+
+import numpy as np
+
+from autofit.non_linear.log import logger
+
+
+class LikelihoodCache:
+    def __init__(
+            self,
+            size: int = 10000,
+            decimals: Optional[int] = None,
+            directory: Optional[str] = None,
+            save_interval: float = 60.0,
+    ):
+        """
+        A bounded cache of the log likelihoods of parameter vectors, so that a vector a search has already evaluated
+        is not given to the log likelihood function again. When the cache is full the least recently used vector is
+        discarded.
+
+        Only vectors which were fitted are stored; a vector whose fit raised a FitException is fitted again when it is
+        next evaluated.
+
+        If a directory is given the cache can be saved to it and is loaded from it when created, so a resumed search
+        reuses the evaluations made before it was restarted. A cache pickled to the workers of a parallel search keeps
+        its entries and each worker saves its own file every save_interval seconds. Files written by every process are
+        combined when the cache is next created.
+
+        Parameters
+        ----------
+        size
+            The maximum number of vectors stored
+        decimals
+            If given, vectors are rounded to this number of decimal places before being looked up, so that vectors
+            which differ by less are treated as the same. If None vectors must be identical.
+        directory
+            The directory the cache is saved to and loaded from
+        save_interval
+            The number of seconds between each worker saving its cache
+        """
+        self.size = size
+        self.decimals = decimals
+        self.directory = directory
+        self.save_interval = save_interval
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._pid = os.getpid()
+        self._last_save = time.perf_counter()
+
+        if directory is not None:
+            self.load()
+
+    def key(self, vector) -> bytes:
+        vector = np.asarray(vector, dtype="float64")
+        if self.decimals is not None:
+            # Adding zero turns -0.0 into 0.0 so both round to the same key
+            vector = np.round(vector, self.decimals) + 0.0
+        return vector.tobytes()
+
+    def __getitem__(self, vector) -> float:
+        """
+        The log likelihood stored for a vector, raising a KeyError if there is none.
+        """
+        key = self.key(vector)
+        try:
+            log_likelihood = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return log_likelihood
+
+    def __setitem__(self, vector, log_likelihood: float):
+        self._put(self.key(vector), log_likelihood)
+
+        if self.directory is not None:
+            now = time.perf_counter()
+            if now - self._last_save > self.save_interval:
+                self._last_save = now
+                if os.getpid() != self._pid:
+                    self.save()
+
+    def _put(self, key: bytes, log_likelihood: float):
+        self._entries[key] = float(log_likelihood)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, vector):
+        return self.key(vector) in self._entries
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["hits"] = 0
+        state["misses"] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._last_save = time.perf_counter()
+
+    @property
+    def files(self) -> List[str]:
+        try:
+            return [
+                path.join(self.directory, filename)
+                for filename in os.listdir(self.directory)
+                if filename.endswith(".npz")
+            ]
+        except FileNotFoundError:
+            return list()
+
+    @property
+    def filename(self) -> str:
+        return path.join(self.directory, f"{os.getpid()}.npz")
+
+    def save(self):
+        """
+        Save the entries of the cache to this process's file in the directory, least recently used first.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        if len(self._entries) > 0:
+            parameters = np.stack([
+                np.frombuffer(key, dtype="float64")
+                for key in self._entries
+            ])
+        else:
+            parameters = np.zeros((0, 0))
+
+        temporary = f"{self.filename}.tmp.npz"
+        np.savez(
+            temporary,
+            parameters=parameters,
+            log_likelihoods=np.array(list(self._entries.values())),
+        )
+        os.replace(temporary, self.filename)
+
+    def load(self):
+        """
+        Add the entries saved by every process to the cache, then replace their files with a single file for this
+        process.
+        """
+        files = self.files
+        if len(files) == 0:
+            return
+
+        for filename in files:
+            try:
+                with np.load(filename) as f:
+                    for vector, log_likelihood in zip(f["parameters"], f["log_likelihoods"]):
+                        self._put(vector.tobytes(), log_likelihood)
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug(e)
+
+        for filename in files:
+            os.remove(filename)
+
+        self.save()
+
+        logger.info(f"Loaded {len(self)} cached log likelihoods from {self.directory}")
@@ -220,10 +220,10 @@ class GridSearch:
 
     def make_physical_lists(self, grid_priors) -> List[List[float]]:
         lists = self.make_lists(grid_priors)
-        return [
-            [prior.value_for(value) for prior, value in zip(grid_priors, l)]
-            for l in lists
-        ]
+        return p.values_for_unit_matrix(
+            grid_priors,
+            np.array(lists).reshape(len(lists), len(grid_priors))
+        ).tolist()
 
     def make_lists(self, grid_priors):
         """
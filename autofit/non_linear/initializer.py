@@ -4,8 +4,51 @@ from autofit import exc
 from autofit.non_linear.log import logger
 
 import configparser
+from typing import Tuple
+
 import numpy as np
 
+# At most this many times the number of initial points are drawn in one batch
+MAXIMUM_DRAWS_FACTOR = 100
+
+
+def figures_of_merit_from_parameter_matrix(
+        fitness_function, parameters: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The figure of merit of every row of a matrix of parameters, and a boolean mask which is True for the rows which
+    were fitted.
+
+    If the fitness function has been shipped to a pool the rows are split between its workers. Fitness functions
+    without a batch method are evaluated one row at a time.
+    """
+    from autofit.non_linear.pool import PoolFunction
+
+    if isinstance(fitness_function, PoolFunction) and fitness_function.pool is not None:
+        chunks = [
+            chunk for chunk in np.array_split(parameters, fitness_function.pool.number_of_cores)
+            if len(chunk) > 0
+        ]
+        figures_of_merit, fitted = zip(
+            *fitness_function.map_method("figures_of_merit_from_parameter_matrix", chunks)
+        )
+        return np.concatenate(figures_of_merit), np.concatenate(fitted)
+
+    if hasattr(fitness_function, "figures_of_merit_from_parameter_matrix"):
+        figures_of_merit, fitted = fitness_function.figures_of_merit_from_parameter_matrix(parameters)
+        return np.asarray(figures_of_merit), np.asarray(fitted, dtype=bool)
+
+    figures_of_merit = np.zeros(len(parameters))
+    fitted = np.zeros(len(parameters), dtype=bool)
+    for index, vector in enumerate(parameters):
+        try:
+            figures_of_merit[index] = fitness_function.figure_of_merit_from_parameters(parameters=vector)
+            fitted[index] = True
+        except exc.FitException:
+            pass
+    return figures_of_merit, fitted
+
+
 class Initializer:
     def __init__(self, lower_limit, upper_limit):
         """
@@ -51,6 +94,11 @@ class Initializer:
         Generate the initial points of the non-linear search, by randomly drawing unit values from a uniform
         distribution between the ball_lower_limit and ball_upper_limit values.
 
+        Points are drawn in batches. Each batch is mapped to physical values by the priors at once and points outside
+        the limits of their priors or failing an assertion of the model are discarded before being fitted. The remaining points are evaluated together,
+        in parallel if the fitness function has been shipped to a pool, and points are drawn until total_points of
+        them have been fitted successfully. Points whose figure of merit is not finite are discarded.
+
         Parameters
         ----------
         total_points : int
@@ -58,6 +106,8 @@ class Initializer:
         model : ModelMapper
             An object that represents possible instances of some model with a given dimensionality which is the number
             of free dimensions of the model.
+        fitness_function
+            The fitness function of the search, which gives the figure of merit of each point.
         """
 
         if conf.instance["general"]["test"]["test_mode"]:
@@ -65,35 +115,48 @@ class Initializer:
 
         logger.info("Generating initial samples of model, which are subject to prior limits and other constraints.")
 
-        initial_unit_parameters = []
-        initial_parameters = []
-        initial_figures_of_merit = []
+        initial_unit_parameters = np.zeros((0, model.prior_count))
+        initial_parameters = np.zeros((0, model.prior_count))
+        initial_figures_of_merit = np.zeros(0)
 
-        point_index = 0
+        acceptance_ratio = 1.0
 
-        while point_index < total_points:
+        while len(initial_figures_of_merit) < total_points:
 
-            unit_parameters = model.random_unit_vector_within_limits(
-                lower_limit=self.lower_limit, upper_limit=self.upper_limit
+            points_remaining = total_points - len(initial_figures_of_merit)
+            total_draws = min(
+                int(np.ceil(points_remaining / acceptance_ratio)),
+                MAXIMUM_DRAWS_FACTOR * total_points
             )
-            parameters = model.vector_from_unit_vector(unit_vector=unit_parameters)
 
-            try:
-                figure_of_merit = fitness_function.figure_of_merit_from_parameters(
-                    parameters=parameters
-                )
+            unit_parameters = np.random.uniform(
+                low=self.lower_limit, high=self.upper_limit, size=(total_draws, model.prior_count)
+            )
+            parameters = model.matrix_from_unit_matrix(unit_matrix=unit_parameters)
 
-                if np.isnan(figure_of_merit):
-                    raise exc.FitException
+            valid = model.valid_mask_from_matrix(parameters)
+            acceptance_ratio = max(np.mean(valid), 1.0 / MAXIMUM_DRAWS_FACTOR)
 
-                initial_unit_parameters.append(unit_parameters)
-                initial_parameters.append(parameters)
-                initial_figures_of_merit.append(figure_of_merit)
-                point_index += 1
-            except exc.FitException:
-                pass
+            unit_parameters = unit_parameters[valid][:points_remaining]
+            parameters = parameters[valid][:points_remaining]
 
-        return initial_unit_parameters, initial_parameters, initial_figures_of_merit
+            if len(parameters) == 0:
+                continue
+
+            figures_of_merit, fitted = figures_of_merit_from_parameter_matrix(
+                fitness_function=fitness_function, parameters=parameters
+            )
+            fitted = fitted & np.isfinite(figures_of_merit)
+
+            initial_unit_parameters = np.concatenate((initial_unit_parameters, unit_parameters[fitted]))
+            initial_parameters = np.concatenate((initial_parameters, parameters[fitted]))
+            initial_figures_of_merit = np.concatenate((initial_figures_of_merit, figures_of_merit[fitted]))
+
+        return (
+            initial_unit_parameters.tolist(),
+            initial_parameters.tolist(),
+            initial_figures_of_merit.tolist(),
+        )
 
     def initial_samples_in_test_mode(self, total_points, model):
         """
@@ -0,0 +1,317 @@
+import json
+import os
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+Pair = Tuple[Union[int, str], Union[int, str]]
+
+
+class Marginals:
+    def __init__(
+            self,
+            names: List[str],
+            edges: np.ndarray,
+            pdfs: np.ndarray,
+            kdes: Optional[np.ndarray] = None,
+            pairs: Optional[List[Tuple[int, int]]] = None,
+            pair_pdfs: Optional[np.ndarray] = None,
+            pair_kdes: Optional[np.ndarray] = None,
+            settings: Optional[dict] = None,
+    ):
+        """
+        The 1D marginal probability density function (PDF) of every parameter of a set of samples, and the 2D
+        marginal PDF of selected pairs of parameters, as weighted histograms and optionally kernel density estimates
+        (KDEs) evaluated at the centres of the same bins.
+
+        Parameters
+        ----------
+        names
+            The name of each parameter
+        edges
+            A (P, bins + 1) array of the bin edges of each parameter
+        pdfs
+            A (P, bins) array of the histogram density of each parameter
+        kdes
+            A (P, bins) array of the KDE of each parameter, if computed
+        pairs
+            The indices of the parameters of each 2D marginal
+        pair_pdfs
+            A (len(pairs), bins, bins) array of the histogram density of each pair, indexed by the bins of the first
+            and then the second parameter
+        pair_kdes
+            The KDE of each pair, if computed
+        settings
+            The settings the marginals were computed with and a summary of the samples they were computed from
+        """
+        self.names = list(names)
+        self.edges = edges
+        self.pdfs = pdfs
+        self.kdes = kdes
+        self.pairs = [tuple(pair) for pair in (pairs or [])]
+        self.pair_pdfs = pair_pdfs
+        self.pair_kdes = pair_kdes
+        self.settings = settings or dict()
+
+    @property
+    def centres(self) -> np.ndarray:
+        """
+        A (P, bins) array of the centre of each bin of each parameter
+        """
+        return 0.5 * (self.edges[:, 1:] + self.edges[:, :-1])
+
+    def index(self, parameter: Union[int, str]) -> int:
+        if isinstance(parameter, str):
+            return self.names.index(parameter)
+        return parameter
+
+    def pdf(self, parameter: Union[int, str], kde: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The centres of the bins of a parameter and its marginal PDF at each.
+
+        Parameters
+        ----------
+        parameter
+            The name or index of the parameter
+        kde
+            If True the KDE is returned rather than the histogram
+        """
+        index = self.index(parameter)
+        densities = self.kdes if kde else self.pdfs
+        if densities is None:
+            raise ValueError("KDEs were not computed for these marginals")
+        return self.centres[index], densities[index]
+
+    def pair_pdf(self, first: Union[int, str], second: Union[int, str], kde: bool = False) -> np.ndarray:
+        """
+        The 2D marginal PDF of a pair of parameters, indexed by the bins of the first and then the second.
+
+        Raises
+        ------
+        KeyError
+            If the 2D marginal of the pair was not computed
+        """
+        pair = (self.index(first), self.index(second))
+        densities = self.pair_kdes if kde else self.pair_pdfs
+        if densities is None:
+            raise ValueError("KDEs were not computed for these marginals")
+        try:
+            return densities[self.pairs.index(pair)]
+        except ValueError:
+            pass
+        try:
+            return densities[self.pairs.index(pair[::-1])].T
+        except ValueError:
+            raise KeyError(f"The marginal of {first} and {second} was not computed")
+
+    def save(self, filename: str):
+        """
+        Save the marginals to a .npz file, replacing any existing file once it has been written.
+        """
+        arrays = {
+            "edges": self.edges,
+            "pdfs": self.pdfs,
+            "pairs": np.array(self.pairs, dtype=int).reshape(-1, 2),
+        }
+        for name in ("kdes", "pair_pdfs", "pair_kdes"):
+            if getattr(self, name) is not None:
+                arrays[name] = getattr(self, name)
+
+        temporary = f"{filename}.tmp.npz"
+        np.savez(
+            temporary,
+            header=np.array(json.dumps({"names": self.names, "settings": self.settings})),
+            **arrays
+        )
+        os.replace(temporary, filename)
+
+    @classmethod
+    def load(cls, filename: str) -> "Marginals":
+        with np.load(filename) as f:
+            header = json.loads(str(f["header"]))
+            return Marginals(
+                names=header["names"],
+                settings=header["settings"],
+                pairs=f["pairs"].tolist(),
+                **{
+                    name: f[name]
+                    for name in ("edges", "pdfs", "kdes", "pair_pdfs", "pair_kdes")
+                    if name in f.files
+                }
+            )
+
+
+def _gaussian_kernels(bandwidths: np.ndarray, size: int) -> np.ndarray:
+    """
+    A Gaussian kernel for each bandwidth, in units of bins, in the wrap-around order used by an FFT of the given size.
+    """
+    offsets = np.fft.fftfreq(size) * size
+    bandwidths = np.maximum(bandwidths, 1e-12)
+    return np.exp(-0.5 * (offsets[None, :] / bandwidths[:, None]) ** 2)
+
+
+def _normalise(densities: np.ndarray, bin_volumes: np.ndarray) -> np.ndarray:
+    """
+    Scale each histogram so it integrates to one over its bins.
+    """
+    axes = tuple(range(1, densities.ndim))
+    totals = np.sum(densities, axis=axes) * bin_volumes
+    totals = totals.reshape((-1,) + (1,) * len(axes))
+    return densities / np.where(totals > 0.0, totals, 1.0)
+
+
+def pair_indices(pairs: Optional[Union[str, Sequence[Pair]]], names: Sequence[str]) -> List[Tuple[int, int]]:
+    """
+    The indices of the parameters of each pair given by name or index, every pair if pairs is "all" or no pairs if
+    it is None.
+    """
+    names = list(names)
+
+    def index(parameter):
+        return names.index(parameter) if isinstance(parameter, str) else int(parameter)
+
+    if pairs is None:
+        return list()
+    if isinstance(pairs, str):
+        if pairs != "all":
+            raise ValueError("pairs must be 'all' or a list of pairs of parameters")
+        return [
+            (first, second)
+            for first in range(len(names))
+            for second in range(first + 1, len(names))
+        ]
+    return [(index(first), index(second)) for first, second in pairs]
+
+
+def marginals_from_matrix(
+        matrix: np.ndarray,
+        weights: np.ndarray,
+        names: Sequence[str],
+        bins: int = 50,
+        kde: bool = False,
+        pairs: Optional[Union[str, Sequence[Pair]]] = None,
+) -> Marginals:
+    """
+    Compute the 1D marginal PDF of every parameter, and the 2D marginal PDF of pairs of parameters, of weighted
+    samples.
+
+    Each parameter is binned over the range of its samples with non-zero weight. The bin of every sample in every
+    parameter is found once, and all 1D histograms are accumulated by a single weighted bincount, as are all 2D
+    histograms.
+
+    KDEs are computed by convolving the histograms with a Gaussian kernel by FFT, zero padded so the density does not
+    wrap around. The bandwidth of each parameter is given by Scott's rule using the weighted standard deviation and
+    the effective sample size of the weights.
+
+    Parameters
+    ----------
+    matrix
+        An (N, P) array of the parameters of every sample
+    weights
+        The weight of each sample
+    names
+        The name of each parameter
+    bins
+        The number of bins of each parameter
+    kde
+        If True KDEs are computed as well as histograms
+    pairs
+        The pairs of parameters, by name or index, whose 2D marginals are computed, or "all" for every pair
+
+    Returns
+    -------
+    The marginals of the samples
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+    names = list(names)
+
+    total_parameters = matrix.shape[1]
+
+    mask = weights > 0.0
+    if not np.any(mask):
+        raise ValueError("The weights of the samples must sum to more than zero")
+    matrix = matrix[mask]
+    weights = weights[mask]
+
+    pairs = pair_indices(pairs=pairs, names=names)
+
+    lower = np.min(matrix, axis=0)
+    upper = np.max(matrix, axis=0)
+    # A parameter with a single value is given a bin width of one
+    degenerate = upper <= lower
+    lower = np.where(degenerate, lower - 0.5 * bins, lower)
+    upper = np.where(degenerate, upper + 0.5 * bins, upper)
+
+    widths = (upper - lower) / bins
+    edges = lower[:, None] + widths[:, None] * np.arange(bins + 1)[None, :]
+
+    indices = np.floor((matrix - lower) / widths).astype(int)
+    np.clip(indices, 0, bins - 1, out=indices)
+
+    histograms = np.bincount(
+        (indices + bins * np.arange(total_parameters)[None, :]).ravel(),
+        weights=np.repeat(weights, total_parameters),
+        minlength=total_parameters * bins,
+    ).reshape(total_parameters, bins)
+
+    pair_histograms = None
+    if len(pairs) > 0:
+        firsts = np.array([first for first, _ in pairs])
+        seconds = np.array([second for _, second in pairs])
+        pair_histograms = np.bincount(
+            (
+                    indices[:, firsts] * bins
+                    + indices[:, seconds]
+                    + bins * bins * np.arange(len(pairs))[None, :]
+            ).ravel(),
+            weights=np.repeat(weights, len(pairs)),
+            minlength=len(pairs) * bins * bins,
+        ).reshape(len(pairs), bins, bins)
+
+    kdes = None
+    pair_kdes = None
+
+    if kde:
+        total_weight = np.sum(weights)
+        effective_sample_size = total_weight ** 2 / np.sum(weights ** 2)
+
+        means = weights @ matrix / total_weight
+        sigmas = np.sqrt(weights @ (matrix - means) ** 2 / total_weight)
+
+        size = 2 * bins
+
+        bandwidths = sigmas * effective_sample_size ** (-1.0 / 5.0) / widths
+        kernels = np.fft.rfft(_gaussian_kernels(bandwidths, size), axis=1)
+        kdes = np.fft.irfft(
+            np.fft.rfft(histograms, n=size, axis=1) * kernels, n=size, axis=1
+        )[:, :bins]
+        kdes = _normalise(np.maximum(kdes, 0.0), widths)
+
+        if pair_histograms is not None:
+            bandwidths = sigmas * effective_sample_size ** (-1.0 / 6.0) / widths
+            kernels = _gaussian_kernels(bandwidths, size)
+            pair_kernels = np.fft.rfft2(
+                kernels[firsts][:, :, None] * kernels[seconds][:, None, :]
+            )
+            pair_kdes = np.fft.irfft2(
+                np.fft.rfft2(pair_histograms, s=(size, size)) * pair_kernels, s=(size, size)
+            )[:, :bins, :bins]
+            pair_kdes = _normalise(np.maximum(pair_kdes, 0.0), widths[firsts] * widths[seconds])
+
+    return Marginals(
+        names=names,
+        edges=edges,
+        pdfs=_normalise(histograms, widths),
+        kdes=kdes,
+        pairs=pairs,
+        pair_pdfs=None if pair_histograms is None else _normalise(
+            pair_histograms, widths[firsts] * widths[seconds]
+        ),
+        pair_kdes=pair_kdes,
+        settings={
+            "bins": bins,
+            "kde": bool(kde),
+            "pairs": [list(pair) for pair in pairs],
+        },
+    )
@@ -134,6 +134,16 @@ class Emcee(AbstractMCMC):
 
     class Fitness(AbstractMCMC.Fitness):
         def __call__(self, parameters):
+            """The log posterior of a walker or, when Emcee is vectorized, of every walker as a single batch.
+            Walkers which raise a FitException are given the resample figure of merit."""
+            if np.ndim(parameters) == 2:
+                log_posteriors, fitted = self.log_posteriors_from_parameter_matrix(parameters=parameters)
+                return np.where(
+                    fitted,
+                    log_posteriors,
+                    self.resample_figure_of_merit
+                )
+
             try:
                 return self.figure_of_merit_from_parameters(parameters=parameters)
             except exc.FitException:
@@ -148,6 +158,9 @@ class Emcee(AbstractMCMC):
             except exc.FitException:
                 raise exc.FitException
 
+        def figures_of_merit_from_parameter_matrix(self, parameters):
+            return self.log_posteriors_from_parameter_matrix(parameters=parameters)
+
     def _fit(self, model: AbstractPriorModel, analysis, log_likelihood_cap=None):
         """
         Fit a model using Emcee and the Analysis class which contains the data and returns the log likelihood from
@@ -173,6 +186,9 @@ class Emcee(AbstractMCMC):
             model=model, analysis=analysis, pool_ids=pool_ids
         )
 
+        if pool is not None:
+            fitness_function = self.ship_function(pool=pool, function=fitness_function)
+
         emcee_sampler = emcee.EnsembleSampler(
             nwalkers=self.nwalkers,
             ndim=model.prior_count,
@@ -181,6 +197,7 @@ class Emcee(AbstractMCMC):
                 filename=self.paths.samples_path + "/emcee.hdf"
             ),
             pool=pool,
+            vectorize=pool is None,
         )
 
         try:
@@ -223,6 +240,8 @@ class Emcee(AbstractMCMC):
             else:
                 iterations = self.iterations_per_update
 
+            iteration_before_run = emcee_sampler.iteration
+
             for sample in emcee_sampler.sample(
                     initial_state=emcee_state,
                     iterations=iterations,
@@ -239,7 +258,10 @@ class Emcee(AbstractMCMC):
             iterations_remaining = self.nsteps - total_iterations
 
             samples = self.perform_update(
-                model=model, analysis=analysis, during_analysis=True
+                model=model,
+                analysis=analysis,
+                during_analysis=True,
+                iterations=emcee_sampler.iteration - iteration_before_run,
             )
 
             if emcee_sampler.iteration % self.auto_correlation_check_size:
@@ -282,7 +304,7 @@ class Emcee(AbstractMCMC):
 
     def fitness_function_from_model_and_analysis(self, model, analysis, log_likelihood_cap=None, pool_ids=None):
 
-        return Emcee.Fitness(
+        fitness_function = Emcee.Fitness(
             paths=self.paths,
             model=model,
             analysis=analysis,
@@ -291,6 +313,10 @@ class Emcee(AbstractMCMC):
             pool_ids=pool_ids,
         )
 
+        self.setup_fitness_function(fitness_function)
+
+        return fitness_function
+
     def samples_via_sampler_from_model(self, model):
         """Create a `Samples` object from this non-linear search's output files on the hard-disk and model.
 
@@ -307,9 +333,7 @@ class Emcee(AbstractMCMC):
         """
 
         parameters = self.backend.get_chain(flat=True).tolist()
-        log_priors = [
-            sum(model.log_priors_from_vector(vector=vector)) for vector in parameters
-        ]
+        log_priors = model.log_priors_from_matrix(parameters).sum(axis=1).tolist()
         log_likelihoods = self.backend.get_log_prob(flat=True).tolist()
         weights = len(log_likelihoods) * [1.0]
         auto_correlation_time = self.backend.get_autocorr_time(tol=0)
@@ -339,9 +363,7 @@ class Emcee(AbstractMCMC):
 
         # TODO : Better design to remove repetition.
 
-        samples = samp.load_from_table(
-            filename=self.paths.samples_file
-        )
+        samples = self.load_sample_list()
 
         with open(self.paths.info_file) as infile:
             samples_info = json.load(infile)
@@ -124,6 +124,9 @@ class AbstractNest(NonLinearSearch):
             except exc.FitException:
                 raise exc.FitException
 
+        def figures_of_merit_from_parameter_matrix(self, parameters):
+            return self.log_likelihoods_from_parameter_matrix(parameters=parameters)
+
         def stagger_resampling_figure_of_merit(self):
             """By default, when a fit raises an exception a log likelihood of -np.inf is returned, which leads the
             sampler to discard the sample.
@@ -199,7 +202,7 @@ class AbstractNest(NonLinearSearch):
 
     def fitness_function_from_model_and_analysis(self, model, analysis, log_likelihood_cap=None, pool_ids=None):
 
-        return self.__class__.Fitness(
+        fitness_function = self.__class__.Fitness(
             paths=self.paths,
             model=model,
             analysis=analysis,
@@ -211,11 +214,13 @@ class AbstractNest(NonLinearSearch):
             pool_ids=pool_ids
         )
 
+        self.setup_fitness_function(fitness_function)
+
+        return fitness_function
+
     def samples_via_csv_json_from_model(self, model):
 
-        samples = samp.load_from_table(
-            filename=self.paths.samples_file
-        )
+        samples = self.load_sample_list()
 
         with open(self.paths.info_file) as infile:
             samples_info = json.load(infile)
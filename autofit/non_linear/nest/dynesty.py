@@ -6,6 +6,7 @@ import numpy as np
 from dynesty import NestedSampler as StaticSampler
 from dynesty.dynesty import DynamicNestedSampler
 
+from autofit import config_snapshot
 from autofit.mapper.prior_model.abstract import AbstractPriorModel
 from autofit.non_linear.abstract_search import Result
 from autofit.non_linear.log import logger
@@ -283,6 +284,9 @@ class AbstractDynesty(AbstractNest):
             model=model, analysis=analysis, pool_ids=pool_ids, log_likelihood_cap=log_likelihood_cap,
         )
 
+        if pool is not None:
+            fitness_function = self.ship_function(pool=pool, function=fitness_function)
+
         if os.path.exists("{}/{}.pickle".format(self.paths.samples_path, "dynesty")):
 
             sampler = self.load_sampler
@@ -343,6 +347,8 @@ class AbstractDynesty(AbstractNest):
 
                         continue
 
+            iterations_after_run = np.sum(sampler.results.ncall)
+
             sampler_pickle = sampler
             sampler_pickle.loglikelihood = None
 
@@ -351,9 +357,12 @@ class AbstractDynesty(AbstractNest):
 
             sampler_pickle.loglikelihood = fitness_function
 
-            self.perform_update(model=model, analysis=analysis, during_analysis=True)
-
-            iterations_after_run = np.sum(sampler.results.ncall)
+            self.perform_update(
+                model=model,
+                analysis=analysis,
+                during_analysis=True,
+                iterations=iterations_after_run - total_iterations,
+            )
 
             if (
                     total_iterations == iterations_after_run
@@ -415,9 +424,7 @@ class AbstractDynesty(AbstractNest):
         """
         sampler = self.load_sampler
         parameters = sampler.results.samples.tolist()
-        log_priors = [
-            sum(model.log_priors_from_vector(vector=vector)) for vector in parameters
-        ]
+        log_priors = model.log_priors_from_matrix(parameters).sum(axis=1).tolist()
         log_likelihoods = list(sampler.results.logl)
 
         try:
@@ -928,7 +935,7 @@ class DynestyDynamic(AbstractDynesty):
             max_move=self.max_move,
         )
 
-    def perform_update(self, model, analysis, during_analysis):
+    def perform_update(self, model, analysis, during_analysis, iterations=None):
         """Perform an update of the `NonLinearSearch` results, which occurs every *iterations_per_update* of the
         non-linear search. The update performs the following tasks:
 
@@ -979,23 +986,32 @@ class DynestyDynamic(AbstractDynesty):
         produced by this fit.
         """
 
-        self.paths.restore()
-        self.setup_log_file()
-
-        self.save_model_info(model=model)
-        self.save_parameter_names_file(model=model)
-        self.save_metadata()
-        self.save_info(info=info)
-        self.save_search()
-        self.save_model(model=model)
-        # TODO : Better way to handle?
-        self.timer.paths = self.paths
-        self.timer.start()
+        with config_snapshot.frozen():
+            try:
+                os.makedirs(self.paths.samples_path)
+            except FileExistsError:
+                pass
+
+            self.paths.restore()
+            self.setup_log_file()
+
+            self.save_model_info(model=model)
+            self.save_parameter_names_file(model=model)
+            self.save_metadata()
+            self.save_info(info=info)
+            self.save_search()
+            self.save_model(model=model)
+            # TODO : Better way to handle?
+            self.timer.paths = self.paths
+            self.timer.start()
 
-        samples = self._fit(model=model, analysis=analysis)
-        open(self.paths.has_completed_path, "w+").close()
+            try:
+                samples = self._fit(model=model, analysis=analysis)
+            finally:
+                self.release_pool_functions()
+            open(self.paths.has_completed_path, "w+").close()
 
-        return Result(samples=samples, previous_model=model, search=self)
+            return Result(samples=samples, previous_model=model, search=self)
 
     def _fit(self, model: AbstractPriorModel, analysis, log_likelihood_cap=None) -> NestSamples:
         """
@@ -1022,6 +1038,9 @@ class DynestyDynamic(AbstractDynesty):
             model=model, analysis=analysis, pool_ids=pool_ids
         )
 
+        if pool is not None:
+            fitness_function = self.ship_function(pool=pool, function=fitness_function)
+
         sampler = self.sampler_fom_model_and_fitness(
             model=model, fitness_function=fitness_function
         )
@@ -1117,9 +1136,7 @@ class DynestyDynamic(AbstractDynesty):
         """
 
         parameters = sampler.results.samples.tolist()
-        log_priors = [
-            sum(model.log_priors_from_vector(vector=vector)) for vector in parameters
-        ]
+        log_priors = model.log_priors_from_matrix(parameters).sum(axis=1).tolist()
         log_likelihoods = list(sampler.results.logl)
 
         try:
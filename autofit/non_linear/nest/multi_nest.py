@@ -1,4 +1,4 @@
-from autoconf import conf
+from autofit import config_snapshot
 from autofit.mapper.prior_model.abstract import AbstractPriorModel
 from autofit.non_linear import abstract_search
 from autofit.non_linear.log import logger
@@ -217,7 +217,7 @@ class MultiNest(abstract_nest.AbstractNest):
                              log_likelihood_cap=log_likelihood_cap,
                              pool_ids=pool_ids)
 
-            should_update_sym = conf.instance["non_linear"]["nest"]["MultiNest"]["updates"]["should_update_sym"]
+            should_update_sym = config_snapshot.get("non_linear", "nest", "MultiNest", "updates", "should_update_sym")
 
             self.should_update_sym = abstract_search.IntervalCounter(should_update_sym)
 
@@ -226,7 +226,8 @@ class MultiNest(abstract_nest.AbstractNest):
             if self.should_update_sym():
                 self.paths.copy_from_sym()
 
-            log_likelihood = self.analysis.log_likelihood_function(instance=instance)
+            with self.profiler("log_likelihood_function"):
+                log_likelihood = self.analysis.log_likelihood_function(instance=instance)
 
             if self.log_likelihood_cap is not None:
                 if log_likelihood > self.log_likelihood_cap:
@@ -384,9 +385,7 @@ class MultiNest(abstract_nest.AbstractNest):
             prior_count=model.prior_count,
         )
 
-        log_priors = [
-            sum(model.log_priors_from_vector(vector=vector)) for vector in parameters
-        ]
+        log_priors = model.log_priors_from_matrix(parameters).sum(axis=1).tolist()
 
         log_likelihoods = log_likelihoods_from_file_weighted_samples(
             file_weighted_samples=self.paths.file_weighted_samples
@@ -131,21 +131,16 @@ class AbstractPySwarms(AbstractOptimizer):
 
     class Fitness(AbstractOptimizer.Fitness):
         def __call__(self, parameters):
+            """The figure of merit of every particle, evaluated as a single batch. Particles which raise a
+            FitException are given the resample figure of merit."""
 
-            figures_of_merit = []
+            log_posteriors, fitted = self.log_posteriors_from_parameter_matrix(parameters=parameters)
 
-            for params_of_particle in parameters:
-
-                try:
-                    figure_of_merit = self.figure_of_merit_from_parameters(
-                        parameters=params_of_particle
-                    )
-                except exc.FitException:
-                    figure_of_merit = -2.0 * self.resample_figure_of_merit
-
-                figures_of_merit.append(figure_of_merit)
-
-            return np.asarray(figures_of_merit)
+            return np.where(
+                fitted,
+                -2.0 * log_posteriors,
+                -2.0 * self.resample_figure_of_merit
+            )
 
         def figure_of_merit_from_parameters(self, parameters):
             """The figure of merit is the value that the `NonLinearSearch` uses to sample parameter space. *PySwarms*
@@ -155,6 +150,10 @@ class AbstractPySwarms(AbstractOptimizer):
             except exc.FitException:
                 raise exc.FitException
 
+        def figures_of_merit_from_parameter_matrix(self, parameters):
+            log_posteriors, fitted = self.log_posteriors_from_parameter_matrix(parameters=parameters)
+            return -2.0 * log_posteriors, fitted
+
     def _fit(self, model: AbstractPriorModel, analysis, log_likelihood_cap=None):
         """
         Fit a model using PySwarms and the Analysis class which contains the data and returns the log likelihood from
@@ -251,7 +250,7 @@ class AbstractPySwarms(AbstractOptimizer):
                     pickle.dump([-0.5 * cost for cost in pso.cost_history], f)
 
                 self.perform_update(
-                    model=model, analysis=analysis, during_analysis=True
+                    model=model, analysis=analysis, during_analysis=True, iterations=iterations
                 )
 
                 init_pos = self.load_points[-1]
@@ -293,7 +292,7 @@ class AbstractPySwarms(AbstractOptimizer):
 
     def fitness_function_from_model_and_analysis(self, model, analysis, log_likelihood_cap=None, pool_ids=None):
 
-        return PySwarmsGlobal.Fitness(
+        fitness_function = PySwarmsGlobal.Fitness(
             paths=self.paths,
             model=model,
             analysis=analysis,
@@ -302,6 +301,10 @@ class AbstractPySwarms(AbstractOptimizer):
             pool_ids=pool_ids,
         )
 
+        self.setup_fitness_function(fitness_function)
+
+        return fitness_function
+
     def sampler_fom_model_and_fitness(self, model, fitness_function):
         raise NotImplementedError()
 
@@ -320,9 +323,7 @@ class AbstractPySwarms(AbstractOptimizer):
         parameters = [
             param.tolist() for parameters in self.load_points for param in parameters
         ]
-        log_priors = [
-            sum(model.log_priors_from_vector(vector=vector)) for vector in parameters
-        ]
+        log_priors = model.log_priors_from_matrix(parameters).sum(axis=1).tolist()
         log_posteriors = self.load_log_posteriors
         log_likelihoods = [lp - prior for lp, prior in zip(log_posteriors, log_priors)]
         weights = len(log_likelihoods) * [1.0]
@@ -10,6 +10,10 @@ from autoconf import conf
 from autofit.mapper import link
 from autofit.non_linear.log import logger
 
+# Files which are not zipped: binary caches of samples tables, which are parsed again from the table if needed, and
+# partially written temporary files
+ZIP_EXCLUDED_SUFFIXES = (".table.npy", ".table.json", ".tmp")
+
 
 def make_path(func):
     @wraps(func)
@@ -175,6 +179,10 @@ class Paths:
     def samples_file(self) -> str:
         return path.join(self.samples_path, "samples.csv")
 
+    @property
+    def samples_binary_file(self) -> str:
+        return path.join(self.samples_path, "samples.npy")
+
     @property
     def info_file(self) -> str:
         return path.join(self.samples_path, "info.json")
@@ -258,6 +266,10 @@ class Paths:
     def file_search_summary(self) -> str:
         return path.join(self.output_path, "search.summary")
 
+    @property
+    def file_profile(self) -> str:
+        return path.join(self.output_path, "profile.json")
+
     @property
     def file_results(self):
         return path.join(self.output_path, "model.results")
@@ -367,6 +379,9 @@ class Paths:
 
                     for file in files:
 
+                        if file.endswith(ZIP_EXCLUDED_SUFFIXES):
+                            continue
+
                         # TODO : I removed lstrip("/") here, I think it is ok...
 
 
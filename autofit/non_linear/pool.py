@@ -0,0 +1,317 @@
+import atexit
+import multiprocessing as mp
+from collections import OrderedDict
+import os
+import pickle
+import shutil
+import tempfile
+from os import path
+from uuid import uuid4
+
+from autofit.non_linear.log import logger
+
+# The functions most recently loaded by this worker process, keyed by the key they were shipped with
+_worker_functions = OrderedDict()
+
+# The number of functions each worker process keeps loaded
+WORKER_FUNCTIONS = 8
+
+# Pools shared by every search in this process, keyed by their number of cores
+_pools = dict()
+
+
+def _initialise_worker(pid_queue):
+    """
+    Called once when each worker process of an EvaluationPool starts. The pid of the
+    worker is reported to the parent process.
+    """
+    pid_queue.put(mp.current_process().pid)
+
+
+def _load_function(key: str, filename: str):
+    """
+    The function with a given key, loaded from file the first time it is needed by
+    this process and then reused for every task which evaluates it.
+
+    Up to WORKER_FUNCTIONS functions are kept, so tasks of several users of the same
+    pool (e.g. a search and the instances of a previous result) can be interleaved
+    without reloading their functions. The least recently used is discarded first.
+    """
+    try:
+        _worker_functions.move_to_end(key)
+        return _worker_functions[key]
+    except KeyError:
+        pass
+
+    with open(filename, "rb") as f:
+        function = pickle.load(f)
+
+    _worker_functions[key] = function
+    while len(_worker_functions) > WORKER_FUNCTIONS:
+        _worker_functions.popitem(last=False)
+    return function
+
+
+class PoolFunction:
+    def __init__(self, key: str, filename: str, function, pool=None):
+        """
+        A lightweight handle on a function, such as a Fitness, that has been shipped
+        to the workers of an EvaluationPool.
+
+        Only the key and filename are pickled, so tasks sent to workers carry
+        parameter vectors but not the model and analysis. Each worker unpickles the
+        function once and reuses it for every subsequent task.
+
+        In the parent process calls and attribute lookups go directly to the
+        function. The file is removed once every user of the function has called
+        release, or when the pool is closed.
+
+        Parameters
+        ----------
+        key
+            A unique identifier for the function
+        filename
+            The file the pickled function is loaded from by workers, or None if the
+            pool has no worker processes
+        function
+            The function being wrapped
+        pool
+            The pool the function was shipped to
+        """
+        self.key = key
+        self.filename = filename
+        self._function = function
+        self.pool = pool
+
+    @property
+    def function(self):
+        if self._function is None:
+            self._function = _load_function(
+                self.key,
+                self.filename
+            )
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.function(*args, **kwargs)
+
+    def __getattr__(self, item):
+        if item.startswith("__") or item in ("key", "filename", "_function", "pool"):
+            raise AttributeError(item)
+        return getattr(self.function, item)
+
+    def __getstate__(self):
+        state = {
+            "key": self.key,
+            "filename": self.filename,
+        }
+        if self.filename is None:
+            state["_function"] = self._function
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._function = state.get("_function")
+        self.pool = None
+
+    def release(self):
+        """
+        Tell the pool this function is no longer needed by its user.
+        """
+        if self.pool is not None:
+            self.pool.release(self.key)
+
+    def map_method(self, name: str, iterable) -> list:
+        """
+        Call a method of the function with each item of an iterable, in parallel on
+        the workers of the pool it was shipped to.
+
+        Parameters
+        ----------
+        name
+            The name of the method, for example figures_of_merit_from_parameter_matrix
+        iterable
+            The arguments the method is called with
+
+        Returns
+        -------
+        The result of each call
+        """
+        if self.pool is None:
+            return list(map(getattr(self.function, name), iterable))
+        return self.pool.map(PoolMethod(self, name), iterable)
+
+
+class PoolMethod:
+    def __init__(self, function: PoolFunction, name: str):
+        """
+        A method of a function shipped to a pool, which can itself be sent to workers.
+        """
+        self.function = function
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        return getattr(self.function.function, self.name)(*args, **kwargs)
+
+
+class EvaluationPool:
+    def __init__(self, number_of_cores: int):
+        """
+        A pool of worker processes used to evaluate the figure of merit of a
+        `NonLinearSearch` in parallel.
+
+        Workers are started once and reused by every search, including the searches
+        of successive phases of a pipeline. Functions evaluated by the pool are shipped
+        to each worker once using the function method, after which only parameter
+        vectors are sent with each task.
+
+        The file of a shipped function is kept until every user that shipped it has
+        released it, so several users can share the pool at once.
+
+        Parameters
+        ----------
+        number_of_cores
+            The number of worker processes
+        """
+        self.number_of_cores = number_of_cores
+
+        pid_queue = mp.Queue()
+        self._pool = mp.Pool(
+            processes=number_of_cores,
+            initializer=_initialise_worker,
+            initargs=(pid_queue,)
+        )
+        self.pids = [
+            pid_queue.get()
+            for _ in range(number_of_cores)
+        ]
+
+        self.directory = tempfile.mkdtemp()
+        self._functions = dict()
+
+    def function(self, function) -> PoolFunction:
+        """
+        Ship a function to the workers of this pool.
+
+        The function is pickled once. Shipping the same function again before it is
+        released reuses its file and counts another reference to it, each of which
+        should be released with release.
+
+        Parameters
+        ----------
+        function
+            A picklable callable, typically the Fitness of a search
+
+        Returns
+        -------
+        A handle on the function which should be passed to map in its place
+        """
+        for key, (shipped, filename, references) in self._functions.items():
+            if shipped is function:
+                self._functions[key] = (shipped, filename, references + 1)
+                break
+        else:
+            key = uuid4().hex
+            filename = None
+
+            if self.directory is not None:
+                filename = path.join(self.directory, f"{key}.pickle")
+                with open(filename, "wb") as f:
+                    pickle.dump(function, f)
+
+            self._functions[key] = (function, filename, 1)
+
+        return PoolFunction(
+            key=key,
+            filename=filename,
+            function=function,
+            pool=self,
+        )
+
+    def release(self, key: str):
+        """
+        Release one reference to a shipped function, removing its file once it has
+        no references left.
+
+        Parameters
+        ----------
+        key
+            The key of the function
+        """
+        try:
+            function, filename, references = self._functions[key]
+        except KeyError:
+            return
+
+        if references > 1:
+            self._functions[key] = (function, filename, references - 1)
+            return
+
+        del self._functions[key]
+        if filename is not None and path.exists(filename):
+            os.remove(filename)
+
+    def map(self, function, iterable):
+        if self._pool is None:
+            return list(map(function, iterable))
+        return self._pool.map(function, iterable)
+
+    def imap(self, function, iterable):
+        """
+        Lazily apply a function to each item of an iterable on the workers, yielding
+        the results in order as they become available.
+        """
+        if self._pool is None:
+            return map(function, iterable)
+        return self._pool.imap(function, iterable)
+
+    def close(self):
+        """
+        Stop the worker processes and remove shipped functions.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+        self._functions = dict()
+
+    def __getstate__(self):
+        return {
+            "number_of_cores": self.number_of_cores,
+            "pids": self.pids,
+        }
+
+    def __setstate__(self, state):
+        """
+        Worker processes cannot be pickled. An unpickled pool evaluates functions in
+        serial, so functions are not written to files and it has no directory.
+        """
+        self.__dict__.update(state)
+        self._pool = None
+        self.directory = None
+        self._functions = dict()
+
+
+def shared_pool(number_of_cores: int) -> EvaluationPool:
+    """
+    The EvaluationPool with a given number of cores shared by every search in this
+    process, created the first time it is requested.
+    """
+    try:
+        return _pools[number_of_cores]
+    except KeyError:
+        logger.info(f"Starting evaluation pool with {number_of_cores} cores")
+        pool = EvaluationPool(number_of_cores)
+        _pools[number_of_cores] = pool
+        return pool
+
+
+@atexit.register
+def close_pools():
+    """
+    Close every shared pool.
+    """
+    for pool in _pools.values():
+        pool.close()
+    _pools.clear()
@@ -0,0 +1,300 @@
+import json
+import os
+import random
+import time
+from os import path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from autofit.non_linear.log import logger
+
+
+class StageTimings:
+    def __init__(self, reservoir_size: int = 1000):
+        """
+        The timings of every call to one stage of a fit, such as the log likelihood function.
+
+        The number of calls, their total, minimum and maximum duration are exact. Percentiles are estimated from a
+        fixed size random sample of the durations (a reservoir), so memory use does not grow with the number of calls.
+
+        Parameters
+        ----------
+        reservoir_size
+            The maximum number of durations kept for estimating percentiles
+        """
+        self.reservoir_size = reservoir_size
+
+        self.count = 0
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = 0.0
+        self.durations = list()
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        if duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+        if len(self.durations) < self.reservoir_size:
+            self.durations.append(duration)
+        else:
+            index = random.randrange(self.count)
+            if index < self.reservoir_size:
+                self.durations[index] = duration
+
+    def dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "durations": self.durations,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "StageTimings":
+        timings = cls()
+        timings.count = d["count"]
+        timings.total = d["total"]
+        timings.minimum = d["minimum"]
+        timings.maximum = d["maximum"]
+        timings.durations = d["durations"]
+        return timings
+
+
+def summarise_timings(timings: List[StageTimings], percentiles=(50, 90, 99)) -> Optional[dict]:
+    """
+    Combine the timings of one stage recorded by several processes into a summary, or None if the stage has not
+    finished a call.
+
+    Each duration kept by a process stands in for count / len(durations) of its calls, so percentiles are estimated
+    from the durations of every process weighted by those amounts.
+    """
+    timings = [timing for timing in timings if timing.count > 0]
+    if len(timings) == 0:
+        return None
+
+    count = sum(timing.count for timing in timings)
+    total = sum(timing.total for timing in timings)
+
+    durations = np.concatenate([timing.durations for timing in timings])
+    weights = np.concatenate([
+        np.full(len(timing.durations), timing.count / len(timing.durations))
+        for timing in timings
+    ])
+
+    order = np.argsort(durations)
+    cdf = np.cumsum(weights[order]) / np.sum(weights)
+    indices = np.searchsorted(cdf, np.asarray(percentiles) / 100.0)
+    values = durations[order][np.minimum(indices, len(durations) - 1)]
+
+    return {
+        "count": count,
+        "total": total,
+        "mean": total / count,
+        "minimum": min(timing.minimum for timing in timings),
+        "maximum": max(timing.maximum for timing in timings),
+        "percentiles": {
+            str(percentile): float(value)
+            for percentile, value in zip(percentiles, values)
+        },
+    }
+
+
+class StageTimer:
+    __slots__ = ("timings", "start")
+
+    def __init__(self, timings: StageTimings):
+        self.timings = timings
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.timings.add(time.perf_counter() - self.start)
+
+
+class NullTimer:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class NullProfiler:
+    """
+    The profiler used when profiling is off. Timing a stage does nothing, so the only overhead is entering a shared
+    context manager.
+    """
+
+    enabled = False
+
+    _timer = NullTimer()
+
+    def __call__(self, stage: str):
+        return self._timer
+
+    def __reduce__(self):
+        return "null_profiler"
+
+
+null_profiler = NullProfiler()
+
+
+class Profiler:
+    enabled = True
+
+    def __init__(self, directory: str, reservoir_size: int = 1000, flush_interval: float = 10.0):
+        """
+        Records how long each stage of a fit takes, for example creating instances, evaluating the log likelihood
+        function and outputting updates.
+
+        A stage is timed by entering the context manager returned by calling the profiler:
+
+        with profiler("log_likelihood_function"):
+            ...
+
+        A `Profiler` pickled to the workers of a parallel search starts with no timings. Each worker writes its
+        timings to a file named by its process id in the directory of the profiler every flush_interval seconds.
+        The process which created the profiler combines these with its own timings when it outputs the profile.
+
+        Parameters
+        ----------
+        directory
+            The directory in which workers write their timings
+        reservoir_size
+            The maximum number of durations kept for each stage for estimating percentiles
+        flush_interval
+            The number of seconds between each worker writing its timings
+        """
+        self.directory = directory
+        self.reservoir_size = reservoir_size
+        self.flush_interval = flush_interval
+
+        self.stages: Dict[str, StageTimings] = dict()
+
+        self._pid = os.getpid()
+        self._start = time.time()
+        self._last_flush = time.perf_counter()
+
+        self.clear_worker_files()
+
+    def __call__(self, stage: str) -> StageTimer:
+        now = time.perf_counter()
+        if now - self._last_flush > self.flush_interval:
+            self._last_flush = now
+            if os.getpid() != self._pid:
+                self.flush()
+
+        try:
+            timings = self.stages[stage]
+        except KeyError:
+            timings = StageTimings(reservoir_size=self.reservoir_size)
+            self.stages[stage] = timings
+
+        return StageTimer(timings)
+
+    def __getstate__(self):
+        return {
+            "directory": self.directory,
+            "reservoir_size": self.reservoir_size,
+            "flush_interval": self.flush_interval,
+            "_pid": self._pid,
+            "_start": self._start,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.stages = dict()
+        self._last_flush = time.perf_counter()
+
+    @property
+    def worker_files(self) -> List[str]:
+        try:
+            return [
+                path.join(self.directory, filename)
+                for filename in os.listdir(self.directory)
+                if filename.endswith(".json")
+            ]
+        except FileNotFoundError:
+            return list()
+
+    def clear_worker_files(self):
+        for filename in self.worker_files:
+            os.remove(filename)
+
+    def flush(self):
+        """
+        Write the timings of this process to its file in the directory of the profiler.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        filename = path.join(self.directory, f"{os.getpid()}.json")
+
+        with open(f"{filename}.tmp", "w+") as f:
+            json.dump({
+                stage: timings.dict()
+                for stage, timings in self.stages.items()
+            }, f)
+        os.replace(f"{filename}.tmp", filename)
+
+    def _worker_stages(self) -> List[Dict[str, StageTimings]]:
+        worker_stages = list()
+        for filename in self.worker_files:
+            try:
+                with open(filename) as f:
+                    worker_stages.append({
+                        stage: StageTimings.from_dict(d)
+                        for stage, d in json.load(f).items()
+                    })
+            except (OSError, ValueError) as e:
+                logger.debug(e)
+        return worker_stages
+
+    def summary(self) -> dict:
+        """
+        A summary of the timings of every stage recorded by this process and its workers.
+
+        The unprofiled time is the time since the profiler was created not spent in a stage timed by this process.
+        For a serial search this is the time spent in the sampler itself; for a parallel search it also includes the
+        time waiting for workers.
+        """
+        worker_stages = self._worker_stages()
+
+        names = set(self.stages)
+        for stages in worker_stages:
+            names.update(stages)
+
+        stages = {
+            name: summarise_timings(
+                [
+                    stages[name]
+                    for stages in [self.stages] + worker_stages
+                    if name in stages
+                ]
+            )
+            for name in sorted(names)
+        }
+
+        wall_time = time.time() - self._start
+
+        return {
+            "wall_time": wall_time,
+            "unprofiled_time": wall_time - sum(
+                timings.total for timings in self.stages.values()
+            ),
+            "workers": len(worker_stages),
+            "stages": {
+                name: summary
+                for name, summary in stages.items()
+                if summary is not None
+            },
+        }
+
+    def output_to_json(self, filename: str):
+        with open(filename, "w+") as f:
+            json.dump(self.summary(), f, indent=4)
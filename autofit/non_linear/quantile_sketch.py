@@ -0,0 +1,258 @@
+import math
+from typing import List, Optional
+
+import numpy as np
+
+
+class QuantileSketch:
+    def __init__(self, compression: float = 200.0):
+        """
+        A mergeable summary of a weighted sample of one parameter from which quantiles can be estimated, in the style
+        of a merging t-digest.
+
+        The sample is summarised by centroids, each the weighted mean of a run of sorted values. Centroids are sized
+        by the arcsine scale function of the t-digest, so those in the tails hold few values and quantiles far from
+        the median stay accurate. The number of centroids is bounded by about the compression, however many values
+        are added.
+
+        Parameters
+        ----------
+        compression
+            Controls the number of centroids kept and so the accuracy of the sketch
+        """
+        self.compression = compression
+
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    @property
+    def total_weight(self) -> float:
+        return float(np.sum(self.weights))
+
+    def copy(self) -> "QuantileSketch":
+        sketch = QuantileSketch(compression=self.compression)
+        sketch.means = self.means
+        sketch.weights = self.weights
+        sketch.minimum = self.minimum
+        sketch.maximum = self.maximum
+        return sketch
+
+    def update(self, values, weights):
+        """
+        Add weighted values to the sketch. Values with no weight are ignored.
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+
+        mask = weights > 0.0
+        values = values[mask]
+        weights = weights[mask]
+
+        if len(values) == 0:
+            return
+
+        self.minimum = min(self.minimum, float(np.min(values)))
+        self.maximum = max(self.maximum, float(np.max(values)))
+
+        self._compress(
+            means=np.concatenate((self.means, values)),
+            weights=np.concatenate((self.weights, weights)),
+        )
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        Add the values summarised by another sketch to this sketch.
+        """
+        if len(other.means) == 0:
+            return
+
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+        self._compress(
+            means=np.concatenate((self.means, other.means)),
+            weights=np.concatenate((self.weights, other.weights)),
+        )
+
+    def scale(self, factor: float):
+        """
+        Multiply the weight of every value in the sketch by a factor, for example because the sample weights have been
+        renormalised.
+        """
+        self.weights = self.weights * factor
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        """
+        Sort centroids and merge those whose midpoints fall within the same unit of the scale function.
+        """
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+
+        cumulative = np.cumsum(weights)
+        midpoints = (cumulative - 0.5 * weights) / cumulative[-1]
+
+        k = self.compression / (2.0 * math.pi) * np.arcsin(2.0 * midpoints - 1.0)
+        clusters = np.floor(k - np.floor(k[0])).astype(int)
+
+        # Clusters are numbered in order, so merged centroids remain sorted
+        _, clusters = np.unique(clusters, return_inverse=True)
+        merged_weights = np.bincount(clusters, weights=weights)
+
+        self.means = np.bincount(clusters, weights=weights * means) / merged_weights
+        self.weights = merged_weights
+
+    def quantiles(self, q) -> np.ndarray:
+        """
+        Estimate quantiles of the sample by interpolating between the centres of the centroids and the minimum and
+        maximum value added.
+
+        Parameters
+        ----------
+        q
+            The quantiles to compute, each between 0 and 1
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+
+        if np.any(q < 0.0) or np.any(q > 1.0):
+            raise ValueError("Quantiles must be between 0 and 1")
+
+        if len(self.means) == 0:
+            return np.full(len(q), np.nan)
+
+        cumulative = np.cumsum(self.weights)
+        midpoints = (cumulative - 0.5 * self.weights) / cumulative[-1]
+
+        return np.interp(
+            q,
+            np.concatenate(([0.0], midpoints, [1.0])),
+            np.concatenate(([self.minimum], self.means, [self.maximum])),
+        )
+
+
+class SketchedCDFs:
+    def __init__(self, sketches: List[QuantileSketch]):
+        """
+        Quantiles of every parameter estimated from a sketch of each, with the same interface as SortedCDFs.
+        """
+        self.sketches = sketches
+
+    def quantiles(self, q) -> np.ndarray:
+        """
+        Estimate quantiles for every parameter.
+
+        Parameters
+        ----------
+        q
+            The quantiles to compute, each between 0 and 1
+
+        Returns
+        -------
+        An array with a row for each quantile and a column for each parameter
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        return np.array(
+            [sketch.quantiles(q) for sketch in self.sketches]
+        ).reshape(len(self.sketches), len(q)).T
+
+
+class StreamingQuantiles:
+    def __init__(self, compression: float = 200.0):
+        """
+        Keeps a sketch of every parameter of the samples of a search, so that the quantiles used for intermediate
+        results are updated with only the samples added since the previous update rather than by sorting every sample.
+
+        The most recent rows of the samples, such as the live points of a nested sampler, may still change and are
+        not added to the sketches. They are merged into a copy of the sketches each time quantiles are requested.
+
+        Samples whose earlier rows have changed, other than by every weight being multiplied by the same factor when
+        the weights are renormalised, cause the sketches to be rebuilt from every sample.
+
+        Parameters
+        ----------
+        compression
+            The compression of each sketch
+        """
+        self.compression = compression
+
+        self.sketches: Optional[List[QuantileSketch]] = None
+        self.weights = np.zeros(0)
+        self.last_row = None
+
+        self.rebuilds = 0
+
+    def _reset(self, total_parameters: int):
+        self.sketches = [
+            QuantileSketch(compression=self.compression)
+            for _ in range(total_parameters)
+        ]
+        self.weights = np.zeros(0)
+        self.last_row = None
+        self.rebuilds += 1
+
+    def _is_continuation(self, matrix: np.ndarray, weights: np.ndarray) -> bool:
+        """
+        Whether the rows already added to the sketches are unchanged, except possibly by a common factor in their
+        weights.
+        """
+        added = len(self.weights)
+
+        if self.sketches is None or matrix.shape[1] != len(self.sketches) or len(matrix) < added:
+            return False
+        if added == 0:
+            return True
+        if not np.array_equal(matrix[added - 1], self.last_row):
+            return False
+
+        previous_total = np.sum(self.weights)
+        factor = np.sum(weights[:added]) / previous_total if previous_total > 0.0 else 1.0
+
+        return np.allclose(weights[:added], self.weights * factor, rtol=1e-8, atol=0.0)
+
+    def update(self, matrix, weights, unsettled: int = 0) -> SketchedCDFs:
+        """
+        Add the new samples of the search to the sketches.
+
+        Parameters
+        ----------
+        matrix
+            An (N, P) array of the parameters of every sample, in the order they were taken
+        weights
+            The weight of each sample
+        unsettled
+            The number of most recent rows which may change before the next update
+
+        Returns
+        -------
+        The quantiles of every parameter for these samples
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+
+        if not self._is_continuation(matrix, weights):
+            self._reset(total_parameters=matrix.shape[1])
+        elif np.sum(self.weights) > 0.0:
+            factor = np.sum(weights[:len(self.weights)]) / np.sum(self.weights)
+            if factor != 1.0:
+                for sketch in self.sketches:
+                    sketch.scale(factor)
+
+        added = len(self.weights)
+        settled = max(added, len(matrix) - unsettled)
+
+        for index, sketch in enumerate(self.sketches):
+            sketch.update(matrix[added:settled, index], weights[added:settled])
+
+        self.weights = weights[:settled].copy()
+        self.last_row = matrix[settled - 1].copy() if settled > 0 else None
+
+        sketches = list()
+        for index, sketch in enumerate(self.sketches):
+            sketch = sketch.copy()
+            sketch.update(matrix[settled:, index], weights[settled:])
+            sketches.append(sketch)
+
+        return SketchedCDFs(sketches=sketches)
@@ -1,13 +1,21 @@
 import csv
+import hashlib
 import json
 import math
-from typing import List
+import os
+import struct
+from os import path
+from collections.abc import Sequence
+from typing import Callable, Iterable, Iterator, List, Optional
 
 import numpy as np
 
 from autofit.mapper.prior_model.abstract import AbstractPriorModel
 from autofit.mapper.model import ModelInstance
 from autofit.mapper.model_mapper import ModelMapper
+from autofit.non_linear.log import logger
+from autofit.non_linear.marginals import Marginals, marginals_from_matrix, pair_indices
+from autofit.non_linear.quantile_sketch import StreamingQuantiles
 from autofit.tools import util
 
 class Sample:
@@ -104,7 +112,7 @@ class Sample:
             log_likelihoods: List[float],
             log_priors: List[float],
             weights: List[float]
-    ) -> List["Sample"]:
+    ) -> "SampleList":
         """
         Convenience method to create a list of samples
         from lists of contained values
@@ -119,37 +127,15 @@ class Sample:
 
         Returns
         -------
-        A list of samples
+        A list of samples, stored as arrays
         """
-        samples = list()
-
-        # Another speed up.
-        model_component_and_parameter_names = model.model_component_and_parameter_names
-
-        for params, log_likelihood, log_prior, weight in zip(
-                parameters,
-                log_likelihoods,
-                log_priors,
-                weights
-        ):
-            arg_dict = {
-                t: param
-                for t, param
-                in zip(
-                    model_component_and_parameter_names,
-                    params
-                )
-            }
-
-            samples.append(
-                cls(
-                    log_likelihood=log_likelihood,
-                    log_prior=log_prior,
-                    weights=weight,
-                    **arg_dict
-                )
-            )
-        return samples
+        return SampleList(
+            paths=model.model_component_and_parameter_names,
+            parameters=parameters,
+            log_likelihoods=log_likelihoods,
+            log_priors=log_priors,
+            weights=weights
+        )
 
     def instance_for_model(self, model: AbstractPriorModel):
         """
@@ -176,39 +162,576 @@ class Sample:
             )
 
 
-def load_from_table(filename: str) -> List[Sample]:
+class SampleView(Sample):
+    # noinspection PyMissingConstructor
+    def __init__(
+            self,
+            sample_list: "SampleList",
+            index: int
+    ):
+        """
+        One row of a SampleList. Values are read from the arrays of the list
+        when they are accessed.
+
+        Parameters
+        ----------
+        sample_list
+            The list of samples this is a row of
+        index
+            The index of the row
+        """
+        self.sample_list = sample_list
+        self.index = index
+
+    @property
+    def log_likelihood(self) -> float:
+        return float(self.sample_list.log_likelihoods[self.index])
+
+    @property
+    def log_prior(self) -> float:
+        return float(self.sample_list.log_priors[self.index])
+
+    @property
+    def weights(self) -> float:
+        return float(self.sample_list.weights[self.index])
+
+    @property
+    def kwargs(self) -> dict:
+        return dict(
+            zip(
+                self.sample_list.paths,
+                self.sample_list.parameters[self.index].tolist()
+            )
+        )
+
+    def parameters_for_model(
+            self,
+            model: AbstractPriorModel,
+            paths=None,
+    ) -> List[float]:
+        if paths is None:
+            paths = model.model_component_and_parameter_names
+        if paths == self.sample_list.paths:
+            return self.sample_list.parameters[self.index].tolist()
+        return super().parameters_for_model(model, paths)
+
+    def __reduce__(self):
+        return Sample, (
+            self.log_likelihood,
+            self.log_prior,
+            self.weights,
+        ), {"kwargs": self.kwargs}
+
+
+class SampleList(Sequence):
+    def __init__(
+            self,
+            paths: List[str],
+            parameters,
+            log_likelihoods,
+            log_priors,
+            weights
+    ):
+        """
+        Samples taken during a search, stored as columns rather than as one object
+        per sample.
+
+        Parameters are held in an (N, P) float64 matrix and the log likelihood,
+        log prior and weight of each sample in 1D arrays. Arrays that already have
+        the right type, such as the columns of a memory-mapped samples file, are
+        used without copying. Indexing or iterating gives Sample objects which read
+        their values from these arrays.
+
+        Parameters
+        ----------
+        paths
+            The name of each parameter, in the order of the parameter columns
+        parameters
+            The parameters of every sample
+        log_likelihoods
+            The log likelihood of every sample
+        log_priors
+            The log prior of every sample
+        weights
+            The weight of every sample
+        """
+        self.paths = list(paths)
+
+        log_likelihoods = np.asarray(log_likelihoods, dtype=np.float64).reshape(-1)
+        log_priors = np.asarray(log_priors, dtype=np.float64).reshape(-1)
+        weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+        parameters = np.asarray(parameters, dtype=np.float64)
+
+        total = min(len(parameters), len(log_likelihoods), len(log_priors), len(weights))
+
+        parameters = parameters[:total].reshape(total, -1) if total > 0 else np.zeros(
+            (0, len(self.paths))
+        )
+        # As with zip, only as many paths as there are parameter columns are kept
+        self.paths = self.paths[:parameters.shape[1]]
+
+        self.parameters = parameters[:, :len(self.paths)]
+        self.log_likelihoods = log_likelihoods[:total]
+        self.log_priors = log_priors[:total]
+        self.weights = weights[:total]
+
+    @classmethod
+    def from_samples(cls, samples: List[Sample]) -> "SampleList":
+        """
+        Create a SampleList from a list of Sample objects. Parameter paths are
+        taken from the first sample.
+        """
+        if isinstance(samples, SampleList):
+            return samples
+
+        paths = list(samples[0].kwargs.keys()) if len(samples) > 0 else []
+        return SampleList(
+            paths=paths,
+            parameters=[
+                [sample.kwargs[path] for path in paths]
+                for sample in samples
+            ],
+            log_likelihoods=[sample.log_likelihood for sample in samples],
+            log_priors=[sample.log_prior for sample in samples],
+            weights=[sample.weights for sample in samples],
+        )
+
+    @property
+    def log_posteriors(self) -> np.ndarray:
+        return self.log_likelihoods + self.log_priors
+
+    def parameters_for_paths(self, paths: List[str]) -> np.ndarray:
+        """
+        The parameter matrix with columns ordered by the given paths.
+
+        Raises
+        ------
+        KeyError
+            If any path is not a column of this list
+        """
+        if paths == self.paths:
+            return self.parameters
+        columns = {path: index for index, path in enumerate(self.paths)}
+        return self.parameters[:, [columns[path] for path in paths]]
+
+    def with_mask(self, mask) -> "SampleList":
+        """
+        A new list containing only the samples selected by a boolean mask or
+        array of indices.
+        """
+        return SampleList(
+            paths=self.paths,
+            parameters=self.parameters[mask],
+            log_likelihoods=self.log_likelihoods[mask],
+            log_priors=self.log_priors[mask],
+            weights=self.weights[mask],
+        )
+
+    def __len__(self):
+        return len(self.log_likelihoods)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.with_mask(item)
+        index = range(len(self))[item]
+        return SampleView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SampleView(self, index)
+
+
+def header_filename_for(filename: str) -> str:
+    """
+    The JSON header describing the columns of a binary samples file
+    """
+    return f"{path.splitext(filename)[0]}.json"
+
+
+def _sample_list_from_columns(headers: List[str], table: np.ndarray) -> "SampleList":
+    """
+    Create a SampleList from a table of samples with a column for each header.
+    """
+    columns = dict(zip(headers, table.T))
+    paths = [
+        header for header in headers
+        if header not in ("log_likelihood", "log_prior", "log_posterior", "weights")
+    ]
+
+    def column(name):
+        try:
+            return columns[name]
+        except KeyError:
+            return np.zeros(len(table))
+
+    parameter_indices = [headers.index(path) for path in paths]
+    if parameter_indices == list(range(len(paths))):
+        parameters = table[:, :len(paths)]
+    else:
+        parameters = table[:, parameter_indices]
+
+    return SampleList(
+        paths=paths,
+        parameters=parameters,
+        log_likelihoods=column("log_likelihood"),
+        log_priors=column("log_prior"),
+        weights=column("weights"),
+    )
+
+
+def load_from_binary(filename: str) -> "SampleList":
+    """
+    Load samples from a binary samples file without copying them.
+
+    The file is a float64 .npy matrix with a row for each sample which is memory-mapped
+    read-only. The name of each column is read from a JSON header next to it.
+
+    Parameters
+    ----------
+    filename
+        The path to a .npy file
+
+    Returns
+    -------
+    A list of samples whose arrays are views of the memory-mapped file
+    """
+    with open(header_filename_for(filename)) as f:
+        headers = json.load(f)["headers"]
+
+    table = np.load(filename, mmap_mode="r")
+
+    return _sample_list_from_columns(
+        headers=headers,
+        table=table.reshape(-1, len(headers))
+    )
+
+
+# Tables of more bytes than this are parsed into a memory-mapped binary file beside them rather than into memory
+MEMMAP_THRESHOLD = 64 * 1024 ** 2
+
+# The approximate number of bytes of a table parsed at once
+CHUNK_SIZE = 16 * 1024 ** 2
+
+
+def table_cache_filename_for(filename: str) -> str:
+    """
+    The binary file a large samples table is parsed into
+    """
+    return f"{path.splitext(filename)[0]}.table.npy"
+
+
+def _source_of(filename: str) -> dict:
+    """
+    The size and modification time of a table, which identify the version of the table a binary file was parsed from.
+    """
+    stat = os.stat(filename)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _parse_chunks(f, total_columns: int):
+    """
+    Parse the remaining rows of a CSV file, yielding a float64 matrix for every chunk of about CHUNK_SIZE bytes.
+    """
+    while True:
+        lines = f.readlines(CHUNK_SIZE)
+        if len(lines) == 0:
+            return
+        yield np.loadtxt(
+            lines, delimiter=",", dtype=np.float64, ndmin=2
+        ).reshape(-1, total_columns)
+
+
+def _count_rows(filename: str) -> int:
+    """
+    The number of rows in a table below its headers, counted without parsing them.
+    """
+    rows = 0
+    last = b"\n"
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            rows += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        rows += 1
+    return max(rows - 1, 0)
+
+
+def _parse_to_binary(f, filename: str, headers: List[str], source: dict) -> bool:
+    """
+    Parse the rows of a table into its memory-mapped binary file, returning False if the rows are not one to a
+    line so that they could not be counted before parsing.
+    """
+    cache = table_cache_filename_for(filename)
+    temporary = f"{cache}.tmp"
+
+    try:
+        table = np.lib.format.open_memmap(
+            temporary, mode="w+", dtype=np.float64, shape=(_count_rows(filename), len(headers))
+        )
+        row = 0
+        try:
+            for chunk in _parse_chunks(f, len(headers)):
+                table[row:row + len(chunk)] = chunk
+                row += len(chunk)
+            complete = row == len(table)
+            table.flush()
+        except ValueError:
+            complete = False
+        del table
+
+        if not complete:
+            return False
+
+        os.replace(temporary, cache)
+    finally:
+        if path.exists(temporary):
+            os.remove(temporary)
+
+    with open(header_filename_for(cache), "w+") as header_file:
+        json.dump({"headers": headers, "source": source}, header_file)
+    return True
+
+
+def load_from_table(filename: str, memmap_threshold: int = MEMMAP_THRESHOLD) -> "SampleList":
     """
     Load samples from a table
 
+    Rows are parsed in chunks straight into a float64 matrix. A table larger than memmap_threshold bytes is parsed
+    into a binary file beside it (samples.table.npy for samples.csv) which is memory-mapped, so the samples do not
+    need to fit in memory. The binary file is loaded directly by later calls until the table changes. It is not
+    included when the output of a search is zipped.
+
     Parameters
     ----------
     filename
-        The path to a CSV file
+        The path to a CSV file, or to a binary .npy samples file
+    memmap_threshold
+        The size in bytes above which a table is parsed into a memory-mapped file
 
     Returns
     -------
-    A list of samples, one for each row in the CSV
+    A list of samples, one for each row in the table
     """
-    samples = list()
-
-    with open(filename, "r+", newline="") as f:
-        reader = csv.reader(f)
-        headers = next(reader)
-        for row in reader:
-            samples.append(
-                Sample(
-                    **{
-                        header: float(value)
-                        for header, value
-                        in zip(
-                            headers,
-                            row
-                        )
-                    }
-                )
-            )
+    if filename.endswith(".npy"):
+        return load_from_binary(filename=filename)
+
+    cache = table_cache_filename_for(filename)
+    source = _source_of(filename)
+
+    try:
+        with open(header_filename_for(cache)) as f:
+            if json.load(f).get("source") == source:
+                return load_from_binary(filename=cache)
+    except (OSError, ValueError):
+        pass
+
+    with open(filename, "r", newline="") as f:
+        headers = next(csv.reader([f.readline()]))
+
+        if source["size"] > memmap_threshold:
+            start = f.tell()
+            try:
+                if _parse_to_binary(f, filename=filename, headers=headers, source=source):
+                    return load_from_binary(filename=cache)
+            except OSError as e:
+                logger.debug(e)
+            f.seek(start)
+
+        chunks = list(_parse_chunks(f, len(headers)))
+
+    rows = np.concatenate(chunks) if len(chunks) > 0 else np.zeros((0, len(headers)))
+
+    return _sample_list_from_columns(
+        headers=headers,
+        table=rows
+    )
+
+
+class SamplesTableWriter:
+    def __init__(self, filename: str):
+        """
+        Writes the samples table of a search incrementally.
+
+        The file is kept open between writes and only rows which have not yet been written are appended. The whole
+        table is rewritten only if rows already written have changed, which is detected by comparing their weights
+        with those previously written (the weights of nested sampling change as the evidence is updated), or if
+        the headers, the number of samples or the file on disk no longer match what was written.
+
+        Parameters
+        ----------
+        filename
+            Where the table is written
+        """
+        self.filename = filename
+
+        self.headers = None
+        self.weights = np.zeros(0)
+
+        self.appends = 0
+        self.rewrites = 0
+
+        self._file = None
+
+    @property
+    def total_rows(self) -> int:
+        """
+        The number of rows which have been written
+        """
+        return len(self.weights)
 
-    return samples
+    def _is_current(self) -> bool:
+        """
+        True if the file has not been closed, removed or changed since it was last written.
+        """
+        return (
+                self._file is not None
+                and not self._file.closed
+                and path.exists(self.filename)
+                and path.getsize(self.filename) == self._file.tell()
+        )
+
+    def write(self, samples: "OptimizerSamples"):
+        """
+        Write the samples table, appending new rows if possible.
+
+        Parameters
+        ----------
+        samples
+            The samples of the search
+        """
+        headers = samples._headers
+        table = samples._table
+        weights = table[:, -1]
+
+        total_rows = self.total_rows
+
+        if (
+                headers == self.headers
+                and len(table) >= total_rows
+                and self._is_current()
+                and np.array_equal(weights[:total_rows], self.weights)
+        ):
+            rows = table[total_rows:]
+            self.appends += 1
+        else:
+            self.close()
+            self._file = open(self.filename, "w+", newline="")
+            csv.writer(self._file).writerow(headers)
+            self.headers = headers
+            rows = table
+            self.rewrites += 1
+
+        csv.writer(self._file).writerows(rows.tolist())
+        self._file.flush()
+
+        self.weights = weights.copy()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# The number of bytes of the header of a binary samples file, which is fixed so that rows can be appended
+BINARY_HEADER_SIZE = 128
+
+
+def _binary_header(rows: int, columns: int) -> bytes:
+    """
+    The .npy header of a float64 matrix, padded to BINARY_HEADER_SIZE bytes so that it can be rewritten in place
+    when rows are appended.
+    """
+    header = repr({"descr": "<f8", "fortran_order": False, "shape": (rows, columns)})
+    header = f"{header.ljust(BINARY_HEADER_SIZE - 11)}\n"
+    return np.lib.format.magic(1, 0) + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+class SamplesBinaryWriter:
+    def __init__(self, filename: str):
+        """
+        Writes the binary samples file of a search incrementally.
+
+        The file is a float64 .npy matrix with a header of fixed size. Rows which have not yet been written are
+        appended to the file and the shape in its header is then updated in place. As with the SamplesTableWriter,
+        the whole file is rewritten only if rows already written have changed, which is detected by comparing their
+        weights with those previously written, or if the headers or the file on disk no longer match what was written.
+        A rewrite goes to a temporary file which then replaces the existing file, so readers never see a partially
+        written table.
+
+        Parameters
+        ----------
+        filename
+            Where the binary file is written
+        """
+        self.filename = filename
+
+        self.headers = None
+        self.weights = np.zeros(0)
+
+        self.appends = 0
+        self.rewrites = 0
+
+    @property
+    def total_rows(self) -> int:
+        """
+        The number of rows which have been written
+        """
+        return len(self.weights)
+
+    def _is_current(self) -> bool:
+        """
+        True if the file has not been removed or changed since it was last written.
+        """
+        return (
+                self.headers is not None
+                and path.exists(self.filename)
+                and path.getsize(self.filename) == BINARY_HEADER_SIZE + 8 * self.total_rows * len(self.headers)
+        )
+
+    def write(self, samples: "OptimizerSamples"):
+        """
+        Write the binary samples file, appending new rows if possible. The samples then record the file, so that
+        `NonLinearSearch.save_samples` can pickle them without their sample list.
+
+        Parameters
+        ----------
+        samples
+            The samples of the search
+        """
+        headers = samples._headers
+        table = np.ascontiguousarray(samples._table, dtype=np.float64)
+        weights = table[:, -1]
+
+        total_rows = self.total_rows
+
+        if (
+                headers == self.headers
+                and len(table) >= total_rows
+                and self._is_current()
+                and np.array_equal(weights[:total_rows], self.weights)
+        ):
+            with open(self.filename, "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                f.write(table[total_rows:].tobytes())
+                f.flush()
+                f.seek(0)
+                f.write(_binary_header(*table.shape))
+            self.appends += 1
+        else:
+            with open(header_filename_for(self.filename), "w+") as f:
+                json.dump({"headers": headers}, f)
+
+            temporary = f"{self.filename}.tmp"
+            with open(temporary, "w+b") as f:
+                f.write(_binary_header(*table.shape))
+                f.write(table.tobytes())
+            os.replace(temporary, self.filename)
+
+            self.headers = headers
+            self.rewrites += 1
+
+        self.weights = weights.copy()
+        samples._binary_file = self.filename
 
 
 class OptimizerSamples:
@@ -231,26 +754,46 @@ class OptimizerSamples:
         self.samples = samples
         self.time = time
 
+        self._binary_file = None
+
+    def __getstate__(self):
+        """
+        Samples are pickled without the binary samples file they were written to, which may be appended to, moved or
+        removed after they are unpickled.
+        """
+        state = self.__dict__.copy()
+        state["_binary_file"] = None
+        return state
+
     @property
-    def parameters(self):
+    def sample_list(self) -> SampleList:
+        """
+        The samples stored as arrays. Samples given as a list of Sample objects
+        are converted each time this is accessed.
+        """
+        return SampleList.from_samples(self.samples)
 
+    @property
+    def parameter_matrix(self) -> np.ndarray:
+        """
+        An (N, P) array of the parameters of every sample, with columns in the same
+        order as the priors of the model.
+        """
         paths = self.model.model_component_and_parameter_names
+        sample_list = self.sample_list
+
+        if len(sample_list) == 0:
+            return np.zeros((0, len(paths)))
 
         try:
-            return [
-                sample.parameters_for_model(
-                    self.model, paths
-                )
-                for sample in self.samples
-            ]
+            return sample_list.parameters_for_paths(paths)
         except KeyError:
-            paths = util.convert_paths_for_backwards_compatibility(paths=paths, kwargs=self.samples[0].kwargs)
-            return [
-                sample.parameters_for_model(
-                    self.model, paths
-                )
-                for sample in self.samples
-            ]
+            paths = util.convert_paths_for_backwards_compatibility(paths=paths, kwargs=sample_list[0].kwargs)
+            return sample_list.parameters_for_paths(paths)
+
+    @property
+    def parameters(self):
+        return self.parameter_matrix.tolist()
 
     @property
     def total_samples(self):
@@ -258,42 +801,26 @@ class OptimizerSamples:
 
     @property
     def weights(self):
-        return [
-            sample.weights
-            for sample
-            in self.samples
-        ]
+        return self.sample_list.weights.tolist()
 
     @property
     def log_likelihoods(self):
-        return [
-            sample.log_likelihood
-            for sample
-            in self.samples
-        ]
+        return self.sample_list.log_likelihoods.tolist()
 
     @property
     def log_posteriors(self):
-        return [
-            sample.log_posterior
-            for sample
-            in self.samples
-        ]
+        return self.sample_list.log_posteriors.tolist()
 
     @property
     def log_priors(self):
-        return [
-            sample.log_prior
-            for sample
-            in self.samples
-        ]
+        return self.sample_list.log_priors.tolist()
 
     @property
     def parameters_extract(self):
-        return [
-            [params[i] for params in self.parameters]
-            for i in range(self.model.prior_count)
-        ]
+        """
+        The values of each parameter across all samples, as one list per parameter.
+        """
+        return self.parameter_matrix.T.tolist()
 
     @property
     def _headers(self) -> List[str]:
@@ -308,24 +835,29 @@ class OptimizerSamples:
             "weights",
         ]
 
+    @property
+    def _table(self) -> np.ndarray:
+        """
+        The samples table as an array with a row for each sample and a column for each header
+        """
+
+        sample_list = self.sample_list
+
+        return np.column_stack((
+            self.parameter_matrix,
+            sample_list.log_likelihoods,
+            sample_list.log_priors,
+            sample_list.log_posteriors,
+            sample_list.weights,
+        ))
+
     @property
     def _rows(self) -> List[List[float]]:
         """
         Rows in the samples table
         """
 
-        log_likelihoods = self.log_likelihoods
-        log_priors = self.log_priors
-        log_posteriors = self.log_posteriors
-        weights = self.weights
-
-        for index, row in enumerate(self.parameters):
-            yield row + [
-                log_likelihoods[index],
-                log_priors[index],
-                log_posteriors[index],
-                weights[index],
-            ]
+        yield from self._table.tolist()
 
     def write_table(self, filename: str):
         """
@@ -343,6 +875,21 @@ class OptimizerSamples:
             for row in self._rows:
                 writer.writerow(row)
 
+    def write_binary(self, filename: str):
+        """
+        Write the samples table as a binary float64 .npy matrix, which can be loaded without copying using
+        load_from_binary, and a JSON header containing the name of each column.
+
+        The matrix is written to a temporary file which then replaces the existing file, so readers never see a
+        partially written table. Searches use a SamplesBinaryWriter instead, which appends new rows at each update.
+
+        Parameters
+        ----------
+        filename
+            Where the table is to be written
+        """
+        SamplesBinaryWriter(filename=filename).write(samples=self)
+
     def info_to_json(self, filename):
 
         info = {}
@@ -351,37 +898,38 @@ class OptimizerSamples:
             json.dump(info, outfile)
 
     @property
-    def max_log_likelihood_sample(self) -> Sample:
+    def max_log_likelihood_index(self) -> int:
         """The index of the sample with the highest log likelihood."""
-        most_likely_sample = None
-        for sample in self.samples:
-            if most_likely_sample is None or sample.log_likelihood > most_likely_sample.log_likelihood:
-                most_likely_sample = sample
-        return most_likely_sample
+        return int(np.argmax(self.sample_list.log_likelihoods))
+
+    @property
+    def max_log_likelihood_sample(self) -> Sample:
+        """The sample with the highest log likelihood."""
+        if len(self.samples) == 0:
+            return None
+        return self.samples[self.max_log_likelihood_index]
 
     @property
     def max_log_likelihood_vector(self) -> [float]:
         """ The parameters of the maximum log likelihood sample of the `NonLinearSearch` returned as a list of values."""
-        return self.max_log_likelihood_sample.parameters_for_model(
-            self.model
-        )
+        return self.parameter_matrix[self.max_log_likelihood_index].tolist()
 
     @property
     def max_log_likelihood_instance(self) -> ModelInstance:
         """  The parameters of the maximum log likelihood sample of the `NonLinearSearch` returned as a model instance."""
-        return self.max_log_likelihood_sample.instance_for_model(
-            self.model
+        return self.model.instance_from_vector(
+            vector=self.max_log_likelihood_vector
         )
 
     @property
     def max_log_posterior_index(self) -> int:
         """The index of the sample with the highest log posterior."""
-        return int(np.argmax(self.log_posteriors))
+        return int(np.argmax(self.sample_list.log_posteriors))
 
     @property
     def max_log_posterior_vector(self) -> [float]:
         """ The parameters of the maximum log posterior sample of the `NonLinearSearch` returned as a list of values."""
-        return self.parameters[self.max_log_posterior_index]
+        return self.parameter_matrix[self.max_log_posterior_index].tolist()
 
     @property
     def max_log_posterior_instance(self) -> ModelInstance:
@@ -412,7 +960,93 @@ class OptimizerSamples:
         sample_index : int
             The sample index of the weighted sample to return.
         """
-        return self.model.instance_from_vector(vector=self.parameters[sample_index])
+        return self.model.instance_from_vector(vector=self.parameter_matrix[sample_index].tolist())
+
+    def instances(
+            self,
+            indices: Optional[Iterable[int]] = None,
+            function: Optional[Callable] = None,
+            n_workers: int = 1,
+            chunk_size: Optional[int] = None,
+    ) -> Iterator:
+        """Create a model instance for each of many samples, for example to propagate the uncertainties of a fit.
+
+        The parameters of the samples are taken from the parameter matrix once and every instance is created with
+        the same instantiation plan of the model, rather than with a call to *instance_from_sample_index* for each.
+
+        If a function is given it is called with each instance and its results are yielded instead. With more than
+        one worker the instances are created and the function called in the worker processes of a shared pool, so
+        only the results are sent back. The model and function are shipped to the workers once, so both must be
+        picklable, and each task then carries only a chunk of parameter vectors. Without a function the instances
+        themselves are the results, so they are created in this process whatever the number of workers.
+
+        Parameters
+        ----------
+        indices
+            The index of each sample an instance is created for, defaulting to every sample.
+        function
+            Called with each instance, for example to compute a model prediction.
+        n_workers
+            The number of worker processes used to call the function, which is ignored if no function is given.
+        chunk_size
+            The number of instances created by each task sent to a worker.
+
+        Returns
+        -------
+        A generator of instances, or of the results of the function, in the order of the indices.
+        """
+        matrix = self.parameter_matrix
+        if indices is not None:
+            matrix = matrix[np.asarray(list(indices), dtype=int)]
+
+        task = InstancesForVectors(model=self.model, function=function)
+
+        if function is None or n_workers <= 1:
+            return task.generator(matrix)
+
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(matrix) / (4 * n_workers)))
+
+        return _results_from_pool(task=task, matrix=matrix, n_workers=n_workers, chunk_size=chunk_size)
+
+
+def _results_from_pool(task: "InstancesForVectors", matrix: np.ndarray, n_workers: int, chunk_size: int) -> Iterator:
+    """
+    Ship a task to the shared pool with a number of workers and yield its results for chunks of the rows of a
+    matrix. The task is released when every result has been yielded or the generator is closed.
+    """
+    from autofit.non_linear.pool import shared_pool
+
+    pool = shared_pool(n_workers)
+    task = pool.function(task)
+    chunks = (
+        matrix[start:start + chunk_size]
+        for start in range(0, len(matrix), chunk_size)
+    )
+    try:
+        for results in pool.imap(task, chunks):
+            yield from results
+    finally:
+        task.release()
+
+
+class InstancesForVectors:
+    def __init__(self, model: AbstractPriorModel, function: Optional[Callable] = None):
+        """
+        Creates instances of a model for the rows of a parameter matrix with one instantiation plan, optionally
+        calling a function with each. *OptimizerSamples.instances* ships one of these to the workers of a pool.
+        """
+        self.model = model
+        self.function = function
+
+    def generator(self, matrix: np.ndarray) -> Iterator:
+        plan = self.model.instantiation_plan
+        for vector in matrix:
+            instance = plan.instance_for_vector(vector.tolist())
+            yield instance if self.function is None else self.function(instance)
+
+    def __call__(self, matrix: np.ndarray) -> list:
+        return list(self.generator(matrix))
 
 
 class PDFSamples(OptimizerSamples):
@@ -439,6 +1073,7 @@ class PDFSamples(OptimizerSamples):
         )
 
         self._unconverged_sample_size = unconverged_sample_size
+        self._sketched_cdfs = None
 
     @classmethod
     def from_table(self, filename: str, model, number_live_points=None):
@@ -483,19 +1118,85 @@ class PDFSamples(OptimizerSamples):
 
         This does not necessarily imply the `NonLinearSearch` has converged overall, only that errors and visualization
         can be performed numerically.."""
-        if np.max(self.weights) > 0.99:
+        if np.max(self.sample_list.weights) > 0.99:
             return False
         return True
 
+    @property
+    def unsettled_sample_size(self) -> int:
+        """
+        The number of most recent samples which may still change before the next update of the search.
+        """
+        return 0
+
+    def stream_quantiles(self, streaming_quantiles: StreamingQuantiles):
+        """
+        Estimate the quantiles of these samples from sketches which are updated with only the samples added since
+        the previous update, rather than by sorting every sample. Used for the intermediate results of a search.
+
+        The sketches are not pickled, so samples loaded from a pickle compute exact quantiles.
+
+        Parameters
+        ----------
+        streaming_quantiles
+            The sketches of the search, updated with these samples
+        """
+        self._sketched_cdfs = streaming_quantiles.update(
+            matrix=self.parameter_matrix,
+            weights=self.sample_list.weights,
+            unsettled=self.unsettled_sample_size,
+        )
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_sorted_cdfs_cache", None)
+        state.pop("_sketched_cdfs", None)
+        return state
+
+    @property
+    def _sorted_cdfs(self) -> "SortedCDFs":
+        """
+        The sorted values and weighted cumulative distribution of every parameter, computed once for the
+        current samples and reused by every quantile.
+
+        If quantile sketches have been given to these samples they are used instead.
+        """
+        if getattr(self, "_sketched_cdfs", None) is not None:
+            return self._sketched_cdfs
+        try:
+            samples, sorted_cdfs = self._sorted_cdfs_cache
+            if samples is self.samples:
+                return sorted_cdfs
+        except AttributeError:
+            pass
+        sorted_cdfs = SortedCDFs(
+            matrix=self.parameter_matrix,
+            weights=self.sample_list.weights
+        )
+        self._sorted_cdfs_cache = (self.samples, sorted_cdfs)
+        return sorted_cdfs
+
+    def quantiles(self, q) -> np.ndarray:
+        """
+        Weighted quantiles of the probability density function (PDF) of every parameter marginalized in 1D.
+
+        Parameters
+        ----------
+        q
+            The quantiles to compute, each between 0 and 1
+
+        Returns
+        -------
+        An array with a row for each quantile and a column for each parameter
+        """
+        return self._sorted_cdfs.quantiles(q)
+
     @property
     def median_pdf_vector(self) -> [float]:
         """ The median of the probability density function (PDF) of every parameter marginalized in 1D, returned
         as a list of values."""
         if self.pdf_converged:
-            return [
-                quantile(x=params, q=0.5, weights=self.weights)[0]
-                for params in self.parameters_extract
-            ]
+            return self.quantiles(q=[0.5])[0].tolist()
         return self.max_log_likelihood_vector
 
     @property
@@ -527,24 +1228,13 @@ class PDFSamples(OptimizerSamples):
         if self.pdf_converged:
             limit = math.erf(0.5 * sigma * math.sqrt(2))
 
-            lower_errors = [
-                quantile(x=params, q=1.0 - limit, weights=self.weights)[0]
-                for params in self.parameters_extract
-            ]
-
-            upper_errors = [
-                quantile(x=params, q=limit, weights=self.weights)[0]
-                for params in self.parameters_extract
-            ]
+            lower_errors, upper_errors = self.quantiles(q=[1.0 - limit, limit]).tolist()
 
             return [(lower, upper) for lower, upper in zip(lower_errors, upper_errors)]
 
-        parameters_min = list(
-            np.min(self.parameters[-self.unconverged_sample_size:], axis=0)
-        )
-        parameters_max = list(
-            np.max(self.parameters[-self.unconverged_sample_size:], axis=0)
-        )
+        parameters = self.parameter_matrix[-self.unconverged_sample_size:]
+        parameters_min = list(np.min(parameters, axis=0))
+        parameters_max = list(np.max(parameters, axis=0))
 
         return [
             (parameters_min[index], parameters_max[index])
@@ -779,6 +1469,157 @@ class PDFSamples(OptimizerSamples):
 
         return list(map(lambda mean, sigma: (mean, sigma), means, sigmas))
 
+    @property
+    def effective_sample_size(self) -> float:
+        """The (Kish) effective number of samples given their weights, (sum w)^2 / sum w^2. This is the total number of
+        samples if every sample has the same weight and much less for nested sampling, where most samples carry
+        negligible weight."""
+        weights = self.sample_list.weights
+        return float(np.sum(weights) ** 2 / np.sum(weights ** 2))
+
+    def _samples_for_indices(self, indices: np.ndarray, weights: np.ndarray) -> "PDFSamples":
+        sample_list = self.sample_list
+
+        return PDFSamples(
+            model=self.model,
+            samples=SampleList(
+                paths=self.model.model_component_and_parameter_names,
+                parameters=self.parameter_matrix[indices],
+                log_likelihoods=sample_list.log_likelihoods[indices],
+                log_priors=sample_list.log_priors[indices],
+                weights=weights,
+            ),
+            unconverged_sample_size=self._unconverged_sample_size,
+            time=self.time,
+        )
+
+    def resample(self, size: Optional[int] = None, seed: Optional[int] = None) -> "PDFSamples":
+        """Draw an equal weight sample of the posterior from these weighted samples using systematic resampling.
+
+        Each sample is repeated in proportion to its weight and samples with negligible weight are usually dropped,
+        so work done for every sample of the result, such as creating an instance of each, scales with its size
+        rather than the number of samples taken by the `NonLinearSearch`.
+
+        Parameters
+        ----------
+        size
+            The number of samples drawn, which defaults to the effective sample size rounded up.
+        seed
+            Seeds the single random offset used by systematic resampling.
+
+        Returns
+        -------
+        Samples which each have weight 1 / size.
+        """
+        if size is None:
+            size = math.ceil(self.effective_sample_size)
+
+        indices = systematic_resample(weights=self.sample_list.weights, size=size, seed=seed)
+
+        return self._samples_for_indices(indices=indices, weights=np.full(size, 1.0 / size))
+
+    def thin(self, size: Optional[int] = None, seed: Optional[int] = None) -> "PDFSamples":
+        """Thin these samples with systematic resampling, keeping each sample drawn once with a weight given by the
+        number of times it was drawn.
+
+        This represents the same equal weight sample as *resample*, but without repeating samples, so it is smaller
+        when a few samples carry most of the weight.
+
+        Parameters
+        ----------
+        size
+            The number of draws, which defaults to the effective sample size rounded up.
+        seed
+            Seeds the single random offset used by systematic resampling.
+
+        Returns
+        -------
+        Samples in their original order whose weights sum to 1.
+        """
+        if size is None:
+            size = math.ceil(self.effective_sample_size)
+
+        indices = systematic_resample(weights=self.sample_list.weights, size=size, seed=seed)
+        indices, counts = np.unique(indices, return_counts=True)
+
+        return self._samples_for_indices(indices=indices, weights=counts / size)
+
+    def marginals(
+            self,
+            bins: int = 50,
+            kde: bool = False,
+            pairs=None,
+            filename: Optional[str] = None,
+    ) -> Marginals:
+        """The marginal probability density function (PDF) of every parameter in 1D, and of pairs of parameters in 2D,
+        as weighted histograms and optionally FFT kernel density estimates. See *marginals_from_matrix*.
+
+        If a filename is given the marginals are saved to it, and are loaded from it instead of being computed if they
+        were computed with the same settings from the same samples. Samples written to a binary samples file are
+        identified by the size and modification time of the file, and other samples by a hash of their parameters
+        and weights.
+
+        Parameters
+        ----------
+        bins
+            The number of bins of each parameter.
+        kde
+            If True kernel density estimates are computed as well as histograms.
+        pairs
+            The pairs of parameters, by name or index, whose 2D marginals are computed, or "all" for every pair.
+        filename
+            The .npz file the marginals are cached in.
+        """
+        matrix, weights = self._marginal_samples()
+        names = self.model.model_component_and_parameter_names
+        pairs = pair_indices(pairs=pairs, names=names)
+
+        settings = {
+            "bins": bins,
+            "kde": bool(kde),
+            "pairs": [list(pair) for pair in pairs],
+            "total_samples": len(weights),
+            "source": self._source(matrix=matrix, weights=weights),
+        }
+
+        if filename is not None and path.exists(filename):
+            try:
+                marginals = Marginals.load(filename)
+                if marginals.settings == settings and marginals.names == names:
+                    return marginals
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug(e)
+
+        marginals = marginals_from_matrix(
+            matrix=matrix,
+            weights=weights,
+            names=names,
+            bins=bins,
+            kde=kde,
+            pairs=pairs,
+        )
+        marginals.settings.update(settings)
+
+        if filename is not None:
+            marginals.save(filename)
+
+        return marginals
+
+    def _marginal_samples(self):
+        """The parameter matrix and weights of the samples marginals are computed from, which are every sample."""
+        return self.parameter_matrix, self.sample_list.weights
+
+    def _source(self, matrix: np.ndarray, weights: np.ndarray) -> dict:
+        """Identifies the samples marginals were computed from, using the size and modification time of the binary
+        samples file they were written to or else a hash of the matrix and weights."""
+        binary_file = getattr(self, "_binary_file", None)
+        if binary_file is not None and path.exists(binary_file):
+            return _source_of(binary_file)
+
+        sha1 = hashlib.sha1(np.ascontiguousarray(matrix, dtype=np.float64).tobytes())
+        sha1.update(np.ascontiguousarray(weights, dtype=np.float64).tobytes())
+        return {"sha1": sha1.hexdigest()}
+
     def log_likelihood_from_sample_index(self, sample_index) -> float:
         """The log likelihood of an individual sample of the non-linear search.
 
@@ -914,6 +1755,20 @@ class MCMCSamples(PDFSamples):
         self.auto_correlation_change_threshold = auto_correlation_change_threshold
         self.log_evidence = None
 
+    def stream_quantiles(self, streaming_quantiles: StreamingQuantiles):
+        """
+        The medians and errors of MCMC samples are computed from the samples after burn in, which change at every
+        update, so quantile sketches are not used.
+        """
+
+    def _marginal_samples(self):
+        """Marginals are computed from the samples after burn in, with equal weights, the same samples the medians
+        and errors are computed from. If the burn in cannot be estimated every sample is used."""
+        if self.pdf_converged:
+            matrix = np.asarray(self.samples_after_burn_in, dtype=np.float64)
+            return matrix, np.ones(len(matrix))
+        return super()._marginal_samples()
+
     @classmethod
     def from_table(self, filename: str, model, number_live_points=None):
         """
@@ -1041,12 +1896,9 @@ class MCMCSamples(PDFSamples):
                 for i in range(self.model.prior_count)
             ]
 
-        parameters_min = list(
-            np.min(self.parameters[-self.unconverged_sample_size:], axis=0)
-        )
-        parameters_max = list(
-            np.max(self.parameters[-self.unconverged_sample_size:], axis=0)
-        )
+        parameters = self.parameter_matrix[-self.unconverged_sample_size:]
+        parameters_min = list(np.min(parameters, axis=0))
+        parameters_max = list(np.max(parameters, axis=0))
 
         return [
             (parameters_min[index], parameters_max[index])
@@ -1110,11 +1962,18 @@ class NestSamples(PDFSamples):
         with open(filename, 'w') as outfile:
             json.dump(info, outfile)
 
+    @property
+    def unsettled_sample_size(self) -> int:
+        """
+        The live points, which are the most recent samples and are replaced as the nested sampler continues.
+        """
+        return self.number_live_points or 0
+
     @property
     def total_accepted_samples(self) -> int:
         """The total number of accepted samples performed by the nested sampler.
         """
-        return len(self.log_likelihoods)
+        return len(self.samples)
 
     @property
     def acceptance_ratio(self) -> float:
@@ -1149,28 +2008,16 @@ class NestSamples(PDFSamples):
             to be kept.
         """
 
-        parameter_list = []
-        log_likelihoods = []
-        log_priors = []
-        weights = []
-
-        for sample in self.samples:
-
-            parameters = sample.parameters_for_model(model=self.model)
+        parameters = self.parameter_matrix[:, parameter_index]
 
-            if (parameters[parameter_index] > parameter_range[0]) and (parameters[parameter_index] < parameter_range[1]):
-
-                parameter_list.append(parameters)
-                log_likelihoods.append(sample.log_likelihood)
-                log_priors.append(sample.log_prior)
-                weights.append(sample.weights)
-
-        samples = Sample.from_lists(
-            model=self.model,
-            parameters=parameter_list,
-            log_likelihoods=log_likelihoods,
-            log_priors=log_priors,
-            weights=weights
+        samples = SampleList(
+            paths=self.model.model_component_and_parameter_names,
+            parameters=self.parameter_matrix,
+            log_likelihoods=self.sample_list.log_likelihoods,
+            log_priors=self.sample_list.log_priors,
+            weights=self.sample_list.weights,
+        ).with_mask(
+            (parameters > parameter_range[0]) & (parameters < parameter_range[1])
         )
 
         return NestSamples(
@@ -1183,6 +2030,100 @@ class NestSamples(PDFSamples):
             time=self.time
         )
 
+
+class SortedCDFs:
+    def __init__(self, matrix: np.ndarray, weights: np.ndarray):
+        """
+        The values of every column of a matrix sorted with a single argsort, and the weighted cumulative
+        distribution of each column. Any number of quantiles can then be computed for every column by
+        interpolation, without sorting again.
+
+        Quantiles are identical to those given by calling quantile for each column.
+
+        Parameters
+        ----------
+        matrix
+            An (N, P) array with a row for each sample and a column for each parameter
+        weights
+            The weight of each sample
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        weights = np.atleast_1d(np.asarray(weights, dtype=np.float64))
+
+        if len(matrix) != len(weights):
+            raise ValueError("Dimension mismatch: len(weights) != len(x)")
+
+        indices = np.argsort(matrix, axis=0)
+        self.values = np.take_along_axis(matrix, indices, axis=0)
+
+        cdfs = np.cumsum(weights[indices], axis=0)[:-1]
+        cdfs /= cdfs[-1]
+        self.cdfs = np.vstack((np.zeros((1, matrix.shape[1])), cdfs))
+
+    def quantiles(self, q) -> np.ndarray:
+        """
+        Compute quantiles for every column.
+
+        Parameters
+        ----------
+        q
+            The quantiles to compute, each between 0 and 1
+
+        Returns
+        -------
+        An array with a row for each quantile and a column for each parameter
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+
+        if np.any(q < 0.0) or np.any(q > 1.0):
+            raise ValueError("Quantiles must be between 0 and 1")
+
+        return np.array(
+            [
+                np.interp(q, self.cdfs[:, i], self.values[:, i])
+                for i in range(self.values.shape[1])
+            ]
+        ).reshape(self.values.shape[1], len(q)).T
+
+
+def systematic_resample(weights, size: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    The indices of samples drawn in proportion to their weights by systematic resampling.
+
+    The draws are evenly spaced in the cumulative distribution of the weights, offset by a single uniform random
+    number, so each sample is drawn either floor or ceil of size times its normalised weight times. This takes O(N)
+    time, as the draws are already sorted.
+
+    Parameters
+    ----------
+    weights
+        The weight of each sample, which need not be normalised
+    size
+        The number of draws
+    seed
+        Seeds the random offset
+
+    Returns
+    -------
+    An array of size indices in increasing order
+    """
+    weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+    total = np.sum(weights)
+
+    if size < 1:
+        raise ValueError("At least one sample must be drawn")
+    if not total > 0.0:
+        raise ValueError("The weights of the samples must sum to more than zero")
+
+    cumulative = np.cumsum(weights / total)
+    cumulative[-1] = 1.0
+
+    offset = np.random.RandomState(seed).uniform()
+    positions = (offset + np.arange(size)) / size
+
+    return np.searchsorted(cumulative, positions, side="right")
+
+
 def quantile(x, q, weights=None):
     """
     Copied from corner.py
@@ -0,0 +1,228 @@
+import atexit
+import inspect
+import os
+from os import path
+from typing import List, Optional
+from uuid import uuid4
+
+import numpy as np
+
+# Arrays attached by this process, keyed by filename, so each file is mapped once
+_attached = dict()
+
+# Files published by this process which have not yet been removed
+_published = set()
+
+
+def _attach(filename: str) -> "SharedArray":
+    """
+    Attach to a published array, reusing the mapping if this process has already
+    attached to the same file.
+    """
+    try:
+        return _attached[filename]
+    except KeyError:
+        pass
+    array = SharedArray.from_file(filename)
+    _attached[filename] = array
+    return array
+
+
+class SharedArray(np.ndarray):
+    """
+    A read-only array backed by a memory-mapped .npy file.
+
+    When a SharedArray is pickled only the name of its file is stored. Processes
+    that unpickle it, such as the workers of a parallel search, map the same file
+    and so read the data without copying it. Copying or deep copying gives the same
+    array, which is safe because it cannot be written to.
+
+    Arrays derived from a SharedArray, for example by slicing or arithmetic, are
+    pickled and copied as ordinary arrays.
+    """
+
+    filename = None
+
+    @classmethod
+    def from_file(cls, filename: str) -> "SharedArray":
+        array = np.load(filename, mmap_mode="r").view(cls)
+        array.filename = filename
+        return array
+
+    @classmethod
+    def publish(cls, array: np.ndarray, directory: str) -> "SharedArray":
+        """
+        Write an array to a new file in a directory and return a SharedArray
+        mapping that file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        filename = path.join(directory, f"{uuid4().hex}.npy")
+        np.save(filename, np.ascontiguousarray(array))
+
+        shared = cls.from_file(filename)
+        _attached[filename] = shared
+        _published.add(filename)
+        return shared
+
+    def __array_finalize__(self, obj):
+        self.filename = None
+
+    def __reduce__(self):
+        if self.filename is None:
+            return np.asarray(self).copy().__reduce__()
+        return _attach, (self.filename,)
+
+    def __copy__(self):
+        if self.filename is None:
+            return np.asarray(self).copy()
+        return self
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+
+def _is_shareable(value) -> bool:
+    """
+    Only plain numerical arrays are shared. Subclasses of ndarray may carry extra
+    state, such as a mask, which would be lost.
+    """
+    return (
+            type(value) in (np.ndarray, np.memmap)
+            and value.size > 0
+            and not value.dtype.hasobject
+    )
+
+
+def _has_attributes(value) -> bool:
+    return (
+            hasattr(value, "__dict__")
+            and not inspect.isclass(value)
+            and not inspect.ismodule(value)
+            and not inspect.isroutine(value)
+    )
+
+
+def _replace(value, replace):
+    """
+    Replace an array, or the arrays held directly by a list or dictionary. Lists and
+    dictionaries in which an array is replaced are copied rather than modified, as
+    they may be shared with other objects.
+    """
+    if isinstance(value, np.ndarray):
+        return replace(value)
+    if isinstance(value, list):
+        items = [replace(item) if isinstance(item, np.ndarray) else item for item in value]
+        changed = any(item is not original for item, original in zip(items, value))
+        return items if changed else value
+    if isinstance(value, dict):
+        items = {
+            key: replace(item) if isinstance(item, np.ndarray) else item
+            for key, item in value.items()
+        }
+        changed = any(items[key] is not original for key, original in value.items())
+        return items if changed else value
+    return value
+
+
+def _replace_arrays(obj, replace, attributes=None):
+    """
+    Replace the arrays held by attributes of an object. Attributes holding an object
+    with attributes of its own, such as a dataset, have the arrays of that object
+    replaced instead. By default every attribute of the object is used, and only
+    the dataset attribute is treated as an object.
+    """
+    names = list(obj.__dict__) if attributes is None else attributes
+
+    for name in names:
+        value = obj.__dict__[name]
+        if (
+                (attributes is not None or name == "dataset")
+                and not isinstance(value, (np.ndarray, list, dict))
+                and _has_attributes(value)
+        ):
+            for key, item in list(value.__dict__.items()):
+                value.__dict__[key] = _replace(item, replace)
+        else:
+            obj.__dict__[name] = _replace(value, replace)
+
+
+def share_arrays(obj, directory: str, attributes: Optional[List[str]] = None) -> List[str]:
+    """
+    Replace the NumPy arrays held by an object, such as an Analysis, and by its
+    dataset with SharedArrays written to a directory.
+
+    Only arrays held directly by the attributes of the object, by lists and
+    dictionaries in those attributes, and likewise by the attributes of its dataset
+    are shared. Other objects reachable from it, which may be shared with user code,
+    are left unchanged. Arrays already shared are left unchanged.
+
+    Parameters
+    ----------
+    obj
+        The object whose arrays are shared
+    directory
+        The directory in which the memory-mapped files are written
+    attributes
+        The names of the attributes whose arrays are shared, which defaults to every
+        attribute and the attributes of the dataset
+
+    Returns
+    -------
+    The files of the arrays that were shared
+    """
+    published = dict()
+
+    def replace(value):
+        if not _is_shareable(value):
+            return value
+        if id(value) not in published:
+            published[id(value)] = (value, SharedArray.publish(value, directory))
+        return published[id(value)][1]
+
+    _replace_arrays(obj, replace, attributes)
+    return [shared.filename for _, shared in published.values()]
+
+
+def unshare_arrays(obj, filenames: List[str], attributes: Optional[List[str]] = None):
+    """
+    Replace the SharedArrays of files published by share_arrays with copies in
+    memory, then remove the files.
+
+    Parameters
+    ----------
+    obj
+        The object whose arrays were shared
+    filenames
+        The files returned by share_arrays
+    attributes
+        The names of the attributes given to share_arrays
+    """
+    filenames = set(filenames)
+
+    def replace(value):
+        if isinstance(value, SharedArray) and value.filename in filenames:
+            return np.array(value)
+        return value
+
+    _replace_arrays(obj, replace, attributes)
+
+    for filename in filenames:
+        _attached.pop(filename, None)
+        _published.discard(filename)
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            pass
+
+
+@atexit.register
+def remove_published():
+    """
+    Remove every file published by this process which has not been removed.
+    """
+    for filename in list(_published):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+    _published.clear()
@@ -0,0 +1,192 @@
+import threading
+import time
+
+from autofit.non_linear.log import logger
+
+
+class AsynchronousUpdater:
+    def __init__(self, perform, combine=None):
+        """
+        Performs updates on a background thread so that a `NonLinearSearch` can continue sampling while its results
+        are output.
+
+        Updates coalesce: if an update is submitted while another is still waiting to be performed, only the newer
+        update is kept. A combine function may be given to merge the waiting update into the newer one, for example
+        so that output requested by the dropped update is not lost.
+
+        The perform function runs concurrently with the search, so it must not use objects the search is using, such
+        as the analysis, or modules which are not thread-safe, such as matplotlib.
+
+        Parameters
+        ----------
+        perform
+            A function called on the background thread with each update
+        combine
+            An optional function taking the waiting update and the newer update and returning the update to perform
+        """
+        self.perform = perform
+        self.combine = combine
+
+        self.performed = 0
+        self.coalesced = 0
+
+        self._condition = threading.Condition()
+        self._pending = None
+        self._running = False
+        self._thread = None
+        self._exception = None
+
+    def submit(self, update):
+        """
+        Submit an update to be performed in the background, replacing any update still waiting.
+        """
+        with self._condition:
+            if self._pending is not None:
+                self.coalesced += 1
+                if self.combine is not None:
+                    update = self.combine(self._pending, update)
+            self._pending = update
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._pending is None:
+                    self._thread = None
+                    self._condition.notify_all()
+                    return
+                update = self._pending
+                self._pending = None
+                self._running = True
+
+            try:
+                self.perform(update)
+            except Exception as e:
+                logger.exception(e)
+                self._exception = e
+            finally:
+                with self._condition:
+                    self._running = False
+                    self.performed += 1
+                    self._condition.notify_all()
+
+    def flush(self):
+        """
+        Block until every submitted update has been performed. If an update raised an exception it is raised here.
+        """
+        with self._condition:
+            while self._pending is not None or self._running:
+                self._condition.wait()
+
+        exception = self._exception
+        self._exception = None
+        if exception is not None:
+            raise exception
+
+
+class AdaptiveUpdateCadence:
+    def __init__(
+            self,
+            overhead_fraction: float = 0.05,
+            minimum_iterations: int = 100,
+            maximum_iterations: int = 100000,
+            smoothing: float = 0.5,
+    ):
+        """
+        Chooses how many iterations a `NonLinearSearch` performs between updates, so that the time spent performing
+        updates stays below a fraction of the total time of the search.
+
+        After each update the rate at which the search samples and the time the update took are measured. The
+        iterations until the next update are those which take long enough that the update is at most overhead_fraction
+        of the time, bounded by a minimum and maximum and never fewer than one. Measurements are smoothed over updates,
+        so a single slow update does not change the cadence abruptly.
+
+        Parameters
+        ----------
+        overhead_fraction
+            The largest fraction of the time of the search spent performing updates
+        minimum_iterations
+            The fewest iterations performed between updates
+        maximum_iterations
+            The most iterations performed between updates
+        smoothing
+            The weight given to the newest measurement when averaging it with previous measurements
+        """
+        self.overhead_fraction = overhead_fraction
+        self.minimum_iterations = minimum_iterations
+        self.maximum_iterations = maximum_iterations
+        self.smoothing = smoothing
+
+        self.iterations_per_second = None
+        self.update_time = None
+
+        self._sampling_start = None
+        self._iterations_per_update = None
+
+    def start(self):
+        """
+        Mark the start of sampling, before the first update.
+        """
+        self._sampling_start = time.perf_counter()
+
+    def _clamp(self, iterations: float) -> int:
+        """
+        Bound a number of iterations by the minimum and maximum, returning at least one iteration.
+        """
+        iterations = round(min(max(iterations, self.minimum_iterations), self.maximum_iterations))
+        self._iterations_per_update = max(iterations, 1)
+        return self._iterations_per_update
+
+    def _average(self, previous, value):
+        if previous is None:
+            return value
+        return self.smoothing * value + (1.0 - self.smoothing) * previous
+
+    def iterations_per_update(self, iterations: int, update_start: float) -> int:
+        """
+        Measure an update which has just finished and return the iterations to perform before the next.
+
+        If the sampling could not be measured, because sampling has not started, took no time or performed no
+        iterations, the iterations previously chosen are kept, or else those given are used.
+
+        Parameters
+        ----------
+        iterations
+            The iterations the search performed before the update
+        update_start
+            The value of time.perf_counter() when the update began
+
+        Returns
+        -------
+        The number of iterations the search should perform before its next update
+        """
+        update_end = time.perf_counter()
+
+        previous_iterations = iterations if self._iterations_per_update is None else self._iterations_per_update
+
+        if self._sampling_start is None:
+            self._sampling_start = update_end
+            return self._clamp(previous_iterations)
+
+        sampling_time = update_start - self._sampling_start
+        self._sampling_start = update_end
+
+        if sampling_time <= 0.0 or iterations <= 0:
+            return self._clamp(previous_iterations)
+
+        self.iterations_per_second = self._average(
+            self.iterations_per_second, iterations / sampling_time
+        )
+        self.update_time = self._average(
+            self.update_time, update_end - update_start
+        )
+
+        sampling_time_per_update = self.update_time * (1.0 - self.overhead_fraction) / self.overhead_fraction
+
+        return self._clamp(self.iterations_per_second * sampling_time_per_update)
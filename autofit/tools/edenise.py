@@ -3,6 +3,9 @@ import shutil
 from os import walk
 from uuid import uuid1
 
+# An entry of the _lazy_imports dictionary in an __init__, e.g. "Emcee": (".non_linear.mcmc.emcee", "Emcee"),
+LAZY_IMPORT_PATTERN = re.compile(r'"(\w+)": \("(\.[\w.]*)", "(\w+)"\),')
+
 
 class Line:
     def __init__(self, string):
@@ -87,6 +90,23 @@ class Line:
         )
 
 
+def import_string(string):
+    """
+    The import in a line of an __init__, or None if it has none. Names imported lazily through the _lazy_imports
+    dictionary are given as the equivalent import.
+    """
+    string = string.strip()
+    match = LAZY_IMPORT_PATTERN.match(string)
+    if match is not None:
+        name, module, attribute = match.groups()
+        if name == attribute:
+            return f"from {module} import {attribute}"
+        return f"from {module} import {attribute} as {name}"
+    if string.startswith("from"):
+        return string
+    return None
+
+
 class Converter:
     def __init__(self, name, prefix, lines):
         self.name = name
@@ -110,7 +130,7 @@ class Converter:
         with open(
                 f"{source_directory}/__init__.py"
         ) as f:
-            lines = map(Line, f.readlines())
+            lines = list(map(Line, filter(None, map(import_string, f.readlines()))))
         return Converter(name, prefix, lines)
 
     def convert(self, string):
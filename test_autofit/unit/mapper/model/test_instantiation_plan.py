@@ -0,0 +1,94 @@
+import pickle
+
+import pytest
+
+import autofit as af
+from autofit import exc
+from autofit.mock import mock as m
+
+
+@pytest.fixture(name="model")
+def make_model():
+    return af.CollectionPriorModel(
+        simple=af.PriorModel(m.MockClassx2),
+        tuple=af.PriorModel(m.MockClassx3TupleFloat),
+        complex=af.PriorModel(
+            m.ComplexClass,
+            simple=af.PriorModel(m.MockClassx2)
+        )
+    )
+
+
+class TestInstantiationPlan:
+    def test_plan_reused(self, model):
+        plan = model.instantiation_plan
+        model.instance_from_vector([0.5] * model.prior_count)
+        assert model.instantiation_plan is plan
+
+    def test_setattr_invalidates(self, model):
+        plan = model.instantiation_plan
+        model.simple.one = 1.0
+        assert model.instantiation_plan is not plan
+        assert model.instantiation_plan.prior_count == 6
+
+        instance = model.instance_from_vector([0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+        assert instance.simple.one == 1.0
+        assert instance.simple.two == 0.1
+
+    def test_tuple_prior_invalidates(self, model):
+        plan = model.instantiation_plan
+        model.tuple.one_tuple.one_tuple_0 = 0.5
+        assert model.instantiation_plan is not plan
+
+        instance = model.instance_from_vector([0.1] * 6)
+        assert instance.tuple.one_tuple == (0.5, 0.1)
+
+    def test_remove_invalidates(self):
+        model = af.CollectionPriorModel([m.MockClassx2, m.MockClassx4])
+        plan = model.instantiation_plan
+        model.remove(model[0])
+        assert model.instantiation_plan is not plan
+        assert model.prior_count == 4
+
+    def test_assertion_invalidates(self, model):
+        model.instance_from_vector([0.5] * 7)
+        model.add_assertion(model.simple.one > model.simple.two)
+        with pytest.raises(exc.FitException):
+            model.instance_from_vector([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7])
+
+    def test_same_as_arguments(self, model):
+        vector = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
+        instance = model.instance_from_vector(vector)
+        expected = model.instance_for_arguments(
+            {
+                prior: value
+                for (_, prior), value
+                in zip(model.prior_tuples_ordered_by_id, vector)
+            }
+        )
+
+        assert instance.simple.__dict__ == expected.simple.__dict__
+        assert instance.tuple.one_tuple == expected.tuple.one_tuple
+        assert instance.tuple.two == expected.tuple.two
+        assert instance.complex.simple.__dict__ == expected.complex.simple.__dict__
+
+    def test_limits(self, model):
+        with pytest.raises(exc.PriorLimitException):
+            model.instance_from_vector([2.0] * 7)
+        model.instance_from_vector([2.0] * 7, assert_priors_in_limits=False)
+
+    def test_promise(self):
+        model = af.CollectionPriorModel(
+            simple=m.MockClassx2
+        )
+        model.simple.one = af.last.model.one
+        with pytest.raises(exc.PriorException):
+            model.instance_from_vector([0.5])
+
+    def test_pickle_drops_plan(self, model):
+        model.instantiation_plan
+        loaded = pickle.loads(pickle.dumps(model))
+        assert loaded.instantiation_plan.prior_model is loaded
+
+        instance = loaded.instance_from_vector([0.5] * 7)
+        assert instance.complex.simple.one == 0.5
@@ -0,0 +1,99 @@
+import copy
+
+import pytest
+
+import autofit as af
+from autofit.mapper.prior_model import structure
+from autofit.mock import mock as m
+
+
+@pytest.fixture(name="model")
+def make_model():
+    return af.ModelMapper(
+        one=m.MockClassx2,
+        collection=af.CollectionPriorModel([m.MockClassx2])
+    )
+
+
+class TestStructureCache:
+    def test_cached(self, model):
+        priors = model.priors
+        assert model.prior_count == 4
+        assert structure.structure_cache(model)["priors"] == priors
+
+    def test_nested_setattr(self, model):
+        assert model.prior_count == 4
+        model.collection[0].one = 1.0
+        assert model.prior_count == 3
+        assert model.collection.prior_count == 1
+
+    def test_append(self, model):
+        assert model.prior_count == 4
+        model.collection.append(m.MockClassx2)
+        assert model.prior_count == 6
+        assert len(model.model_component_and_parameter_names) == 6
+
+    def test_setitem(self, model):
+        assert model.prior_count == 4
+        model.collection[0] = m.MockClassx4
+        assert model.prior_count == 6
+
+    def test_remove(self, model):
+        assert model.prior_count == 4
+        model.collection.remove(model.collection[0])
+        assert model.prior_count == 2
+
+    def test_promise_count(self, model):
+        assert model.promise_count == 0
+        model.one.one = af.last.model.one
+        assert model.promise_count == 1
+
+    def test_prior_class_dict(self, model):
+        model.prior_class_dict
+        model.collection[0] = m.MockClassx4
+        assert set(model.prior_class_dict.values()) == {m.MockClassx2, m.MockClassx4}
+
+    def test_copies_returned(self, model):
+        model.priors.append(None)
+        model.prior_class_dict.clear()
+        assert len(model.priors) == 4
+        assert len(model.prior_class_dict) == 4
+
+    def test_not_copied(self, model):
+        model.unique_prior_paths
+        copied = copy.deepcopy(model)
+        assert structure.structure_cache(copied) is not structure.structure_cache(model)
+        copied.one.one = 1.0
+        assert copied.prior_count == 3
+        assert model.prior_count == 4
+
+
+class TestPriorIndex:
+    def test_prior_with_id(self, model):
+        prior = model.one.one
+        assert model.prior_with_id(prior.id) is prior
+
+        new_prior = af.UniformPrior()
+        model.collection[0].two = new_prior
+        assert model.prior_with_id(new_prior.id) is new_prior
+        with pytest.raises(KeyError):
+            model.prior_with_id(prior.id + 1000)
+
+    def test_name_for_prior(self, model):
+        assert model.name_for_prior(model.one.one) == "one_one"
+        assert model.name_for_prior(model.collection[0].two) == "collection_0_two"
+        assert model.name_for_prior(af.UniformPrior()) is None
+
+        model.collection[0].two = model.one.one
+        assert model.name_for_prior(model.one.one) == "one_one"
+
+        model.one = m.MockClassx4
+        assert model.name_for_prior(model.collection[0].two) == "collection_0_two"
+
+    def test_path_for_prior(self, model):
+        prior = model.collection[0].two
+        assert model.path_for_prior(prior) == ("collection", "0", "two")
+
+        model.other = af.PriorModel(m.MockClassx2, one=prior)
+        assert model.path_for_prior(prior) == ("collection", "0", "two")
+        assert model.path_for_prior(model.other.two) == ("other", "two")
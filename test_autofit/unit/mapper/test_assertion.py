@@ -169,3 +169,62 @@ class TestModel:
         model.add_assertion(False)
         with pytest.raises(exc.FitException):
             model.instance_from_unit_vector([])
+
+
+class TestValidMask:
+    def test_limits(self):
+        model = af.Collection(
+            one=af.UniformPrior(0.0, 1.0),
+            two=af.GaussianPrior(mean=0.0, sigma=1.0, lower_limit=0.0),
+        )
+        mask = model.valid_mask_from_matrix(
+            [[0.5, 0.5], [1.5, 0.5], [0.5, -0.5]]
+        )
+        assert mask.tolist() == [True, False, False]
+
+    def test_assertions(self, prior_1, prior_2):
+        model = af.ModelMapper()
+        model.one = prior_1
+        model.two = prior_2
+        model.add_assertion(prior_1 < prior_2)
+
+        mask = model.valid_mask_from_matrix(
+            [[0.1, 0.2], [0.2, 0.1]]
+        )
+        assert mask.tolist() == [True, False]
+
+    def test_nested_and_compound_assertions(self):
+        model = af.Collection(
+            component=af.PriorModel(mock.MockClassx2)
+        )
+        one = model.component.one
+        two = model.component.two
+        model.component.add_assertion(one < two)
+        model.add_assertion((0.2 < one) < 0.8)
+
+        mask = model.valid_mask_from_matrix(
+            [[0.3, 0.4], [0.1, 0.4], [0.4, 0.3], [0.85, 0.9]]
+        )
+        assert mask.tolist() == [True, False, False, False]
+
+        for vector, valid in zip([[0.3, 0.4], [0.4, 0.3]], [True, False]):
+            if valid:
+                model.instance_from_vector(vector)
+            else:
+                with pytest.raises(exc.FitException):
+                    model.instance_from_vector(vector)
+
+    def test_assertions_checked_before_instantiation(self, prior_1, prior_2):
+        created = list()
+
+        class Component:
+            def __init__(self, one, two):
+                created.append((one, two))
+
+        model = af.Collection(component=af.PriorModel(Component, one=prior_1, two=prior_2))
+        model.add_assertion(prior_1 < prior_2)
+
+        with pytest.raises(exc.FitException):
+            model.instance_from_vector([0.2, 0.1])
+
+        assert created == list()
@@ -1,8 +1,10 @@
 import math
 
+import numpy as np
 import pytest
 
 import autofit as af
+from autofit.mapper.prior.prior import values_for_unit_matrix
 from autofit.mock import mock
 
 
@@ -367,3 +369,62 @@ class TestGaussianPrior:
         log_prior = gaussian_simple.log_prior_from_value(value=2.0)
 
         assert log_prior == pytest.approx(0.108888, 1.0e-4)
+
+
+class TestUnitMatrix:
+    def test_prior_classes(self):
+        priors = [
+            af.UniformPrior(1.0, 2.0),
+            af.GaussianPrior(mean=0.5, sigma=2.0),
+            af.LogUniformPrior(1.0, 100.0),
+            af.UniformPrior(-1.0, 1.0),
+        ]
+        unit_matrix = np.array([
+            [0.1, 0.2, 0.3, 0.4],
+            [0.9, 0.5, 0.5, 0.0],
+        ])
+
+        physical_matrix = values_for_unit_matrix(priors, unit_matrix)
+
+        for units, values in zip(unit_matrix, physical_matrix):
+            assert list(values) == pytest.approx([
+                prior.value_for(unit)
+                for prior, unit in zip(priors, units)
+            ])
+
+    def test_model(self):
+        model = af.ModelMapper(
+            one=mock.MockClassx2,
+            two=mock.MockClassx2,
+        )
+        model.one.one = af.GaussianPrior(mean=1.0, sigma=2.0)
+        unit_matrix = np.random.random((10, model.prior_count))
+
+        physical_matrix = model.matrix_from_unit_matrix(unit_matrix)
+
+        assert physical_matrix.shape == (10, 4)
+        for units, values in zip(unit_matrix, physical_matrix):
+            assert list(values) == pytest.approx(model.vector_from_unit_vector(units))
+
+    def test_wrong_shape(self):
+        model = af.ModelMapper(one=mock.MockClassx2)
+        with pytest.raises(af.exc.PriorException):
+            model.matrix_from_unit_matrix(np.zeros((3, 3)))
+
+    def test_log_priors(self):
+        model = af.ModelMapper(
+            one=mock.MockClassx2,
+            two=mock.MockClassx2,
+        )
+        model.one.one = af.GaussianPrior(mean=1.0, sigma=2.0)
+        model.two.two = af.LogUniformPrior(1.0, 10.0)
+        matrix = np.array([
+            [0.5, 0.5, 0.5, 2.0],
+            [3.0, 0.1, 0.2, 5.0],
+        ])
+
+        log_priors = model.log_priors_from_matrix(matrix)
+
+        assert log_priors.shape == (2, 4)
+        for vector, row in zip(matrix, log_priors):
+            assert list(row) == pytest.approx(model.log_priors_from_vector(vector))
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 
 import autofit as af
@@ -106,3 +108,109 @@ class TestFromDict:
     def test_deferred(self):
         result = af.Prior.from_dict({"type": "Deferred"})
         assert isinstance(result, DeferredArgument)
+
+
+class TestPriorConfigCache:
+    def test_config_read_once(self, monkeypatch):
+        from autoconf import conf
+        from autofit.mock import mock
+
+        af.PriorModel(mock.MockClassx2)
+
+        def fail(*_):
+            raise AssertionError("prior config was read again")
+
+        monkeypatch.setattr(type(conf.instance), "prior_config", property(fail))
+
+        prior_model = af.PriorModel(mock.MockClassx2)
+        assert prior_model.prior_count == 2
+
+    @staticmethod
+    def count_reads(monkeypatch):
+        from autoconf import conf
+
+        reads = list()
+        prior_config = type(conf.instance).prior_config
+
+        def read(instance):
+            reads.append(1)
+            return prior_config.fget(instance)
+
+        monkeypatch.setattr(type(conf.instance), "prior_config", property(read))
+        return reads
+
+    def test_config_read_again_when_files_change(self, monkeypatch):
+        from autofit import config_snapshot
+        from autofit.mapper.prior import prior
+        from autofit.mock import mock
+
+        af.PriorModel(mock.MockClassx2)
+        reads = self.count_reads(monkeypatch)
+        monkeypatch.setattr(prior, "_prior_config_version", lambda paths: ("changed",))
+
+        af.PriorModel(mock.MockClassx2)
+        assert len(reads) == 0
+
+        with config_snapshot.frozen():
+            af.PriorModel(mock.MockClassx2)
+        assert len(reads) == 2
+
+    def test_version_checked_once_per_snapshot(self, monkeypatch):
+        from autofit import config_snapshot
+        from autofit.mapper.prior import prior
+        from autofit.mock import mock
+
+        af.PriorModel(mock.MockClassx2)
+
+        checks = list()
+        version = prior._prior_config_version
+
+        def check(paths):
+            checks.append(1)
+            return version(paths)
+
+        monkeypatch.setattr(prior, "_prior_config_version", check)
+
+        af.PriorModel(mock.MockClassx2)
+        assert len(checks) == 0
+
+        for _ in range(2):
+            with config_snapshot.frozen():
+                af.PriorModel(mock.MockClassx2)
+                af.PriorModel(mock.MockClassx2)
+        assert len(checks) == 2
+
+    def test_clear(self, monkeypatch):
+        from autofit.mock import mock
+
+        af.PriorModel(mock.MockClassx2)
+        reads = self.count_reads(monkeypatch)
+
+        af.clear_prior_config_cache()
+
+        af.PriorModel(mock.MockClassx2)
+        assert len(reads) == 2
+
+    def test_version(self, tmp_path):
+        from autofit.mapper.prior.prior import _prior_config_version
+
+        os.mkdir(str(tmp_path / "priors"))
+        filename = str(tmp_path / "priors" / "mock.json")
+        with open(filename, "w") as f:
+            f.write("{}")
+        version = _prior_config_version([str(tmp_path)])
+
+        with open(filename, "w") as f:
+            f.write('{"MockClass": {}}')
+
+        assert len(version) == 1
+        assert _prior_config_version([str(tmp_path)]) != version
+
+    def test_missing_config_raises_each_time(self):
+        from autofit.mapper.prior.prior import prior_config_for_class_and_suffix_path
+
+        for _ in range(2):
+            with pytest.raises(KeyError):
+                prior_config_for_class_and_suffix_path(
+                    TestPriorConfigCache, ["one"]
+                )
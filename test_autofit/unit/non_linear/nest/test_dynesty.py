@@ -393,3 +393,50 @@ class TestCopyWithNameExtension:
         assert copy.fmove == search.fmove
         assert copy.max_move == search.max_move
         assert copy.number_of_cores == search.number_of_cores
+
+
+class MockPoolFunction:
+    def __init__(self):
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class MockPool:
+    def __init__(self):
+        self.functions = list()
+
+    def function(self, function):
+        self.functions.append(MockPoolFunction())
+        return self.functions[-1]
+
+
+def test_dynamic_fit_releases_pool_functions(monkeypatch):
+    from autofit import config_snapshot
+
+    pool = MockPool()
+    snapshots = list()
+
+    def _fit(search, model, analysis):
+        snapshots.append(config_snapshot.active())
+        search.ship_function(pool=pool, function=None)
+        raise ValueError
+
+    monkeypatch.setattr(af.DynestyDynamic, "_fit", _fit)
+
+    model = af.ModelMapper(
+        mock_class=af.PriorModel(
+            mock.MockClassx2,
+            one=af.UniformPrior(0.0, 1.0),
+            two=af.UniformPrior(0.0, 1.0),
+        )
+    )
+    search = af.DynestyDynamic(af.Paths("dynamic_release"))
+
+    with pytest.raises(ValueError):
+        search.fit(model=model, analysis=None)
+
+    assert pool.functions[0].released
+    assert snapshots[0] is not None
+    assert config_snapshot.active() is None
@@ -194,3 +194,81 @@ class TestMovePickleFiles:
 
         if path.exists(test_path):
             shutil.rmtree(test_path)
+
+
+class MockAnalysis(af.Analysis):
+    def __init__(self):
+        self.calls = 0
+
+    def log_likelihood_function(self, instance):
+        self.calls += 1
+        if instance.component.one > 0.9:
+            raise af.exc.FitException
+        return instance.component.one + instance.component.two
+
+
+class MockBatchAnalysis(MockAnalysis):
+    def __init__(self):
+        super().__init__()
+        self.batch_calls = 0
+
+    def log_likelihood_function_batch(self, instances):
+        self.batch_calls += 1
+        ones = np.array([instance.component.one for instance in instances])
+        twos = np.array([instance.component.two for instance in instances])
+        if np.any(ones > 0.9):
+            raise af.exc.FitException
+        return ones + twos
+
+
+class TestBatchFitness:
+    @staticmethod
+    def make_fitness(cls, analysis):
+        model = af.ModelMapper(
+            component=af.PriorModel(
+                mock.MockClassx2,
+                one=af.UniformPrior(0.0, 1.0),
+                two=af.UniformPrior(0.0, 1.0),
+            )
+        )
+        return cls(
+            paths=None,
+            model=model,
+            analysis=analysis,
+            samples_from_model=None,
+        )
+
+    def test_batch_called_once(self):
+        analysis = MockBatchAnalysis()
+        fitness = self.make_fitness(af.PySwarmsGlobal.Fitness, analysis)
+
+        figures_of_merit = fitness(np.array([[0.1, 0.2], [0.3, 0.4]]))
+
+        assert analysis.batch_calls == 1
+        assert analysis.calls == 0
+        assert figures_of_merit == pytest.approx([-0.6, -1.4])
+        assert fitness.max_log_likelihood == pytest.approx(0.7)
+
+    def test_fallback_loop(self):
+        analysis = MockAnalysis()
+        fitness = self.make_fitness(af.PySwarmsGlobal.Fitness, analysis)
+
+        figures_of_merit = fitness(np.array([[0.1, 0.2], [0.95, 0.4], [0.3, 0.4]]))
+
+        assert analysis.calls == 3
+        assert list(figures_of_merit) == pytest.approx([-0.6, np.inf, -1.4])
+
+    def test_batch_fit_exception_isolated(self):
+        analysis = MockBatchAnalysis()
+        fitness = self.make_fitness(af.Emcee.Fitness, analysis)
+
+        log_posteriors = fitness(np.array([[0.1, 0.2], [0.95, 0.4], [1.5, 0.4]]))
+
+        assert analysis.batch_calls == 1
+        assert analysis.calls == 2
+        assert list(log_posteriors) == pytest.approx([0.3, -np.inf, -np.inf])
+
+    def test_single_vector(self):
+        fitness = self.make_fitness(af.Emcee.Fitness, MockBatchAnalysis())
+
+        assert fitness(np.array([0.1, 0.2])) == pytest.approx(0.3)
@@ -0,0 +1,134 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import autofit as af
+from autofit import exc
+from autofit.mock import mock
+from autofit.non_linear.cache import LikelihoodCache
+
+
+class TestLikelihoodCache:
+    def test_hits_and_misses(self):
+        cache = LikelihoodCache()
+
+        with pytest.raises(KeyError):
+            cache[[1.0, 2.0]]
+        cache[[1.0, 2.0]] = 3.0
+
+        assert cache[np.array([1.0, 2.0])] == 3.0
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_least_recently_used_discarded(self):
+        cache = LikelihoodCache(size=2)
+
+        cache[[1.0]] = 1.0
+        cache[[2.0]] = 2.0
+        assert cache[[1.0]] == 1.0
+
+        cache[[3.0]] = 3.0
+
+        assert len(cache) == 2
+        assert [1.0] in cache
+        assert [2.0] not in cache
+
+    def test_decimals(self):
+        cache = LikelihoodCache(decimals=3)
+        cache[[0.10001, -0.00001]] = 1.0
+
+        assert cache[[0.1, 0.0]] == 1.0
+
+    def test_pickle_keeps_entries(self):
+        cache = LikelihoodCache()
+        cache[[1.0]] = 1.0
+        cache[[1.0]]
+
+        loaded = pickle.loads(pickle.dumps(cache))
+
+        assert loaded[[1.0]] == 1.0
+        assert loaded.hits == 1
+
+    def test_persist(self, tmp_path):
+        directory = str(tmp_path / "cache")
+        cache = LikelihoodCache(directory=directory)
+        cache[[1.0, 2.0]] = 3.0
+        cache[[4.0, 5.0]] = np.nan
+        cache.save()
+
+        np.savez(
+            str(tmp_path / "cache" / "worker.npz"),
+            parameters=np.array([[6.0, 7.0]]),
+            log_likelihoods=np.array([8.0]),
+        )
+
+        loaded = LikelihoodCache(directory=directory)
+
+        assert len(loaded) == 3
+        assert loaded[[1.0, 2.0]] == 3.0
+        assert np.isnan(loaded[[4.0, 5.0]])
+        assert len(loaded.files) == 1
+
+
+class Analysis(af.Analysis):
+    def __init__(self):
+        self.calls = 0
+
+    def log_likelihood_function(self, instance):
+        self.calls += 1
+        if instance.component.one > 0.9:
+            raise exc.FitException
+        return instance.component.one + instance.component.two
+
+
+@pytest.fixture(name="fitness")
+def make_fitness():
+    model = af.ModelMapper(
+        component=af.PriorModel(
+            mock.MockClassx2,
+            one=af.UniformPrior(0.0, 1.0),
+            two=af.UniformPrior(0.0, 1.0),
+        )
+    )
+    fitness = af.Emcee.Fitness(
+        paths=None,
+        model=model,
+        analysis=Analysis(),
+        samples_from_model=None,
+    )
+    fitness.likelihood_cache = LikelihoodCache()
+    return fitness
+
+
+class TestCachedFitness:
+    def test_vector_evaluated_once(self, fitness):
+        first = fitness.log_likelihood_from_parameters([0.1, 0.2])
+        second = fitness.log_likelihood_from_parameters([0.1, 0.2])
+
+        assert first == second == pytest.approx(0.3)
+        assert fitness.analysis.calls == 1
+
+    def test_fit_exception_not_cached(self, fitness):
+        for _ in range(2):
+            with pytest.raises(exc.FitException):
+                fitness.log_likelihood_from_parameters([0.95, 0.2])
+
+        assert fitness.analysis.calls == 2
+
+    def test_matrix(self, fitness):
+        fitness.log_likelihood_from_parameters([0.1, 0.2])
+
+        log_likelihoods, fitted = fitness.log_likelihoods_from_parameter_matrix(
+            np.array([[0.1, 0.2], [0.3, 0.4], [0.95, 0.2]])
+        )
+        assert fitness.analysis.calls == 3
+
+        assert log_likelihoods[:2] == pytest.approx([0.3, 0.7])
+        assert list(fitted) == [True, True, False]
+
+        fitness.log_likelihoods_from_parameter_matrix(
+            np.array([[0.3, 0.4], [0.95, 0.2]])
+        )
+        assert fitness.analysis.calls == 4
+        assert fitness.max_log_likelihood == pytest.approx(0.7)
@@ -1,5 +1,9 @@
+import numpy as np
+import pytest
+
 import autofit as af
 from autofit.mock.mock import MockClassx4
+from autofit.non_linear.pool import EvaluationPool
 
 
 class MockFitness:
@@ -126,3 +130,78 @@ class TestInitializeBall:
         assert 3.199 < initial_parameters[1][3] < 3.201
 
         assert initial_figures_of_merit == 2 * [1.0]
+
+
+class MockBatchFitness:
+    def __init__(self):
+        self.batch_sizes = list()
+
+    def figures_of_merit_from_parameter_matrix(self, parameters):
+        self.batch_sizes.append(len(parameters))
+        return parameters[:, 0].copy(), parameters[:, 0] <= 0.5
+
+
+class MockNanAnalysis(af.Analysis):
+    def log_likelihood_function(self, instance):
+        if instance.one > 0.5:
+            return np.nan
+        return instance.one
+
+
+@pytest.fixture(name="model")
+def make_model():
+    model = af.PriorModel(MockClassx4)
+    model.one = af.UniformPrior(lower_limit=0.0, upper_limit=1.0)
+    model.two = af.UniformPrior(lower_limit=0.0, upper_limit=1.0)
+    model.three = af.UniformPrior(lower_limit=0.0, upper_limit=1.0)
+    model.four = af.GaussianPrior(mean=0.0, sigma=1.0, lower_limit=0.0, upper_limit=np.inf)
+    return model
+
+
+class TestBatches:
+    def test__invalid_points_redrawn(self, model):
+        fitness = MockBatchFitness()
+
+        initial_unit_parameters, initial_parameters, initial_figures_of_merit = af.InitializerPrior().initial_samples_from_model(
+            total_points=20, model=model, fitness_function=fitness
+        )
+
+        assert len(initial_parameters) == len(initial_unit_parameters) == 20
+        assert initial_figures_of_merit == [parameters[0] for parameters in initial_parameters]
+        assert all(parameters[0] <= 0.5 for parameters in initial_parameters)
+
+        # Points outside the prior limits of four are discarded before being fitted
+        assert all(parameters[3] >= 0.0 for parameters in initial_parameters)
+        assert fitness.batch_sizes[0] <= 20
+        assert len(fitness.batch_sizes) > 1
+
+    def test__nan_figures_of_merit_redrawn(self, model):
+        fitness = af.Emcee.Fitness(
+            paths=None,
+            model=model,
+            analysis=MockNanAnalysis(),
+            samples_from_model=None,
+        )
+
+        initial_unit_parameters, initial_parameters, initial_figures_of_merit = af.InitializerPrior().initial_samples_from_model(
+            total_points=10, model=model, fitness_function=fitness
+        )
+
+        assert len(initial_parameters) == 10
+        assert np.all(np.isfinite(initial_figures_of_merit))
+        assert all(parameters[0] <= 0.5 for parameters in initial_parameters)
+
+    def test__pool(self, model):
+        pool = EvaluationPool(2)
+        try:
+            fitness = pool.function(MockBatchFitness())
+
+            initial_unit_parameters, initial_parameters, initial_figures_of_merit = af.InitializerPrior().initial_samples_from_model(
+                total_points=10, model=model, fitness_function=fitness
+            )
+        finally:
+            pool.close()
+
+        assert len(initial_parameters) == 10
+        assert fitness.batch_sizes == list()
+        assert initial_figures_of_merit == [parameters[0] for parameters in initial_parameters]
@@ -0,0 +1,196 @@
+import os
+
+import numpy as np
+import pytest
+
+import autofit as af
+from autofit.mock.mock import MockClassx2
+from autofit.non_linear.marginals import Marginals, marginals_from_matrix, pair_indices
+from autofit.non_linear.samples import Sample
+
+NAMES = ["one", "two", "three"]
+
+
+@pytest.fixture(name="matrix")
+def make_matrix():
+    return np.random.RandomState(1).normal(size=(20000, 3))
+
+
+@pytest.fixture(name="weights")
+def make_weights():
+    weights = np.random.RandomState(2).uniform(size=20000)
+    weights[:100] = 0.0
+    return weights
+
+
+@pytest.fixture(name="marginals")
+def make_marginals(matrix, weights):
+    return marginals_from_matrix(
+        matrix=matrix, weights=weights, names=NAMES, bins=40, kde=True, pairs=[("one", "three")]
+    )
+
+
+class TestMarginalsFromMatrix:
+    def test_histograms(self, matrix, weights, marginals):
+        for index in range(3):
+            pdf, edges = np.histogram(
+                matrix[:, index],
+                bins=marginals.edges[index],
+                weights=weights,
+                density=True,
+            )
+            assert marginals.pdfs[index] == pytest.approx(pdf)
+            assert marginals.edges[index] == pytest.approx(edges)
+
+        # Samples with no weight do not set the range of the bins
+        assert marginals.edges[0, 0] == pytest.approx(np.min(matrix[100:, 0]))
+
+    def test_pair_histogram(self, matrix, weights, marginals):
+        pdf, _, _ = np.histogram2d(
+            matrix[:, 0],
+            matrix[:, 2],
+            bins=[marginals.edges[0], marginals.edges[2]],
+            weights=weights,
+            density=True,
+        )
+        assert marginals.pair_pdf("one", "three") == pytest.approx(pdf)
+        assert marginals.pair_pdf(2, 0) == pytest.approx(pdf.T)
+
+        with pytest.raises(KeyError):
+            marginals.pair_pdf("one", "two")
+
+    def test_kdes(self, marginals):
+        widths = marginals.edges[:, 1] - marginals.edges[:, 0]
+
+        assert np.sum(marginals.kdes, axis=1) * widths == pytest.approx(np.ones(3))
+
+        centres, kde = marginals.pdf("two", kde=True)
+        assert kde == pytest.approx(np.exp(-0.5 * centres ** 2) / np.sqrt(2.0 * np.pi), abs=0.03)
+
+        pair_kde = marginals.pair_pdf("one", "three", kde=True)
+        assert np.sum(pair_kde) * widths[0] * widths[2] == pytest.approx(1.0)
+
+    def test_no_kdes(self, matrix, weights):
+        marginals = marginals_from_matrix(matrix=matrix, weights=weights, names=NAMES, bins=10)
+
+        assert marginals.kdes is None
+        assert marginals.pairs == []
+        with pytest.raises(ValueError):
+            marginals.pdf("one", kde=True)
+
+    def test_degenerate_parameter(self):
+        marginals = marginals_from_matrix(
+            matrix=np.array([[1.0, 2.0], [1.0, 3.0]]), weights=[1.0, 1.0], names=["a", "b"], bins=4, kde=True
+        )
+
+        assert marginals.pdfs[0] == pytest.approx([0.0, 0.0, 1.0, 0.0])
+        assert np.all(np.isfinite(marginals.kdes))
+
+    def test_pair_indices(self):
+        assert pair_indices(pairs="all", names=NAMES) == [(0, 1), (0, 2), (1, 2)]
+        assert pair_indices(pairs=[("three", 0)], names=NAMES) == [(2, 0)]
+        assert pair_indices(pairs=None, names=NAMES) == []
+
+        with pytest.raises(ValueError):
+            pair_indices(pairs="some", names=NAMES)
+
+    def test_save_and_load(self, marginals, tmp_path):
+        filename = str(tmp_path / "marginals.npz")
+        marginals.save(filename)
+
+        loaded = Marginals.load(filename)
+
+        assert loaded.names == NAMES
+        assert loaded.pairs == [(0, 2)]
+        assert loaded.settings == marginals.settings
+        assert loaded.pdfs == pytest.approx(marginals.pdfs)
+        assert loaded.pair_pdf("three", "one", kde=True) == pytest.approx(
+            marginals.pair_pdf("three", "one", kde=True)
+        )
+        assert os.listdir(str(tmp_path)) == ["marginals.npz"]
+
+
+@pytest.fixture(name="samples")
+def make_samples(matrix, weights):
+    model = af.ModelMapper(
+        mock_class=af.PriorModel(
+            MockClassx2,
+            one=af.GaussianPrior(0.0, 1.0),
+            two=af.GaussianPrior(0.0, 1.0),
+        )
+    )
+    return af.NestSamples(
+        model=model,
+        samples=Sample.from_lists(
+            model=model,
+            parameters=matrix[:, :2].tolist(),
+            log_likelihoods=len(matrix) * [0.0],
+            log_priors=len(matrix) * [0.0],
+            weights=weights.tolist(),
+        ),
+        total_samples=len(matrix),
+        log_evidence=0.0,
+        number_live_points=50,
+    )
+
+
+class TestSamplesMarginals:
+    def test_marginals(self, samples, matrix, weights):
+        marginals = samples.marginals(bins=20, pairs="all")
+
+        assert marginals.names == ["mock_class_one", "mock_class_two"]
+        assert marginals.pairs == [(0, 1)]
+        assert marginals.pdfs == pytest.approx(
+            marginals_from_matrix(matrix=matrix[:, :2], weights=weights, names=marginals.names, bins=20).pdfs
+        )
+
+    def test_cached(self, samples, tmp_path):
+        filename = str(tmp_path / "marginals.npz")
+
+        marginals = samples.marginals(bins=20, filename=filename)
+        marginals.pdfs[:] = 0.0
+        marginals.save(filename)
+
+        assert np.all(samples.marginals(bins=20, filename=filename).pdfs == 0.0)
+
+        # Different settings or samples invalidate the cache
+        assert np.any(samples.marginals(bins=20, pairs="all", filename=filename).pdfs > 0.0)
+        assert np.any(samples.marginals(bins=20, filename=filename).pdfs > 0.0)
+        assert Marginals.load(filename).pairs == []
+
+    def test_cache_keyed_on_samples(self, samples, matrix, tmp_path):
+        filename = str(tmp_path / "marginals.npz")
+
+        marginals = samples.marginals(bins=20, filename=filename)
+        marginals.pdfs[:] = 0.0
+        marginals.save(filename)
+
+        # The same number of rows and total weight from different samples
+        samples.samples.parameters[:] = matrix[::-1, :2]
+
+        assert np.any(samples.marginals(bins=20, filename=filename).pdfs > 0.0)
+
+    def test_mcmc_after_burn_in(self, samples, matrix):
+        class MockMCMCSamples(af.MCMCSamples):
+            @property
+            def samples_after_burn_in(self):
+                return self.parameter_matrix[10000:]
+
+        mcmc_samples = MockMCMCSamples(
+            model=samples.model,
+            samples=samples.samples,
+            auto_correlation_times=None,
+            auto_correlation_check_size=None,
+            auto_correlation_required_length=None,
+            auto_correlation_change_threshold=None,
+            total_walkers=None,
+            total_steps=None,
+        )
+
+        marginals = mcmc_samples.marginals(bins=20)
+
+        assert marginals.pdfs == pytest.approx(
+            marginals_from_matrix(
+                matrix=matrix[10000:, :2], weights=np.ones(10000), names=marginals.names, bins=20
+            ).pdfs
+        )
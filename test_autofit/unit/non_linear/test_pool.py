@@ -0,0 +1,97 @@
+import os
+import pickle
+
+import pytest
+
+from autofit.non_linear.pool import EvaluationPool, PoolFunction, close_pools, shared_pool
+
+
+class Function:
+    def __init__(self):
+        self.data = list(range(10000))
+
+    def __call__(self, x):
+        return os.getpid(), id(self), 2 * x
+
+
+@pytest.fixture(name="pool")
+def make_pool():
+    pool = EvaluationPool(2)
+    yield pool
+    pool.close()
+
+
+class TestEvaluationPool:
+    def test_pids(self, pool):
+        assert len(pool.pids) == 2
+        assert os.getpid() not in pool.pids
+
+    def test_map(self, pool):
+        function = pool.function(Function())
+        results = pool.map(function, range(20))
+
+        assert [result[2] for result in results] == list(range(0, 40, 2))
+        assert {result[0] for result in results} <= set(pool.pids)
+
+    def test_imap(self, pool):
+        function = pool.function(Function())
+        results = pool.imap(function, range(20))
+
+        assert not isinstance(results, list)
+        assert [result[2] for result in results] == list(range(0, 40, 2))
+
+    def test_function_loaded_once_per_worker(self, pool):
+        function = pool.function(Function())
+        results = pool.map(function, range(100))
+
+        assert len({result[1] for result in results}) <= 2
+
+    def test_handle_pickles_without_function(self, pool):
+        function = Function()
+        handle = pool.function(function)
+
+        assert len(pickle.dumps(handle)) < len(pickle.dumps(function)) / 10
+        assert handle.data is function.data
+
+    def test_functions_shared_until_released(self, pool):
+        first = pool.function(Function())
+        second = pool.function(Function())
+
+        pool.map(second, range(4))
+        assert [result[2] for result in pool.map(first, range(4))] == [0, 2, 4, 6]
+
+        first.release()
+
+        assert not os.path.exists(first.filename)
+        assert os.path.exists(second.filename)
+
+    def test_release_counts_references(self, pool):
+        function = Function()
+        first = pool.function(function)
+        second = pool.function(function)
+
+        assert first.filename == second.filename
+
+        first.release()
+        assert os.path.exists(second.filename)
+
+        second.release()
+        assert not os.path.exists(second.filename)
+
+    def test_pickle_pool(self, pool):
+        loaded = pickle.loads(pickle.dumps(pool))
+        assert loaded.directory is None
+        assert loaded.map(Function(), [1])[0][2] == 2
+
+        function = loaded.function(Function())
+        assert function.filename is None
+        assert loaded.map(function, [1])[0][2] == 2
+        assert pickle.loads(pickle.dumps(function))(1)[2] == 2
+
+        loaded.close()
+
+
+def test_shared_pool():
+    assert shared_pool(2) is shared_pool(2)
+    assert isinstance(shared_pool(2).function(Function()), PoolFunction)
+    close_pools()
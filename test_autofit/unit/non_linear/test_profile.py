@@ -0,0 +1,153 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+import autofit as af
+from autofit.mock import mock
+from autofit.non_linear.profile import (
+    Profiler,
+    StageTimings,
+    null_profiler,
+    summarise_timings,
+)
+
+
+@pytest.fixture(name="profiler")
+def make_profiler(tmp_path):
+    return Profiler(directory=str(tmp_path / "profile"))
+
+
+class TestStageTimings:
+    def test_add(self):
+        timings = StageTimings()
+        for duration in (1.0, 3.0, 2.0):
+            timings.add(duration)
+
+        assert timings.count == 3
+        assert timings.total == 6.0
+        assert timings.minimum == 1.0
+        assert timings.maximum == 3.0
+
+    def test_reservoir_bounded(self):
+        timings = StageTimings(reservoir_size=10)
+        for duration in range(1000):
+            timings.add(float(duration))
+
+        assert timings.count == 1000
+        assert len(timings.durations) == 10
+
+    def test_summarise_weights_processes_by_count(self):
+        many = StageTimings()
+        many.count = 90
+        many.total = 90.0
+        many.minimum = many.maximum = 1.0
+        many.durations = [1.0]
+
+        few = StageTimings()
+        few.count = 10
+        few.total = 50.0
+        few.minimum = few.maximum = 5.0
+        few.durations = [5.0]
+
+        summary = summarise_timings([many, few])
+
+        assert summary["count"] == 100
+        assert summary["mean"] == pytest.approx(1.4)
+        assert summary["percentiles"]["50"] == 1.0
+        assert summary["percentiles"]["99"] == 5.0
+
+    def test_summarise_no_calls(self):
+        assert summarise_timings([StageTimings()]) is None
+
+
+class TestProfiler:
+    def test_stages(self, profiler):
+        for _ in range(3):
+            with profiler("stage"):
+                pass
+
+        summary = profiler.summary()
+
+        assert summary["stages"]["stage"]["count"] == 3
+        assert summary["workers"] == 0
+        assert summary["unprofiled_time"] <= summary["wall_time"]
+
+    def test_null_profiler(self):
+        with null_profiler("stage"):
+            pass
+
+        assert pickle.loads(pickle.dumps(null_profiler)) is null_profiler
+
+    def test_pickle_drops_timings(self, profiler):
+        with profiler("stage"):
+            pass
+
+        loaded = pickle.loads(pickle.dumps(profiler))
+
+        assert loaded.stages == dict()
+        assert loaded.directory == profiler.directory
+
+    def test_worker_timings_combined(self, profiler):
+        with profiler("stage"):
+            pass
+
+        worker = pickle.loads(pickle.dumps(profiler))
+        for _ in range(4):
+            with worker("stage"):
+                pass
+        worker.flush()
+
+        summary = profiler.summary()
+
+        assert summary["workers"] == 1
+        assert summary["stages"]["stage"]["count"] == 5
+
+    def test_old_worker_files_removed(self, profiler):
+        profiler.flush()
+        assert len(profiler.worker_files) == 1
+
+        assert Profiler(directory=profiler.directory).worker_files == list()
+
+    def test_output_to_json(self, profiler, tmp_path):
+        with profiler("stage"):
+            pass
+
+        filename = str(tmp_path / "profile.json")
+        profiler.output_to_json(filename=filename)
+
+        with open(filename) as f:
+            assert json.load(f)["stages"]["stage"]["count"] == 1
+
+
+class Analysis(af.Analysis):
+    def log_likelihood_function(self, instance):
+        return instance.component.one
+
+
+def test_fitness_stages(profiler):
+    model = af.ModelMapper(
+        component=af.PriorModel(
+            mock.MockClassx2,
+            one=af.UniformPrior(0.0, 1.0),
+            two=af.UniformPrior(0.0, 1.0),
+        )
+    )
+    fitness = af.Emcee.Fitness(
+        paths=None,
+        model=model,
+        analysis=Analysis(),
+        samples_from_model=None,
+    )
+    assert fitness.profiler is null_profiler
+
+    fitness.profiler = profiler
+    fitness(np.array([0.1, 0.2]))
+    fitness(np.array([[0.1, 0.2], [0.3, 0.4]]))
+
+    stages = profiler.summary()["stages"]
+
+    assert stages["instance_from_vector"]["count"] == 3
+    assert stages["log_likelihood_function"]["count"] == 3
+    assert stages["log_priors"]["count"] == 2
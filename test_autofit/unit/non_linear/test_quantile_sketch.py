@@ -0,0 +1,118 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import autofit as af
+from autofit.mock.mock import MockClassx2
+from autofit.non_linear.quantile_sketch import QuantileSketch, StreamingQuantiles
+from autofit.non_linear.samples import Sample, SortedCDFs
+
+QUANTILES = [0.0228, 0.1587, 0.5, 0.8413, 0.9772]
+
+
+@pytest.fixture(name="matrix")
+def make_matrix():
+    return np.random.RandomState(1).normal(size=(20000, 2))
+
+
+@pytest.fixture(name="weights")
+def make_weights():
+    return np.random.RandomState(2).exponential(size=20000)
+
+
+class TestQuantileSketch:
+    def test_close_to_exact(self, matrix, weights):
+        sketch = QuantileSketch()
+        for start in range(0, len(matrix), 1000):
+            sketch.update(matrix[start:start + 1000, 0], weights[start:start + 1000])
+
+        exact = SortedCDFs(matrix=matrix[:, :1], weights=weights).quantiles(QUANTILES)[:, 0]
+
+        assert sketch.quantiles(QUANTILES) == pytest.approx(exact, abs=0.02)
+        assert len(sketch.means) <= sketch.compression
+
+    def test_merge(self, matrix, weights):
+        first = QuantileSketch()
+        first.update(matrix[:10000, 0], weights[:10000])
+        second = QuantileSketch()
+        second.update(matrix[10000:, 0], weights[10000:])
+
+        first.merge(second)
+
+        whole = QuantileSketch()
+        whole.update(matrix[:, 0], weights)
+
+        assert first.total_weight == pytest.approx(np.sum(weights))
+        assert first.quantiles(QUANTILES) == pytest.approx(whole.quantiles(QUANTILES), abs=0.02)
+
+    def test_extremes(self):
+        sketch = QuantileSketch()
+        sketch.update([3.0, 1.0, 2.0], [1.0, 1.0, 0.0])
+
+        assert sketch.quantiles([0.0, 1.0]).tolist() == [1.0, 3.0]
+
+
+class TestStreamingQuantiles:
+    def test_only_new_rows_added(self, matrix, weights):
+        streaming = StreamingQuantiles()
+
+        for total in range(2000, len(matrix) + 1, 2000):
+            # Renormalising every weight does not rebuild the sketches
+            cdfs = streaming.update(matrix[:total], 2.0 * weights[:total] / total, unsettled=100)
+
+        exact = SortedCDFs(matrix=matrix, weights=weights).quantiles(QUANTILES)
+
+        assert streaming.rebuilds == 1
+        assert len(streaming.weights) == len(matrix) - 100
+        assert cdfs.quantiles(QUANTILES) == pytest.approx(exact, abs=0.02)
+
+    def test_changed_rows_rebuild(self, matrix, weights):
+        streaming = StreamingQuantiles()
+        streaming.update(matrix[:1000], weights[:1000])
+
+        changed = weights[:2000].copy()
+        changed[0] *= 2.0
+        streaming.update(matrix[:2000], changed)
+
+        assert streaming.rebuilds == 2
+
+    def test_unsettled_rows_replaced(self, matrix, weights):
+        streaming = StreamingQuantiles()
+        streaming.update(matrix[:1000], weights[:1000], unsettled=10)
+
+        replaced = matrix[:2000].copy()
+        replaced[990:1000] = 100.0
+        streaming.update(replaced, weights[:2000], unsettled=10)
+
+        assert streaming.rebuilds == 1
+
+
+def test_nest_samples():
+    model = af.ModelMapper(mock_class=MockClassx2)
+    parameters = np.random.RandomState(3).normal(size=(5000, 2))
+
+    samples = af.NestSamples(
+        model=model,
+        samples=Sample.from_lists(
+            model=model,
+            parameters=parameters,
+            log_likelihoods=np.zeros(5000),
+            log_priors=np.zeros(5000),
+            weights=np.full(5000, 1.0 / 5000),
+        ),
+        total_samples=5000,
+        log_evidence=0.0,
+        number_live_points=50,
+    )
+    exact = samples.vector_at_sigma(sigma=1.0)
+
+    streaming = StreamingQuantiles()
+    samples.stream_quantiles(streaming)
+
+    assert len(streaming.weights) == 4950
+    assert samples.median_pdf_vector == pytest.approx(np.median(parameters, axis=0), abs=0.05)
+    assert np.array(samples.vector_at_sigma(sigma=1.0)) == pytest.approx(np.array(exact), abs=0.05)
+
+    # Sketches are not pickled, so loaded samples compute exact quantiles
+    assert pickle.loads(pickle.dumps(samples)).vector_at_sigma(sigma=1.0) == exact
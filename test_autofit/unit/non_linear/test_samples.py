@@ -1,10 +1,28 @@
 import os
+import pickle
 
+import numpy as np
 import pytest
 
 import autofit as af
+from autofit.aggregator.phase_output import PhaseOutput
 from autofit.mock.mock import MockClassx2, MockClassx4
-from autofit.non_linear.samples import OptimizerSamples, PDFSamples, Sample
+from autofit.non_linear.pool import shared_pool
+from autofit.non_linear.samples import (
+    OptimizerSamples,
+    PDFSamples,
+    Sample,
+    SampleList,
+    SamplesBinaryWriter,
+    SamplesTableWriter,
+    SortedCDFs,
+    MEMMAP_THRESHOLD,
+    load_from_binary,
+    load_from_table,
+    quantile,
+    systematic_resample,
+    table_cache_filename_for,
+)
 
 pytestmark = pytest.mark.filterwarnings("ignore::FutureWarning")
 
@@ -64,6 +82,395 @@ class TestSamplesTable:
         os.remove(filename)
 
 
+class TestBinarySamples:
+    def test_round_trip(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.npy")
+        samples.write_binary(filename=filename)
+
+        sample_list = load_from_binary(filename=filename)
+
+        assert sample_list.paths == samples.samples.paths
+        assert (sample_list.parameters == samples.samples.parameters).all()
+        assert list(sample_list.log_likelihoods) == [1.0, 2.0, 3.0, 10.0, 5.0]
+        assert list(sample_list.weights) == [1.0, 1.0, 1.0, 1.0, 1.0]
+        assert sample_list[3].kwargs["mock_class_1_four"] == 24.0
+
+    def test_memory_mapped(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.npy")
+        samples.write_binary(filename=filename)
+
+        sample_list = load_from_binary(filename=filename)
+        table = np.load(filename, mmap_mode="r")
+
+        assert isinstance(table, np.memmap)
+        assert not sample_list.parameters.flags["OWNDATA"]
+        assert not sample_list.parameters.flags["WRITEABLE"]
+        assert not sample_list.log_likelihoods.flags["OWNDATA"]
+
+    def test_from_table(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.npy")
+        samples.write_binary(filename=filename)
+
+        loaded = af.NestSamples.from_table(filename=filename, model=samples.model)
+
+        assert loaded.parameters == samples.parameters
+        assert loaded.log_posteriors == samples.log_posteriors
+
+    def test_append(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.npy")
+        writer = SamplesBinaryWriter(filename=filename)
+
+        writer.write(TestSamplesTableWriter.samples_with(samples, 2))
+        writer.write(TestSamplesTableWriter.samples_with(samples, 5))
+
+        assert writer.rewrites == 1
+        assert writer.appends == 1
+        assert (np.load(filename) == samples._table).all()
+        assert list(load_from_binary(filename=filename).log_likelihoods) == [1.0, 2.0, 3.0, 10.0, 5.0]
+
+    def test_rewrite_when_weights_change(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.npy")
+        writer = SamplesBinaryWriter(filename=filename)
+
+        writer.write(TestSamplesTableWriter.samples_with(samples, 2))
+        changed = TestSamplesTableWriter.samples_with(samples, 5, weights=[0.5] * 5)
+        writer.write(changed)
+
+        assert writer.rewrites == 2
+        assert (np.load(filename) == changed._table).all()
+
+    def test_pickled_with_samples(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.npy")
+        samples.write_binary(filename=filename)
+
+        pickled = pickle.dumps(samples)
+        os.remove(filename)
+        loaded = pickle.loads(pickled)
+
+        assert loaded._binary_file is None
+        assert loaded.parameters == samples.parameters
+
+    def test_saved_without_samples(self, samples, tmp_path):
+        for directory in ("pickles", "samples"):
+            os.makedirs(tmp_path / directory)
+        open(tmp_path / "metadata", "w+").close()
+
+        search = af.MockSearch()
+        search.paths = af.Paths()
+        search.paths.make_samples_pickle_path = lambda: str(tmp_path / "pickles" / "samples.pickle")
+
+        writer = SamplesBinaryWriter(filename=str(tmp_path / "samples" / "samples.npy"))
+        saved = TestSamplesTableWriter.samples_with(samples, 2)
+        writer.write(saved)
+        saved.write_table(filename=str(tmp_path / "samples" / "samples.csv"))
+
+        search.save_samples(samples=saved)
+        writer.write(TestSamplesTableWriter.samples_with(samples, 5))
+
+        loaded = PhaseOutput(str(tmp_path)).samples
+        assert loaded.parameters == saved.parameters
+        assert loaded._binary_file is None
+
+        os.remove(writer.filename)
+
+        assert PhaseOutput(str(tmp_path)).samples.parameters == saved.parameters
+
+
+class TestLoadFromTable:
+    @staticmethod
+    def assert_loaded(sample_list, samples):
+        assert sample_list.paths == samples.samples.paths
+        assert (sample_list.parameters == samples.samples.parameters).all()
+        assert list(sample_list.log_likelihoods) == [1.0, 2.0, 3.0, 10.0, 5.0]
+        assert list(sample_list.weights) == [1.0, 1.0, 1.0, 1.0, 1.0]
+
+    def test_in_memory(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.csv")
+        samples.write_table(filename=filename)
+
+        self.assert_loaded(load_from_table(filename=filename), samples)
+        assert not os.path.exists(table_cache_filename_for(filename))
+
+    def test_no_rows(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.csv")
+        with open(filename, "w+") as f:
+            f.write(",".join(samples._headers) + "\n")
+
+        for memmap_threshold in (0, MEMMAP_THRESHOLD):
+            sample_list = load_from_table(filename=filename, memmap_threshold=memmap_threshold)
+            assert len(sample_list) == 0
+            assert sample_list.parameters.shape == (0, 4)
+
+    def test_memory_mapped(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.csv")
+        samples.write_table(filename=filename)
+
+        sample_list = load_from_table(filename=filename, memmap_threshold=0)
+
+        self.assert_loaded(sample_list, samples)
+        assert os.path.exists(table_cache_filename_for(filename))
+        assert not sample_list.parameters.flags["WRITEABLE"]
+
+    def test_binary_file_reused_until_table_changes(self, samples, tmp_path, monkeypatch):
+        from autofit.non_linear import samples as samps
+
+        filename = str(tmp_path / "samples.csv")
+        samples.write_table(filename=filename)
+        load_from_table(filename=filename, memmap_threshold=0)
+
+        def fail(*_):
+            raise AssertionError("table parsed again")
+
+        with monkeypatch.context() as m:
+            m.setattr(samps, "_parse_chunks", fail)
+            self.assert_loaded(load_from_table(filename=filename), samples)
+
+        with open(filename, "a") as f:
+            f.write("1,2,3,4,5,0,5,1\n")
+
+        assert len(load_from_table(filename=filename)) == 6
+
+    def test_temporary_file_removed_on_error(self, samples, tmp_path, monkeypatch):
+        from autofit.non_linear import samples as samps
+
+        filename = str(tmp_path / "samples.csv")
+        samples.write_table(filename=filename)
+
+        def fail(*_):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(samps, "_parse_chunks", fail)
+
+        with open(filename) as f:
+            f.readline()
+            with pytest.raises(OSError):
+                samps._parse_to_binary(f, filename=filename, headers=samples._headers, source={})
+
+        assert os.listdir(str(tmp_path)) == ["samples.csv"]
+
+    def test_blank_lines(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.csv")
+        samples.write_table(filename=filename)
+        with open(filename, "a") as f:
+            f.write("\n\n")
+
+        self.assert_loaded(load_from_table(filename=filename, memmap_threshold=0), samples)
+        assert not os.path.exists(table_cache_filename_for(filename))
+
+
+@pytest.fixture(name="weighted_samples")
+def make_weighted_samples():
+    model = af.ModelMapper(
+        mock_class_1=af.PriorModel(
+            MockClassx2,
+            one=af.UniformPrior(0.0, 10.0),
+            two=af.UniformPrior(0.0, 10.0),
+        )
+    )
+
+    return af.NestSamples(
+        model=model,
+        samples=Sample.from_lists(
+            model=model,
+            parameters=[[0.0, 1.0], [2.0, 3.0], [4.0, 5.0], [6.0, 7.0], [8.0, 9.0]],
+            log_likelihoods=[1.0, 2.0, 3.0, 4.0, 5.0],
+            log_priors=5 * [0.0],
+            weights=[0.0, 0.5, 1e-9, 0.25, 0.25],
+        ),
+        total_samples=10,
+        log_evidence=0.0,
+        number_live_points=5,
+    )
+
+
+class TestResample:
+    def test_systematic_resample(self):
+        weights = np.random.RandomState(1).exponential(size=1000)
+        indices = systematic_resample(weights=weights, size=300, seed=2)
+
+        counts = np.bincount(indices, minlength=1000)
+        expected = 300 * weights / np.sum(weights)
+
+        assert len(indices) == 300
+        assert (np.diff(indices) >= 0).all()
+        assert (np.abs(counts - expected) < 1.0).all()
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            systematic_resample(weights=[0.0, 0.0], size=1)
+        with pytest.raises(ValueError):
+            systematic_resample(weights=[1.0], size=0)
+
+    def test_effective_sample_size(self, weighted_samples):
+        assert weighted_samples.effective_sample_size == pytest.approx(1.0 / 0.375)
+
+    def test_resample(self, weighted_samples):
+        resampled = weighted_samples.resample(size=8, seed=1)
+
+        assert isinstance(resampled.samples, SampleList)
+        assert resampled.total_samples == 8
+        assert resampled.weights == 8 * [0.125]
+        assert resampled.parameters.count([2.0, 3.0]) == 4
+        assert resampled.parameters.count([6.0, 7.0]) == 2
+        assert resampled.log_likelihoods.count(5.0) == 2
+        assert resampled.model is weighted_samples.model
+
+    def test_default_size(self, weighted_samples):
+        assert weighted_samples.resample().total_samples == 3
+
+    def test_thin(self, weighted_samples):
+        thinned = weighted_samples.thin(size=8, seed=1)
+
+        assert thinned.parameters == [[2.0, 3.0], [6.0, 7.0], [8.0, 9.0]]
+        assert thinned.weights == [0.5, 0.25, 0.25]
+        assert thinned.log_likelihoods == [2.0, 4.0, 5.0]
+
+
+def sum_of_attributes(instance):
+    return instance.mock_class_1.one + instance.mock_class_1.two
+
+
+class TestInstances:
+    def test_instances(self, weighted_samples):
+        instances = weighted_samples.instances(indices=[3, 1])
+
+        assert not isinstance(instances, list)
+        instance = next(instances)
+        assert isinstance(instance.mock_class_1, MockClassx2)
+        assert instance.mock_class_1.one == 6.0
+        assert next(instances).mock_class_1.two == 3.0
+
+    def test_all_samples(self, weighted_samples):
+        ones = [instance.mock_class_1.one for instance in weighted_samples.instances()]
+
+        assert ones == [0.0, 2.0, 4.0, 6.0, 8.0]
+
+    def test_function(self, weighted_samples):
+        results = weighted_samples.instances(function=sum_of_attributes)
+
+        assert list(results) == [1.0, 5.0, 9.0, 13.0, 17.0]
+
+    def test_workers(self, weighted_samples):
+        results = weighted_samples.instances(
+            indices=[4, 0, 2],
+            function=sum_of_attributes,
+            n_workers=2,
+            chunk_size=1,
+        )
+
+        assert list(results) == [17.0, 1.0, 9.0]
+        assert len(shared_pool(2)._functions) == 0
+
+
+class TestSamplesTableWriter:
+    @staticmethod
+    def samples_with(samples, total, weights=None):
+        sample_list = samples.samples
+        return OptimizerSamples(
+            model=samples.model,
+            samples=SampleList(
+                paths=sample_list.paths,
+                parameters=sample_list.parameters[:total],
+                log_likelihoods=sample_list.log_likelihoods[:total],
+                log_priors=sample_list.log_priors[:total],
+                weights=sample_list.weights[:total] if weights is None else weights,
+            )
+        )
+
+    @staticmethod
+    def read(filename):
+        with open(filename) as f:
+            return f.read()
+
+    def test_append(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.csv")
+        expected = str(tmp_path / "expected.csv")
+        writer = SamplesTableWriter(filename=filename)
+
+        writer.write(self.samples_with(samples, 2))
+        writer.write(self.samples_with(samples, 5))
+        writer.close()
+
+        samples.write_table(filename=expected)
+
+        assert self.read(filename) == self.read(expected)
+        assert writer.rewrites == 1
+        assert writer.appends == 1
+        assert writer.total_rows == 5
+
+    def test_rewrite_when_weights_change(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.csv")
+        expected = str(tmp_path / "expected.csv")
+        writer = SamplesTableWriter(filename=filename)
+
+        writer.write(self.samples_with(samples, 2))
+        changed = self.samples_with(samples, 5, weights=[0.5] * 5)
+        writer.write(changed)
+        writer.close()
+
+        changed.write_table(filename=expected)
+
+        assert self.read(filename) == self.read(expected)
+        assert writer.rewrites == 2
+
+    def test_rewrite_when_file_removed(self, samples, tmp_path):
+        filename = str(tmp_path / "samples.csv")
+        writer = SamplesTableWriter(filename=filename)
+
+        writer.write(self.samples_with(samples, 2))
+        os.remove(filename)
+        writer.write(self.samples_with(samples, 5))
+        writer.close()
+
+        assert writer.rewrites == 2
+        assert len(self.read(filename).splitlines()) == 6
+
+
+class TestSampleList:
+    def test_arrays(self, samples):
+        sample_list = samples.samples
+
+        assert isinstance(sample_list, SampleList)
+        assert sample_list.parameters.shape == (5, 4)
+        assert sample_list.parameters.dtype == np.float64
+        assert sample_list.parameters.flags["C_CONTIGUOUS"]
+        assert list(sample_list.log_likelihoods) == [1.0, 2.0, 3.0, 10.0, 5.0]
+
+    def test_row_view(self, samples):
+        sample = samples.samples[3]
+
+        assert isinstance(sample, Sample)
+        assert sample.log_likelihood == 10.0
+        assert sample.log_posterior == 10.0
+        assert sample.kwargs == {
+            "mock_class_1_one": 21.0,
+            "mock_class_1_two": 22.0,
+            "mock_class_1_three": 23.0,
+            "mock_class_1_four": 24.0,
+        }
+        assert sample.parameters_for_model(samples.model) == [21.0, 22.0, 23.0, 24.0]
+
+    def test_slice(self, samples):
+        sliced = samples.samples[1:3]
+
+        assert isinstance(sliced, SampleList)
+        assert len(sliced) == 2
+        assert list(sliced.log_likelihoods) == [2.0, 3.0]
+
+    def test_from_samples(self, samples):
+        sample_list = SampleList.from_samples(list(samples.samples))
+
+        assert sample_list.paths == samples.samples.paths
+        assert (sample_list.parameters == samples.samples.parameters).all()
+
+    def test_pickle_view(self, samples):
+        sample = pickle.loads(pickle.dumps(samples.samples[3]))
+
+        assert type(sample) is Sample
+        assert sample.log_likelihood == 10.0
+        assert sample.kwargs["mock_class_1_four"] == 24.0
+
+
 class TestOptimizerSamples:
     def test__max_log_likelihood_vector_and_instance(self, samples):
         assert samples.max_log_likelihood_vector == [21.0, 22.0, 23.0, 24.0]
@@ -196,6 +603,28 @@ class TestPDFSamples:
         assert samples.log_posteriors == [1.0, 2.0, 3.0, 10.0, 5.0]
         assert samples.weights == [1.0, 1.0, 1.0, 1.0, 1.0]
 
+    def test__parameters_extract(self, samples):
+        assert samples.parameters_extract == [
+            [0.0, 0.0, 0.0, 21.0, 0.0],
+            [1.0, 1.0, 1.0, 22.0, 1.0],
+            [2.0, 2.0, 2.0, 23.0, 2.0],
+            [3.0, 3.0, 3.0, 24.0, 3.0],
+        ]
+
+    def test__sorted_cdfs_match_quantile(self):
+        random = np.random.RandomState(1)
+        matrix = random.normal(size=(100, 3))
+        weights = random.uniform(size=100)
+        q = [0.1, 0.5, 0.9]
+
+        quantiles = SortedCDFs(matrix=matrix, weights=weights).quantiles(q)
+
+        assert quantiles.shape == (3, 3)
+        for i in range(3):
+            assert quantiles[:, i] == pytest.approx(
+                quantile(x=matrix[:, i], q=q, weights=weights)
+            )
+
     def test__converged__median_pdf_vector_and_instance(self):
         parameters = [
             [1.0, 2.0],
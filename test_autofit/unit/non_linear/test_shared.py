@@ -0,0 +1,99 @@
+import copy
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import autofit as af
+from autofit.non_linear.shared import SharedArray
+
+
+class Dataset:
+    def __init__(self):
+        self.data = np.arange(100000, dtype="float64")
+        self.noise_map = np.ones((10, 10))
+        self.masked = np.ma.masked_array([1.0, 2.0], mask=[True, False])
+
+
+class Settings:
+    def __init__(self):
+        self.array = np.ones(10)
+
+
+class Analysis(af.Analysis):
+    def __init__(self, dataset, settings=None):
+        self.dataset = dataset
+        self.arrays = [dataset.data, np.zeros(3)]
+        self.settings = settings
+
+    def log_likelihood_function(self, instance):
+        return float(np.sum(self.dataset.data))
+
+
+@pytest.fixture(name="analysis")
+def make_analysis(tmp_path):
+    analysis = Analysis(Dataset())
+    assert analysis.share_arrays(str(tmp_path)) == 3
+    return analysis
+
+
+class TestShareArrays:
+    def test_replaced(self, analysis):
+        assert isinstance(analysis.dataset.data, SharedArray)
+        assert isinstance(analysis.dataset.noise_map, SharedArray)
+        assert analysis.arrays[0] is analysis.dataset.data
+        assert isinstance(analysis.arrays[1], SharedArray)
+        assert not isinstance(analysis.dataset.masked, SharedArray)
+
+    def test_values(self, analysis):
+        assert analysis.dataset.noise_map.shape == (10, 10)
+        assert analysis.log_likelihood_function(None) == float(np.sum(np.arange(100000)))
+
+    def test_read_only(self, analysis):
+        with pytest.raises(ValueError):
+            analysis.dataset.data[0] = 1.0
+
+    def test_pickle_without_data(self, analysis):
+        string = pickle.dumps(analysis)
+        assert len(string) < 10000
+
+        loaded = pickle.loads(string)
+        assert (loaded.dataset.data == analysis.dataset.data).all()
+
+    def test_deepcopy_shares(self, analysis):
+        copied = copy.deepcopy(analysis)
+        assert copied.dataset is not analysis.dataset
+        assert copied.dataset.data is analysis.dataset.data
+
+    def test_derived_arrays_are_copied(self, analysis):
+        sliced = analysis.dataset.data[:10]
+        loaded = pickle.loads(pickle.dumps(sliced))
+
+        assert not isinstance(loaded, SharedArray)
+        assert (loaded == np.arange(10)).all()
+
+    def test_other_objects_unchanged(self, tmp_path):
+        settings = Settings()
+        analysis = Analysis(Dataset(), settings=settings)
+        arrays = analysis.arrays
+
+        analysis.share_arrays(str(tmp_path))
+
+        assert not isinstance(settings.array, SharedArray)
+        assert not isinstance(arrays[1], SharedArray)
+        assert isinstance(analysis.arrays[1], SharedArray)
+
+    def test_attributes(self, tmp_path):
+        analysis = Analysis(Dataset(), settings=Settings())
+
+        assert analysis.share_arrays(str(tmp_path), attributes=["settings"]) == 1
+        assert isinstance(analysis.settings.array, SharedArray)
+        assert not isinstance(analysis.dataset.data, SharedArray)
+
+    def test_remove_shared_arrays(self, analysis, tmp_path):
+        analysis.remove_shared_arrays()
+
+        assert os.listdir(str(tmp_path)) == []
+        assert not isinstance(analysis.dataset.data, SharedArray)
+        assert analysis.log_likelihood_function(None) == float(np.sum(np.arange(100000)))
@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+
+from autofit.non_linear import update as update_module
+from autofit.non_linear.abstract_search import combine_updates
+from autofit.non_linear.update import AdaptiveUpdateCadence, AsynchronousUpdater
+
+
+class Recorder:
+    def __init__(self):
+        self.updates = list()
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def __call__(self, update):
+        self.started.set()
+        self.release.wait(5)
+        self.updates.append(update)
+
+
+class TestAsynchronousUpdater:
+    def test_flush(self):
+        recorder = Recorder()
+        recorder.release.set()
+        updater = AsynchronousUpdater(perform=recorder)
+
+        updater.submit(1)
+        updater.flush()
+
+        assert recorder.updates == [1]
+        assert updater.performed == 1
+
+    def test_coalesce(self):
+        recorder = Recorder()
+        updater = AsynchronousUpdater(perform=recorder)
+
+        updater.submit(1)
+        recorder.started.wait(5)
+
+        updater.submit(2)
+        updater.submit(3)
+
+        recorder.release.set()
+        updater.flush()
+
+        assert recorder.updates == [1, 3]
+        assert updater.coalesced == 1
+
+    def test_combine(self):
+        recorder = Recorder()
+        updater = AsynchronousUpdater(
+            perform=recorder,
+            combine=lambda waiting, update: waiting + update
+        )
+
+        updater.submit(1)
+        recorder.started.wait(5)
+
+        updater.submit(2)
+        updater.submit(3)
+
+        recorder.release.set()
+        updater.flush()
+
+        assert recorder.updates == [1, 5]
+
+    def test_exception_raised_on_flush(self):
+        def perform(update):
+            raise ValueError()
+
+        updater = AsynchronousUpdater(perform=perform)
+        updater.submit(1)
+
+        with pytest.raises(ValueError):
+            updater.flush()
+
+        updater.flush()
+
+
+def test_combine_updates():
+    update = combine_updates(
+        dict(samples=1, visualize=True, output_model_results=False),
+        dict(samples=2, visualize=False, output_model_results=False),
+    )
+
+    assert update == dict(samples=2, visualize=True, output_model_results=False)
+
+
+class Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+@pytest.fixture(name="clock")
+def make_clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(update_module.time, "perf_counter", clock)
+    return clock
+
+
+class TestAdaptiveUpdateCadence:
+    @staticmethod
+    def update(cadence, clock, iterations, sampling_time, update_time):
+        clock.time += sampling_time
+        update_start = clock.time
+        clock.time += update_time
+        return cadence.iterations_per_update(iterations=iterations, update_start=update_start)
+
+    def test_overhead_fraction(self, clock):
+        cadence = AdaptiveUpdateCadence(overhead_fraction=0.05)
+        cadence.start()
+
+        iterations = self.update(cadence, clock, iterations=1000, sampling_time=10.0, update_time=1.0)
+
+        assert cadence.iterations_per_second == 100.0
+        assert iterations == 1900
+
+    def test_bounds(self, clock):
+        cadence = AdaptiveUpdateCadence(minimum_iterations=500, maximum_iterations=5000)
+        cadence.start()
+
+        assert self.update(cadence, clock, iterations=1000, sampling_time=10.0, update_time=0.001) == 500
+        assert self.update(cadence, clock, iterations=500, sampling_time=5.0, update_time=1000.0) == 5000
+
+    def test_smoothing(self, clock):
+        cadence = AdaptiveUpdateCadence(smoothing=0.5)
+        cadence.start()
+
+        self.update(cadence, clock, iterations=1000, sampling_time=10.0, update_time=1.0)
+        self.update(cadence, clock, iterations=1000, sampling_time=10.0, update_time=3.0)
+
+        assert cadence.update_time == 2.0
+
+    def test_not_started(self, clock):
+        cadence = AdaptiveUpdateCadence()
+
+        assert self.update(cadence, clock, iterations=1000, sampling_time=10.0, update_time=1.0) == 1000
+        assert cadence.iterations_per_second is None
+
+    def test_no_iterations(self, clock):
+        cadence = AdaptiveUpdateCadence(minimum_iterations=0)
+        cadence.start()
+
+        assert self.update(cadence, clock, iterations=0, sampling_time=10.0, update_time=1.0) == 1
+
+        cadence = AdaptiveUpdateCadence(minimum_iterations=500)
+        cadence.start()
+
+        assert self.update(cadence, clock, iterations=0, sampling_time=10.0, update_time=1.0) == 500
+
+    def test_no_iterations_keeps_previous(self, clock):
+        cadence = AdaptiveUpdateCadence(overhead_fraction=0.05)
+        cadence.start()
+
+        assert self.update(cadence, clock, iterations=1000, sampling_time=10.0, update_time=1.0) == 1900
+        assert self.update(cadence, clock, iterations=0, sampling_time=10.0, update_time=1.0) == 1900
@@ -0,0 +1,65 @@
+import pytest
+
+import autofit as af
+from autoconf import conf
+from autofit import config_snapshot, exc
+from autofit.mock import mock
+
+
+@pytest.fixture(name="ignore_prior_limits")
+def make_ignore_prior_limits():
+    model_config = conf.instance["general"]["model"]
+    original = model_config["ignore_prior_limits"]
+
+    def set_ignore_prior_limits(value):
+        model_config["ignore_prior_limits"] = value
+
+    yield set_ignore_prior_limits
+    model_config["ignore_prior_limits"] = original
+
+
+def test_live_config_without_snapshot(ignore_prior_limits):
+    assert config_snapshot.active() is None
+
+    ignore_prior_limits(True)
+    assert config_snapshot.get("general", "model", "ignore_prior_limits") is True
+
+
+def test_values_frozen(ignore_prior_limits):
+    ignore_prior_limits(False)
+
+    with config_snapshot.frozen() as snapshot:
+        ignore_prior_limits(True)
+        assert config_snapshot.get("general", "model", "ignore_prior_limits") is False
+
+        with config_snapshot.frozen() as inner:
+            assert inner is snapshot
+
+    assert config_snapshot.active() is None
+    assert config_snapshot.get("general", "model", "ignore_prior_limits") is True
+
+
+def test_cached():
+    calls = list()
+
+    def function():
+        calls.append(1)
+        return len(calls)
+
+    with config_snapshot.frozen():
+        assert config_snapshot.cached("key", function) == 1
+        assert config_snapshot.cached("key", function) == 1
+
+    assert config_snapshot.cached("key", function) == 2
+
+
+def test_instance_uses_snapshot(ignore_prior_limits):
+    model = af.PriorModel(mock.MockClassx2, one=af.UniformPrior(0.0, 1.0))
+
+    ignore_prior_limits(True)
+    with config_snapshot.frozen():
+        ignore_prior_limits(False)
+        assert model.instance_from_vector([2.0, 0.5]).one == 2.0
+
+    with pytest.raises(exc.PriorLimitException):
+        model.instance_from_vector([2.0, 0.5])
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+
+import autofit as af
+
+# Generous compared to the ~0.1s taken on a development machine, so only a dependency being imported eagerly again
+# should exceed it
+IMPORT_TIME_BUDGET = 1.0
+
+
+def run(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_backends_not_imported():
+    result = run(
+        "import sys, autofit; print(' '.join(sorted(sys.modules)))"
+    )
+    modules = set(result.stdout.split())
+
+    for module in ("emcee", "dynesty", "pyswarms", "dill", "scipy.stats", "autofit.graphical"):
+        assert module not in modules
+
+
+def test_import_time_budget():
+    result = run("import autofit")
+
+    # Each line of -X importtime is "import time: self | cumulative | name"
+    cumulative = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "autofit"
+    ]
+
+    assert len(cumulative) == 1
+    assert cumulative[0] / 1e6 < IMPORT_TIME_BUDGET
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["Aggregator", "PhaseOutput", "Emcee", "DynestyStatic", "DynestyDynamic", "MultiNest", "PySwarmsGlobal"],
+)
+def test_lazy_names(name):
+    assert getattr(af, name).__name__ == name
+    assert name in dir(af)
+
+
+def test_missing_name():
+    with pytest.raises(AttributeError):
+        af.NotAName
@@ -1,4 +1,6 @@
 import os
+import shutil
+import zipfile
 from os import path
 
 import pytest
@@ -64,3 +66,17 @@ def test_restore(paths):
     assert not path.exists(paths.zip_path)
 
     os.rmdir(paths.output_path)
+
+
+def test_zip_excludes_table_cache(paths):
+    paths = PatchPaths(remove_files=False)
+    for filename in ("samples.csv", "samples.table.npy", "samples.table.json"):
+        open(path.join(paths.output_path, filename), "w+").close()
+
+    paths.zip()
+
+    with zipfile.ZipFile(paths.zip_path) as f:
+        assert [path.basename(name) for name in f.namelist()] == ["samples.csv"]
+
+    os.remove(paths.zip_path)
+    shutil.rmtree(paths.output_path)